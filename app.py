@@ -1,8 +1,15 @@
 import streamlit as st
 
-from visualization.financial_factors_stocks import generate_financial_factors_stocks_charts
-from visualization.stg_idx import generate_stg_idx_charts
-from visualization.style import generate_style_charts
+from data_preparation.snapshot_store import pinned_snapshot
+from span_timing import timed_span
+from visualization.debug_panel import (
+    is_debug_panel_enabled,
+    render_data_quality_panel,
+    render_memory_panel,
+    render_span_timing_panel,
+)
+from visualization.pages import load_page, select_page
+from visualization.static_view import render_static_page
 
 st.set_page_config(
     page_title='股票交易咨询权益研究',
@@ -12,13 +19,15 @@ st.set_page_config(
 
 st.title('股票交易咨询权益研究')
 
-# 使用tabs来切换页面
-tab1, tab2, tab3 = st.tabs(['财务选股', '策略指数', '风格研判'])
-with tab1:
-    generate_financial_factors_stocks_charts()
-
-with tab2:
-    generate_stg_idx_charts()
+# 按需加载页面：只导入并渲染当前选中的页面
+# 每次运行只解析一次快照版本，运行中切换 CURRENT 不会混用两个版本
+page = select_page()
+with pinned_snapshot():
+    with timed_span('app_rerun'):
+        if not render_static_page(page):
+            load_page(page)()
 
-with tab3:
-    generate_style_charts()
+    if is_debug_panel_enabled():
+        render_span_timing_panel()
+        render_memory_panel()
+        render_data_quality_panel()
@@ -58,6 +58,22 @@ STG_IDX_CORR_TRADE_DT_COUNT = {
     '近一月': TRADE_DT_COUNT['一月'],
 }
 
+# Rolling performance windows (keys of `TRADE_DT_COUNT`) and metric labels.
+ROLLING_PERF_WINDOW_NAMES = ('一月', '半年', '一年')
+ROLLING_PERF_DEFAULT_WINDOW = '半年'
+ROLLING_PERF_METRIC_NAMES = {
+    'sharpe': '滚动夏普率',
+    'volatility': '滚动波动率',
+    'max_drawdown': '滚动最大回撤',
+    'excess_return': '滚动超额收益',
+}
+ROLLING_PERF_METRIC_FORMATS = {
+    'sharpe': 'float',
+    'volatility': 'pct',
+    'max_drawdown': 'pct',
+    'excess_return': 'pct',
+}
+
 IDX_PRICE_SQL_NAME = 'query_idx_price.sql'
 
 CHART_HEIGHT = 500
@@ -4,6 +4,15 @@ DATE_COL = '交易日期'
 CODE_COL = '证券代码'
 NAME_COL = '证券简称'
 
+# Stock return panel used by the pool backtest engine (local long-form file:
+# 交易日期, 证券代码, 日收益率 as decimal daily returns).
+STOCK_RETURN_COL = '日收益率'
+STOCK_RETURN_DTYPES = {
+    DATE_COL: str,
+    CODE_COL: str,
+    STOCK_RETURN_COL: float,
+}
+
 
 INDUSTRY_NEUTRAL_DIVIDEND_DISPLAY_COLS = [
     '证券代码',
@@ -100,16 +109,19 @@ HIGH_MOMENTUM_GROWTH_DISPLAY_COLS = [
 STOCK_POOL_STRATEGIES = {
     '中性股息': {
         'signal_col': '中性股息策略',
+        'nav_col': '中性股息股票池',
         'display_cols': INDUSTRY_NEUTRAL_DIVIDEND_DISPLAY_COLS,
         'date_select_key': 'FINANCIAL_FACTORS_DATE_DIVIDEND_NEUTRAL',
     },
     '细分龙头': {
         'signal_col': '细分龙头策略',
+        'nav_col': '细分龙头股票池',
         'display_cols': INDUSTRY_LEADER_DISPLAY_COLS,
         'date_select_key': 'FINANCIAL_FACTORS_DATE_SEGMENT_LEADER',
     },
     '景气成长': {
         'signal_col': '景气成长策略',
+        'nav_col': '景气成长股票池',
         'display_cols': HIGH_MOMENTUM_GROWTH_DISPLAY_COLS,
         'date_select_key': 'FINANCIAL_FACTORS_DATE_PROSPERITY_GROWTH',
     },
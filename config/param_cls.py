@@ -58,6 +58,34 @@ class BaseDataColParam(BaseModel):
     name_col: str | None = None
 
 
+class PoolBacktestParam(BaseModel):
+    """Transaction-cost assumptions for equal-weight stock-pool backtests.
+
+    Cost rates are charged on traded notional as a fraction of NAV at each rebalance.
+    """
+
+    buy_cost_rate: float = 0.0
+    sell_cost_rate: float = 0.0
+    initial_nav: float = 1.0
+
+
+class SyntheticSnapshotParam(BaseModel):
+    """Size and noise settings for generated CSV snapshots.
+
+    `n_codes` applies to every long-form table keyed by security/curve/indicator;
+    the stock-pool table uses `n_stocks` x `n_quarters` instead.
+    """
+
+    n_codes: int = 100
+    n_years: int = 20
+    n_stocks: int = 5000
+    n_quarters: int = 40
+    end_date: str = '20251231'
+    gap_rate: float = 0.0
+    nan_rate: float = 0.0
+    seed: int = 0
+
+
 class WindIdxColParam(BaseDataColParam):
     dt_col: str = 'TRADE_DT'
     code_col: str = 'S_INFO_WINDCODE'
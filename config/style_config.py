@@ -1,10 +1,9 @@
 from config import config, param_cls
 from utils import (
+    SqlColAlias,
     TradeDtType,
     get_avg_dt_count_via_dt_type,
-    get_cwd_file_path,
     get_rolling_window_col,
-    get_wind_col_alias_with_sql_parser,
 )
 
 STYLE_IDX_CODES = {
@@ -57,17 +56,9 @@ DATA_CONFIG_KEYS = [
     param_cls.WindPortal.SHIBOR_PRICES,
 ]
 
+# Alias maps are read from the compiled `sql_template` artifact on first access, not at import.
 for key in DATA_CONFIG_KEYS:
-    DATA_CONFIG[key].update(
-        {
-            'WIND_COL_ALIAS': get_wind_col_alias_with_sql_parser(
-                path_sql=get_cwd_file_path(
-                    dir=SQL_DIR,
-                    file=DATA_CONFIG[key]['SQL_NAME'],
-                )
-            ),
-        }
-    )
+    DATA_CONFIG[key].update({'WIND_COL_ALIAS': SqlColAlias(SQL_DIR, DATA_CONFIG[key]['SQL_NAME'])})
 
 DATA_COL_PARAM = {
     # NOTE: EDB columns now rely directly on the canonical CSV schema
@@ -78,12 +69,14 @@ DATA_COL_PARAM = {
         name_col='指标名称',
         value_col='指标数值',
     ),
+    # NOTE: A_IDX_VAL columns follow the canonical CSV schema (`INDEX_VALUATION_SCHEMA`)
+    # as well; `tests/test_style_prep.py` checks they still match the SQL aliases.
     param_cls.WindPortal.A_IDX_VAL: param_cls.WindAIndexValueColParam(
-        dt_col=DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_COL_ALIAS']['TRADE_DT'],
-        name_col=DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_COL_ALIAS']['S_INFO_NAME'],
-        code_col=DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_COL_ALIAS']['S_INFO_WINDCODE'],
-        turnover_col=DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_COL_ALIAS']['TURNOVER'],
-        pe_ttm_col=DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_COL_ALIAS']['PE_TTM'],
+        dt_col='交易日期',
+        name_col='证券简称',
+        code_col='证券代码',
+        turnover_col='日换手率',
+        pe_ttm_col='市盈率',
     ),
 }
 
@@ -186,9 +179,7 @@ TERM_SPREAD_CONFIG.update(
             dt_type=TERM_SPREAD_CONFIG['DT_TYPE'],
             period=TERM_SPREAD_CONFIG['SLIDER_DEFAULT_OFFSET'],
         ),
-        'WIND_COL_ALIAS': get_wind_col_alias_with_sql_parser(
-            get_cwd_file_path(SQL_DIR, TERM_SPREAD_CONFIG['SQL_NAME'])
-        ),
+        'WIND_COL_ALIAS': SqlColAlias(SQL_DIR, TERM_SPREAD_CONFIG['SQL_NAME']),
         'ROLLING_WINDOW_SIZE': get_avg_dt_count_via_dt_type(
             dt_type=TERM_SPREAD_CONFIG['DT_TYPE'],
             period=TERM_SPREAD_CONFIG['ROLLING_WINDOW'],
@@ -306,10 +297,10 @@ INDEX_TURNOVER_CONFIG.update(
     }
 )
 INDEX_TURNOVER_COL_PARAM = param_cls.WindAIndexValueColParam(
-    dt_col=DATA_CONFIG[INDEX_TURNOVER_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['TRADE_DT'],
-    name_col=DATA_CONFIG[INDEX_TURNOVER_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['S_INFO_NAME'],
-    code_col=DATA_CONFIG[INDEX_TURNOVER_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['S_INFO_WINDCODE'],
-    turnover_col=DATA_CONFIG[INDEX_TURNOVER_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['TURNOVER'],
+    dt_col=DATA_COL_PARAM[INDEX_TURNOVER_CONFIG['WIND_TABLE']].dt_col,
+    name_col=DATA_COL_PARAM[INDEX_TURNOVER_CONFIG['WIND_TABLE']].name_col,
+    code_col=DATA_COL_PARAM[INDEX_TURNOVER_CONFIG['WIND_TABLE']].code_col,
+    turnover_col=DATA_COL_PARAM[INDEX_TURNOVER_CONFIG['WIND_TABLE']].turnover_col,
 )
 INDEX_TURNOVER_CHART_PARAM = param_cls.BarLineWithSignalParam(
     dt_slider_param=param_cls.DtSliderParam(
@@ -367,6 +358,7 @@ INDEX_ERP_CONFIG = {
     'QUANTILE_CEILING': 90,
     'QUANTILE_FLOOR': 10,
     'ERP_COL': '股债性价比',
+    'MEAN_1M_COL': '近一月均值',
     'SIGNAL_COL': '交易信号',
     'BASELINE_COL': '比较基准',
     'TRUE_SIGNAL': param_cls.TradeSignal.LONG_GROWTH.value,
@@ -399,9 +391,9 @@ INDEX_ERP_CONFIG.update(
     }
 )
 INDEX_ERP_COL_PARAM = param_cls.WindAIndexValueColParam(
-    dt_col=DATA_CONFIG[INDEX_ERP_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['TRADE_DT'],
-    code_col=DATA_CONFIG[INDEX_ERP_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['S_INFO_WINDCODE'],
-    pe_ttm_col=DATA_CONFIG[INDEX_ERP_CONFIG['WIND_TABLE']]['WIND_COL_ALIAS']['PE_TTM'],
+    dt_col=DATA_COL_PARAM[INDEX_ERP_CONFIG['WIND_TABLE']].dt_col,
+    code_col=DATA_COL_PARAM[INDEX_ERP_CONFIG['WIND_TABLE']].code_col,
+    pe_ttm_col=DATA_COL_PARAM[INDEX_ERP_CONFIG['WIND_TABLE']].pe_ttm_col,
 )
 INDEX_ERP_CHART_PARAM = param_cls.BarLineWithSignalParam(
     dt_slider_param=param_cls.DtSliderParam(
@@ -429,7 +421,7 @@ INDEX_ERP_CHART_PARAM = param_cls.BarLineWithSignalParam(
         stroke_dash=INDEX_ERP_CONFIG['LINE_STROKE_DASH'],
         # color='red',
         compared_cols=[
-            '近一月均值',
+            INDEX_ERP_CONFIG['MEAN_1M_COL'],
             INDEX_ERP_CONFIG['QUANTILE_CEILING_COL'],
             INDEX_ERP_CONFIG['QUANTILE_FLOOR_COL'],
         ],
@@ -828,6 +820,8 @@ STYLE_FOCUS_CONFIG = {
     'QUANTILE_CEILING': 95,
     'QUANTILE_FLOOR': 5,
     'STYLE_FOCUS_COL': '风格关注度',
+    'BIG_RETURN_COL': '沪深300近两周收益率',
+    'SMALL_RETURN_COL': '中证2000近两周收益率',
     'SIGNAL_COL': '交易信号',
     'BASELINE_COL': '比较基准',
     'TRUE_SIGNAL': param_cls.TradeSignal.LONG_SMALL.value,
@@ -938,4 +932,48 @@ STYLE_CHART_AXIS_NAMES = {
     },
 }
 
+# NOTE 风格信号参数扫描
+# 每个信号的候选参数网格；PAIR 为 (多头, 空头) 风格，UPPER_SIGNAL 为指标处于上轨时的信号。
+SIGNAL_SWEEP_HORIZONS = ('两周', '一月', '三月')
+SIGNAL_SWEEP_CONFIG = {
+    'INDEX_ERP': {
+        'KIND': 'quantile_band',
+        'DT_TYPE': INDEX_ERP_CONFIG['DT_TYPE'],
+        'PAIR': (param_cls.TradeSignal.LONG_GROWTH.value, param_cls.TradeSignal.LONG_VALUE.value),
+        'UPPER_SIGNAL': INDEX_ERP_CONFIG['TRUE_SIGNAL'],
+        'WINDOW_NAMES': ('一年', '两年', '四年'),
+        'QUANTILE_CEILINGS': (80, 85, 90, 95),
+        'QUANTILE_FLOORS': (5, 10, 15, 20),
+    },
+    'STYLE_FOCUS': {
+        'KIND': 'quantile_band',
+        'DT_TYPE': STYLE_FOCUS_CONFIG['DT_TYPE'],
+        'PAIR': (param_cls.TradeSignal.LONG_SMALL.value, param_cls.TradeSignal.LONG_BIG.value),
+        'UPPER_SIGNAL': STYLE_FOCUS_CONFIG['FALSE_SIGNAL'],
+        'WINDOW_NAMES': ('一年', '两年', '四年'),
+        'QUANTILE_CEILINGS': (85, 90, 95),
+        'QUANTILE_FLOORS': (5, 10, 15),
+    },
+    'TERM_SPREAD': {
+        'KIND': 'mean_cross',
+        'DT_TYPE': TERM_SPREAD_CONFIG['DT_TYPE'],
+        'PAIR': (param_cls.TradeSignal.LONG_GROWTH.value, param_cls.TradeSignal.LONG_VALUE.value),
+        'UPPER_SIGNAL': TERM_SPREAD_CONFIG['TRUE_SIGNAL'],
+        'WINDOW_NAMES': ('两周', '一月', '三月', '半年', '一年'),
+    },
+}
+
+# NOTE 风格信号评估
+# 各研判框架的 (多头, 空头) 风格；交易信号等于多头风格时做多该组合，等于空头风格时反向，中性不持仓。
+STYLE_SIGNAL_EVAL_CONFIG = {
+    'PAIRS': {
+        '价值成长': (param_cls.TradeSignal.LONG_GROWTH.value, param_cls.TradeSignal.LONG_VALUE.value),
+        '大小盘': (param_cls.TradeSignal.LONG_SMALL.value, param_cls.TradeSignal.LONG_BIG.value),
+    },
+    'HORIZONS': ('一周', '两周', '一月', '三月'),
+    'DT_COL': '交易日期',
+    'SIGNAL_NAME_COL': '信号',
+    'CUM_PNL_COL': '累计收益',
+}
+
 # https://coolors.co/83c9ff-ffdd4a-0068c9-000103-ff0000
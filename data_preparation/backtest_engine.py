@@ -0,0 +1,169 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import financial_factors_config, param_cls
+from utils import to_date_keys
+
+# Daily returns at or below -100% would make the log-growth undefined.
+MIN_DAILY_RETURN = -0.9999
+
+REBALANCE_TURNOVER_COL = '换手率'
+REBALANCE_COST_COL = '交易成本'
+
+
+def read_stock_return_panel(path: str) -> pd.DataFrame:
+    """Read a long-form stock return file (CSV or Parquet) into a wide date keys x codes frame."""
+    date_col = financial_factors_config.DATE_COL
+    code_col = financial_factors_config.CODE_COL
+    return_col = financial_factors_config.STOCK_RETURN_COL
+    dtypes = financial_factors_config.STOCK_RETURN_DTYPES
+
+    if str(path).endswith('.parquet'):
+        long_df = pd.read_parquet(path, columns=list(dtypes))
+    else:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'Stock return panel not found at {path}')
+        long_df = pd.read_csv(path, dtype={date_col: str, code_col: str}, usecols=list(dtypes))
+
+    missing_cols = set(dtypes) - set(long_df.columns)
+    if missing_cols:
+        raise ValueError(f'Missing columns in stock return panel: {missing_cols}')
+
+    long_df[date_col] = to_date_keys(long_df[date_col])
+    long_df[return_col] = pd.to_numeric(long_df[return_col], errors='coerce')
+    return long_df.pivot_table(index=date_col, columns=code_col, values=return_col, aggfunc='last').sort_index()
+
+
+def build_pool_weight_matrix(stocks_long_df: pd.DataFrame, signal_col: str) -> pd.DataFrame:
+    """Turn 0/1 pool membership signals into equal target weights per rebalance date.
+
+    Returns a rebalance-dates x codes frame whose rows sum to 1, or to 0 when the
+    pool is empty on that date (the portfolio then holds cash).
+    """
+    date_col = financial_factors_config.DATE_COL
+    code_col = financial_factors_config.CODE_COL
+
+    signal_df = stocks_long_df[[date_col, code_col]].copy()
+    signal_df['signal'] = pd.to_numeric(stocks_long_df[signal_col], errors='coerce').eq(1).astype('float64')
+    member_wide_df = signal_df.pivot_table(
+        index=date_col, columns=code_col, values='signal', aggfunc='max', fill_value=0.0, observed=True
+    ).sort_index()
+    member_wide_df.columns = member_wide_df.columns.astype(str)
+
+    member_count = member_wide_df.sum(axis=1)
+    return member_wide_df.div(member_count.where(member_count > 0), axis=0).fillna(0.0)
+
+
+def _align_rebalance_positions(rebalance_dt: pd.Index, trade_dt: pd.Index) -> tuple[np.ndarray, np.ndarray]:
+    """Map each rebalance date to the last trading date on or before it.
+
+    Returns (positions into trade_dt, indices into rebalance_dt). Rebalances that land on
+    the same trading date keep only the latest one; rebalances before the first trading
+    date are applied on the first trading date.
+    """
+    positions = np.searchsorted(trade_dt.to_numpy(), rebalance_dt.to_numpy(), side='right') - 1
+    positions = np.clip(positions, 0, None)
+    is_last_of_position = np.append(positions[1:] != positions[:-1], True)
+    return positions[is_last_of_position], np.flatnonzero(is_last_of_position)
+
+
+def run_weight_backtest(
+    weight_df: pd.DataFrame,
+    ret_wide_df: pd.DataFrame,
+    param: param_cls.PoolBacktestParam | None = None,
+) -> tuple[pd.Series, pd.DataFrame]:
+    """Backtest buy-and-hold target weights that are reset on each rebalance date.
+
+    Weights set at the close of a rebalance date earn returns from the next trading date
+    and drift with prices until the following rebalance. Transaction costs are charged
+    on the traded notional between the drifted and the new target weights.
+
+    Args:
+        weight_df: rebalance-dates x codes target weights (rows sum to <= 1, rest in cash).
+        ret_wide_df: trading-dates x codes daily returns; missing returns count as 0.
+        param: transaction-cost assumptions.
+
+    Returns:
+        nav: NAV series indexed by trading date.
+        rebalance_df: turnover and cost per effective rebalance date.
+    """
+    if param is None:
+        param = param_cls.PoolBacktestParam()
+
+    ret_wide_df = ret_wide_df.sort_index()
+    trade_dt = ret_wide_df.index
+    codes = weight_df.columns.union(ret_wide_df.columns)
+
+    returns = ret_wide_df.reindex(columns=codes).to_numpy(dtype='float64', na_value=0.0)
+    log_growth = np.cumsum(np.log1p(np.clip(returns, MIN_DAILY_RETURN, None)), axis=0)
+
+    weight_df = weight_df.sort_index()
+    positions, weight_rows = _align_rebalance_positions(weight_df.index, trade_dt)
+    weights = weight_df.reindex(columns=codes, fill_value=0.0).to_numpy(dtype='float64')[weight_rows]
+    n_rebalance = len(positions)
+
+    nav = np.full(len(trade_dt), param.initial_nav, dtype='float64')
+    if n_rebalance == 0:
+        return pd.Series(nav, index=trade_dt), pd.DataFrame(columns=[REBALANCE_TURNOVER_COL, REBALANCE_COST_COL])
+
+    # Segment k holds weights[k] over trading dates (positions[k], positions[k + 1]].
+    seg_ends = np.append(positions[1:], len(trade_dt) - 1)
+    start_log_growth = log_growth[positions]
+    cash_weights = 1.0 - weights.sum(axis=1)
+
+    # Stock growth from each rebalance to the end of its segment, for all segments at once.
+    seg_end_growth = np.exp(log_growth[seg_ends] - start_log_growth)
+    seg_end_value = (weights * seg_end_growth).sum(axis=1) + cash_weights
+    drifted_weights = weights * seg_end_growth / seg_end_value[:, None]
+
+    # Trades against the drifted book of the previous segment (all cash before the first one).
+    prev_weights = np.vstack([np.zeros_like(weights[:1]), drifted_weights[:-1]])
+    trades = weights - prev_weights
+    buys = np.clip(trades, 0, None).sum(axis=1)
+    sells = np.clip(-trades, 0, None).sum(axis=1)
+    costs = buys * param.buy_cost_rate + sells * param.sell_cost_rate
+
+    # NAV right after each rebalance (post-cost), chained across segments.
+    seg_growth = np.append(1.0, seg_end_value[:-1])
+    seg_start_nav = param.initial_nav * np.cumprod(seg_growth * (1.0 - costs))
+
+    for k in range(n_rebalance):
+        start, end = positions[k], seg_ends[k]
+        nav[start] = seg_start_nav[k]
+        if end > start:
+            stock_growth = np.exp(log_growth[start + 1 : end + 1] - start_log_growth[k])
+            nav[start + 1 : end + 1] = seg_start_nav[k] * (stock_growth @ weights[k] + cash_weights[k])
+
+    rebalance_df = pd.DataFrame(
+        {REBALANCE_TURNOVER_COL: buys + sells, REBALANCE_COST_COL: costs},
+        index=trade_dt[positions],
+    )
+    return pd.Series(nav, index=trade_dt), rebalance_df
+
+
+def run_pool_backtests(
+    stocks_long_df: pd.DataFrame,
+    ret_wide_df: pd.DataFrame,
+    param: param_cls.PoolBacktestParam | None = None,
+    strategy_names: list[str] | None = None,
+) -> pd.DataFrame:
+    """Rebuild equal-weight NAVs for the configured stock pools.
+
+    Returns a frame shaped like `financial_factors_backtest_nav.csv`: `交易日期` index and
+    one `<策略>股票池` NAV column per strategy in `STOCK_POOL_STRATEGIES`.
+    """
+    if strategy_names is None:
+        strategy_names = list(financial_factors_config.STOCK_POOL_STRATEGIES)
+
+    nav_by_pool = {}
+    for strategy_name in strategy_names:
+        strategy_cfg = financial_factors_config.STOCK_POOL_STRATEGIES[strategy_name]
+        weight_df = build_pool_weight_matrix(stocks_long_df, strategy_cfg['signal_col'])
+        nav, _ = run_weight_backtest(weight_df, ret_wide_df, param)
+        nav_by_pool[strategy_cfg['nav_col']] = nav
+
+    nav_wide_df = pd.DataFrame(nav_by_pool)
+    nav_wide_df.index.name = financial_factors_config.DATE_COL
+    return nav_wide_df
@@ -0,0 +1,95 @@
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+
+from data_preparation.result_cache import cached_result, dump_result, load_result
+from span_timing import timed_span
+
+# NOTE 指标计算进程池
+# With `ST_IDX_COMPUTE_WORKERS` > 0, indicator jobs run in a process pool and come back as
+# Arrow IPC buffers, so the Streamlit script thread only waits, slices and renders while
+# other sessions keep the GIL. Unset or 0, jobs run inline in the caller, as before.
+COMPUTE_WORKERS_ENV = 'ST_IDX_COMPUTE_WORKERS'
+
+
+def _run_job(name: str, key_parts, func, args, kwargs) -> tuple[dict, list[bytes]]:
+    """Pool-side entry point: compute (through the shared result cache) and serialize to Arrow."""
+    return dump_result(cached_result(name, key_parts, func, *args, **kwargs))
+
+
+class ComputeJob:
+    """Handle for one submitted indicator job; `result()` blocks until the frames are ready."""
+
+    def __init__(self, name: str, future: Future | None = None, thunk=None):
+        self.name = name
+        self._future = future
+        self._thunk = thunk
+
+    def result(self):
+        with timed_span(f'compute:{self.name}'):
+            if self._future is None:
+                # Inline jobs run on first use, so their cost lands where the result is consumed.
+                self._future = Future()
+                try:
+                    self._future.set_result(self._thunk())
+                except BaseException as e:
+                    self._future.set_exception(e)
+            return self._future.result()
+
+
+class ComputeService:
+    """Process pool for indicator jobs; `func` and its arguments must be picklable.
+
+    Workers are spawned (as on Windows) so they never inherit a forked Streamlit runtime.
+    Results are decoded from Arrow on the pool's result thread, not in the script thread.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn'))
+
+    def submit(self, name: str, key_parts, func, *args, **kwargs) -> ComputeJob:
+        decoded = Future()
+
+        def decode(payload_future: Future) -> None:
+            try:
+                decoded.set_result(load_result(payload_future.result()))
+            except BaseException as e:
+                decoded.set_exception(e)
+
+        self._executor.submit(_run_job, name, key_parts, func, args, kwargs).add_done_callback(decode)
+        return ComputeJob(name, future=decoded)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+
+_COMPUTE_SERVICE: ComputeService | None = None
+_COMPUTE_SERVICE_LOCK = threading.Lock()
+
+
+def get_compute_service() -> ComputeService | None:
+    """Return the process-wide pool sized by `ST_IDX_COMPUTE_WORKERS`, or None for inline jobs."""
+    global _COMPUTE_SERVICE
+    max_workers = int(os.environ.get(COMPUTE_WORKERS_ENV) or 0)
+    if max_workers <= 0:
+        return None
+    with _COMPUTE_SERVICE_LOCK:
+        if _COMPUTE_SERVICE is None or _COMPUTE_SERVICE.max_workers != max_workers:
+            if _COMPUTE_SERVICE is not None:
+                _COMPUTE_SERVICE.shutdown()
+            _COMPUTE_SERVICE = ComputeService(max_workers)
+        return _COMPUTE_SERVICE
+
+
+def submit_job(name: str, key_parts, func, *args, **kwargs) -> ComputeJob:
+    """Start `func(*args, **kwargs)` on the compute pool (or lazily inline) and return its job.
+
+    Arguments mirror `cached_result`: a job whose `key_parts` are not None is read from, or
+    written to, the shared result cache by the process that runs it.
+    """
+    service = get_compute_service()
+    if service is None:
+        return ComputeJob(name, thunk=lambda: cached_result(name, key_parts, func, *args, **kwargs))
+    return service.submit(name, key_parts, func, *args, **kwargs)
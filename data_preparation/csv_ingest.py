@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from utils import DATE_KEY_DTYPE
+
+# NOTE 分块读取快照
+# Snapshots are parsed `CSV_CHUNK_ROWS` rows at a time; each chunk is typed and filtered, then
+# copied into columns preallocated for the file's row count. Peak memory is one chunk of
+# strings plus the typed output, instead of the whole file as strings plus its typed copy.
+CSV_CHUNK_ROWS = 100_000
+VALIDATION_SAMPLE_ROWS = 5
+DATE_KEY_PATTERN = r'[0-9]{8}'
+_COUNT_BLOCK_BYTES = 1024**2
+
+
+def count_csv_rows(path: str) -> int:
+    """Upper bound on the data rows of a CSV: its line count minus the header."""
+    lines = 0
+    last_byte = b'\n'
+    with open(path, 'rb') as file:
+        while block := file.read(_COUNT_BLOCK_BYTES):
+            lines += block.count(b'\n')
+            last_byte = block[-1:]
+    if last_byte != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+class NumericBlockValidator:
+    """Coerce a chunk's declared numeric columns as one block and tally the cells that became NaN.
+
+    A cell is `invalid` when its text does not parse as a number and `missing` when it is empty
+    (or a pandas NA token such as `null`). With `date_col`, that column is checked as well: a date
+    that is missing or not 8 digits (yyyymmdd) is tallied the same way and its row is dropped,
+    as no date range could place it; the dates kept are parsed into int32 yyyymmdd keys. Row ids are 0-based data rows of the file, counted before
+    any row filter.
+    """
+
+    def __init__(self, columns: list[str], date_col: str | None = None):
+        self.columns = columns
+        self.date_col = date_col
+        self.report_columns = [date_col, *columns] if date_col is not None else list(columns)
+        self.n_rows = 0
+        self._invalid = np.zeros(len(self.report_columns), dtype=np.int64)
+        self._missing = np.zeros(len(self.report_columns), dtype=np.int64)
+        self._invalid_rows = [[] for _ in self.report_columns]
+        self._missing_rows = [[] for _ in self.report_columns]
+
+    @staticmethod
+    def _sample(samples: list[list[int]], mask: np.ndarray, row_ids: np.ndarray) -> None:
+        for i in np.flatnonzero(mask.any(axis=0)):
+            room = VALIDATION_SAMPLE_ROWS - len(samples[i])
+            if room > 0:
+                samples[i].extend(row_ids[np.flatnonzero(mask[:, i])[:room]].tolist())
+
+    def _tally(self, start: int, invalid: np.ndarray, missing: np.ndarray, row_ids: np.ndarray) -> None:
+        stop = start + invalid.shape[1]
+        self._invalid[start:stop] += invalid.sum(axis=0)
+        self._missing[start:stop] += missing.sum(axis=0)
+        self._sample(self._invalid_rows[start:stop], invalid, row_ids)
+        self._sample(self._missing_rows[start:stop], missing, row_ids)
+
+    def coerce(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        self.n_rows += len(chunk)
+        if chunk.empty:
+            return chunk
+        row_ids = chunk.index.to_numpy()
+        start = 0
+        undated = None
+        if self.date_col is not None:
+            raw_dates = chunk[self.date_col]
+            missing = raw_dates.isna().to_numpy()
+            invalid = ~raw_dates.str.fullmatch(DATE_KEY_PATTERN, na=False).to_numpy(dtype=bool) & ~missing
+            self._tally(0, invalid[:, None], missing[:, None], row_ids)
+            undated = invalid | missing
+            start = 1
+        if self.columns:
+            raw_block = chunk[self.columns]
+            numeric_block = raw_block.apply(pd.to_numeric, errors='coerce')
+            missing = raw_block.isna().to_numpy()
+            invalid = numeric_block.isna().to_numpy() & ~missing
+            self._tally(start, invalid, missing, row_ids)
+            chunk[self.columns] = numeric_block
+        if undated is not None:
+            if undated.any():
+                chunk = chunk[~undated].copy()
+            chunk[self.date_col] = chunk[self.date_col].to_numpy().astype(DATE_KEY_DTYPE)
+        return chunk
+
+    def report(self) -> pd.DataFrame:
+        """One row per checked column: rows scanned, invalid and missing counts, sample row ids of each."""
+        return pd.DataFrame(
+            {
+                'column': self.report_columns,
+                'rows': self.n_rows,
+                'invalid': self._invalid,
+                'missing': self._missing,
+                'invalid_rows': self._invalid_rows,
+                'missing_rows': self._missing_rows,
+            },
+            columns=['column', 'rows', 'invalid', 'missing', 'invalid_rows', 'missing_rows'],
+        )
+
+
+class TypedFrameStore:
+    """Typed columns preallocated for `capacity` rows, filled chunk by chunk.
+
+    Declared float columns are float64 arrays, declared text columns other than `date_col` are
+    category codes against a dictionary grown across chunks, the date column holds the int32 keys
+    `NumericBlockValidator.coerce` parsed, and undeclared columns are object arrays. `to_frame` returns the same dtypes as typing the whole file at once:
+    categories sorted, and float columns whose every chunk parsed as integers cast to int64.
+    """
+
+    def __init__(self, columns: list[str], dtypes: dict, date_col: str, capacity: int):
+        self.columns = columns
+        self.capacity = capacity
+        self.n_rows = 0
+        self._arrays = {}
+        self._categories: dict[str, dict[str, int]] = {}
+        self._integer_columns = set()
+        for col in columns:
+            dtype = dtypes.get(col)
+            if dtype is float:
+                self._arrays[col] = np.empty(capacity, dtype=np.float64)
+                self._integer_columns.add(col)
+            elif col == date_col:
+                self._arrays[col] = np.empty(capacity, dtype=DATE_KEY_DTYPE)
+            elif dtype is str:
+                self._arrays[col] = np.empty(capacity, dtype=np.int32)
+                self._categories[col] = {}
+            else:
+                self._arrays[col] = np.empty(capacity, dtype=object)
+
+    def _reserve(self, n_rows: int) -> None:
+        # The line count bounds the rows unless a file ends lines with bare '\r'.
+        if n_rows > self.capacity:
+            self.capacity = max(n_rows, 2 * self.capacity)
+            for col, array in self._arrays.items():
+                grown = np.empty(self.capacity, dtype=array.dtype)
+                grown[: self.n_rows] = array[: self.n_rows]
+                self._arrays[col] = grown
+
+    def append(self, chunk: pd.DataFrame) -> None:
+        start, stop = self.n_rows, self.n_rows + len(chunk)
+        self._reserve(stop)
+        for col in self.columns:
+            values = chunk[col]
+            if col in self._categories:
+                chunk_codes, uniques = pd.factorize(values, use_na_sentinel=False)
+                lookup = self._categories[col]
+                global_codes = np.fromiter(
+                    (lookup.setdefault(value, len(lookup)) for value in uniques), dtype=np.int32, count=len(uniques)
+                )
+                self._arrays[col][start:stop] = global_codes[chunk_codes]
+            else:
+                if col in self._integer_columns and not pd.api.types.is_integer_dtype(values.dtype):
+                    self._integer_columns.discard(col)
+                self._arrays[col][start:stop] = values.to_numpy()
+        self.n_rows = stop
+
+    def to_frame(self) -> pd.DataFrame:
+        data = {}
+        for col in self.columns:
+            array = self._arrays.pop(col)
+            # Copy out of an oversized buffer so the unused tail is released column by column.
+            array = array[: self.n_rows].copy() if self.n_rows < len(array) else array
+            if col in self._categories:
+                categories = np.array(list(self._categories[col]), dtype=object)
+                order = np.argsort(categories, kind='stable')
+                remap = np.empty(len(order), dtype=np.int32)
+                remap[order] = np.arange(len(order), dtype=np.int32)
+                array = pd.Categorical.from_codes(remap[array], categories=pd.Index(categories[order], dtype=object))
+            elif col in self._integer_columns and self.n_rows:
+                array = array.astype(np.int64)
+            data[col] = array
+        return pd.DataFrame(data, columns=self.columns, copy=False)
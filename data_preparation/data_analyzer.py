@@ -1,12 +1,13 @@
-from datetime import datetime
 from enum import Enum
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel
 
 from config import param_cls
-from config.config import PERIOD_HEADERS, WIND_DT_FORMAT
+from config.config import PERIOD_HEADERS
+from utils import DATE_KEY_DTYPE, date_keys_to_datetime64
 
 
 class PeriodName(str, Enum):
@@ -19,46 +20,70 @@ class Period(BaseModel):
     period_name: PeriodName
 
 
-def get_1st_trade_dt_of_period(date: str, trade_dt: List[str], dt_format: str, period: Period):
-    period_format = {
-        PeriodName.WEEK.value: '%Y%W',
-        PeriodName.MONTH.value: '%Y%m',
-        PeriodName.YEAR.value: '%Y',
-    }
+def get_period_keys(date_keys: np.ndarray, period: Period) -> np.ndarray:
+    """Integer period labels that order like `'%Y%W'`, `'%Y%m'` and `'%Y'` for yyyymmdd keys."""
+    if period.period_name == PeriodName.YEAR:
+        return date_keys // 10000
+    if period.period_name == PeriodName.MONTH:
+        return date_keys // 100
+
+    dates = date_keys_to_datetime64(date_keys)
+    day_of_year = (dates - dates.astype('datetime64[Y]')).astype(np.int64)
+    # 1970-01-01 was a Thursday; shift so Monday is 0, as `%W` counts weeks from Monday.
+    weekday = (dates.astype(np.int64) + 3) % 7
+    return date_keys // 10000 * 100 + (day_of_year + 7 - weekday) // 7
+
+
+def get_1st_trade_dt_of_period(
+    date: int,
+    trade_dt: List[int],
+    period: Period,
+    trade_dt_keys: np.ndarray | None = None,
+) -> int:
+    if trade_dt_keys is None:
+        trade_dt_keys = np.asarray(trade_dt, dtype=DATE_KEY_DTYPE)
+    period_keys = get_period_keys(trade_dt_keys, period)
 
     end_dt = min(trade_dt[-1], date)
-    period_number = list(
-        map(
-            lambda dt: datetime.strptime(dt, dt_format).strftime(period_format[period.period_name.value]),
-            trade_dt,
-        )
-    )
-    return trade_dt[period_number.index(period_number[trade_dt.index(end_dt)])]
+    end_pos = int(np.searchsorted(trade_dt_keys, end_dt))
+    return trade_dt[int(np.searchsorted(period_keys, period_keys[end_pos]))]
 
 
-def calculate_pct_change(df_indexed: pd.DataFrame, start_idx: str, end_idx: str):
+def calculate_pct_change(df_indexed: pd.DataFrame, start_idx: int, end_idx: int):
     return df_indexed[end_idx] / df_indexed[start_idx] - 1
 
 
-def calculate_period_return(series, date: str, custom_dt: Tuple[str, str], trade_dt: List[str]):
+def get_period_return_bounds(
+    date: int,
+    custom_dt: Tuple[int, int],
+    trade_dt: List[int],
+) -> tuple[list[str], list[int], list[int]]:
+    """Column labels, start dates and end dates of the week/month/year-to-date and custom period returns."""
+    trade_dt_keys = np.asarray(trade_dt, dtype=DATE_KEY_DTYPE)
     end_dt = min(trade_dt[-1], date)
-    first_dt_list = list(
-        map(
-            lambda x: get_1st_trade_dt_of_period(end_dt, trade_dt, WIND_DT_FORMAT, Period(period_name=x)),
-            ['week', 'month', 'year'],
-        )
-    ) + [custom_dt[0]]
+    first_dt_list = [
+        get_1st_trade_dt_of_period(end_dt, trade_dt, Period(period_name=x), trade_dt_keys=trade_dt_keys)
+        for x in ['week', 'month', 'year']
+    ] + [custom_dt[0]]
     # 注意：计算收益率时，需要取区间起始交易日前一交易日价格来计算
-    start_dt_list = [trade_dt[trade_dt.index(x) - 1] for x in first_dt_list]
+    start_dt_list = [trade_dt[int(np.searchsorted(trade_dt_keys, x)) - 1] for x in first_dt_list]
     end_dt_list = [end_dt] * 3 + [custom_dt[1]]
-    index_list = list(
-        map(
-            (lambda x, y, z: f'{x} [{y[-6:]} - {z[-6:]}]'),
-            PERIOD_HEADERS,
-            first_dt_list,
-            end_dt_list,
-        )
-    )
+    index_list = [
+        f'{x} [{y % 1000000:06d} - {z % 1000000:06d}]' for x, y, z in zip(PERIOD_HEADERS, first_dt_list, end_dt_list)
+    ]
+    return index_list, start_dt_list, end_dt_list
+
+
+def calculate_period_return(
+    series,
+    date: int,
+    custom_dt: Tuple[int, int],
+    trade_dt: List[int],
+    bounds: tuple[list[str], list[int], list[int]] | None = None,
+):
+    if bounds is None:
+        bounds = get_period_return_bounds(date, custom_dt, trade_dt)
+    index_list, start_dt_list, end_dt_list = bounds
 
     return pd.Series(
         data=list(
@@ -74,15 +99,130 @@ def calculate_period_return(series, date: str, custom_dt: Tuple[str, str], trade
 
 def calculate_grouped_return(
     df: pd.DataFrame,
-    date: str,
-    custom_dt: Tuple[str, str],
-    trade_dt: List[str],
+    date: int,
+    custom_dt: Tuple[int, int],
+    trade_dt: List[int],
     config: param_cls.BaseDataColParam,
 ):
     df_indexed = df.set_index(config.dt_col)
 
-    return (
-        df_indexed.groupby(config.name_col)[config.price_col]
-        .apply(calculate_period_return, date=date, custom_dt=custom_dt, trade_dt=trade_dt)
+    grouped_ret_df = (
+        df_indexed.groupby(config.name_col, observed=True)[config.price_col]
+        .apply(
+            calculate_period_return,
+            date=date,
+            custom_dt=custom_dt,
+            trade_dt=trade_dt,
+            bounds=get_period_return_bounds(date, custom_dt, trade_dt),
+        )
         .unstack()
     )
+    grouped_ret_df.index = grouped_ret_df.index.astype(str)
+    return grouped_ret_df
+
+
+# Rolling performance metrics
+#
+# All helpers take wide frames (dates as index, one column per asset) sorted by
+# date ascending. Sharpe and volatility use pandas rolling kernels, which update
+# their window state incrementally, and max drawdown uses per-block prefix/suffix
+# scans, so each metric is O(n) per column regardless of the window size.
+
+
+def calculate_rolling_volatility(ret_wide_df: pd.DataFrame, window_size: int, trading_days: int) -> pd.DataFrame:
+    """Annualized rolling volatility of daily returns."""
+    return ret_wide_df.rolling(window=window_size).std(ddof=1).mul(np.sqrt(trading_days))
+
+
+def calculate_rolling_sharpe(
+    ret_wide_df: pd.DataFrame,
+    window_size: int,
+    trading_days: int,
+    rf_annual: float = 0.0,
+) -> pd.DataFrame:
+    """Annualized rolling Sharpe ratio, consistent with the whole-period NAV metrics."""
+    rf_daily = (1 + rf_annual) ** (1 / trading_days) - 1
+    rolling_excess = ret_wide_df.sub(rf_daily).rolling(window=window_size)
+    vol = rolling_excess.std(ddof=1)
+    return rolling_excess.mean().div(vol.where(vol > 0)).mul(np.sqrt(trading_days))
+
+
+def calculate_rolling_max_drawdown(nav_wide_df: pd.DataFrame, window_size: int) -> pd.DataFrame:
+    """Max drawdown within each trailing window of `window_size` returns (`window_size` + 1 NAVs).
+
+    The peak is the running max inside the window, as for a whole-period max drawdown. The
+    rows are cut into blocks of one window length, so every window is a block suffix followed
+    by the next block's prefix (the van Herk/Gil-Werman split used for sliding maxima); prefix
+    and suffix scans of each block give every window's drawdown in O(n) per column. Windows
+    with a missing NAV are NaN.
+    """
+    nav = nav_wide_df.to_numpy(dtype=np.float64)
+    n_rows, n_cols = nav.shape
+    length = window_size + 1
+    max_drawdown = np.full(nav.shape, np.nan)
+    if n_rows >= length:
+        n_blocks = -(-n_rows // length)
+        blocks = np.full((n_blocks * length, n_cols), np.nan)
+        blocks[:n_rows] = nav
+        blocks = blocks.reshape(n_blocks, length, n_cols)
+
+        # From each block start: peak, trough and worst drawdown up to a row.
+        pre_max = np.maximum.accumulate(blocks, axis=1)
+        pre_min = np.minimum.accumulate(blocks, axis=1)
+        pre_worst = np.minimum.accumulate(blocks / pre_max - 1, axis=1)
+        # From a row to its block end: peak, and worst drawdown of a peak at or after the row.
+        reversed_blocks = blocks[:, ::-1]
+        suf_max = np.maximum.accumulate(reversed_blocks, axis=1)[:, ::-1]
+        suf_min = np.minimum.accumulate(reversed_blocks, axis=1)
+        suf_worst = np.minimum.accumulate(suf_min / reversed_blocks - 1, axis=1)[:, ::-1]
+
+        pre_min, pre_worst, suf_max, suf_worst = (
+            values.reshape(-1, n_cols) for values in (pre_min, pre_worst, suf_max, suf_worst)
+        )
+        ends = np.arange(length - 1, n_rows)
+        starts = ends - length + 1
+        worst = pre_worst[ends]
+        # Windows not aligned to a block combine the suffix's peak with the prefix's trough.
+        split = starts % length != 0
+        split_starts, split_ends = starts[split], ends[split]
+        worst[split] = np.minimum(
+            np.minimum(suf_worst[split_starts], worst[split]),
+            pre_min[split_ends] / suf_max[split_starts] - 1,
+        )
+        max_drawdown[length - 1 :] = worst
+    return pd.DataFrame(max_drawdown, index=nav_wide_df.index, columns=nav_wide_df.columns)
+
+
+def calculate_rolling_excess_return(nav_wide_df: pd.DataFrame, bench_col: str, window_size: int) -> pd.DataFrame:
+    """Rolling excess return of every column over `bench_col`, using the NAV ratio convention."""
+    excess_nav_df = nav_wide_df.drop(columns=bench_col).div(nav_wide_df[bench_col], axis=0)
+    return excess_nav_df.pct_change(periods=window_size, fill_method=None)
+
+
+ROLLING_PERF_METRICS = ('sharpe', 'volatility', 'max_drawdown', 'excess_return')
+
+
+def calculate_rolling_performance(
+    nav_wide_df: pd.DataFrame,
+    window_size: int,
+    trading_days: int,
+    rf_annual: float = 0.0,
+    bench_col: str | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Compute all rolling performance metrics for a wide NAV/price panel.
+
+    Returns:
+        Mapping from metric name (see `ROLLING_PERF_METRICS`) to a wide frame aligned
+        on the input index. `excess_return` is only present when `bench_col` is given.
+    """
+    nav_wide_df = nav_wide_df.sort_index()
+    ret_wide_df = nav_wide_df.pct_change(fill_method=None)
+
+    rolling_perf = {
+        'sharpe': calculate_rolling_sharpe(ret_wide_df, window_size, trading_days, rf_annual=rf_annual),
+        'volatility': calculate_rolling_volatility(ret_wide_df, window_size, trading_days),
+        'max_drawdown': calculate_rolling_max_drawdown(nav_wide_df, window_size),
+    }
+    if bench_col is not None:
+        rolling_perf['excess_return'] = calculate_rolling_excess_return(nav_wide_df, bench_col, window_size)
+    return rolling_perf
@@ -1,9 +1,24 @@
+import logging
 import os
-import time
+import threading
+from collections.abc import Callable
 
+import numpy as np
 import pandas as pd
 
 from config import config, param_cls, style_config
+from data_preparation.csv_ingest import CSV_CHUNK_ROWS, NumericBlockValidator, TypedFrameStore, count_csv_rows
+from data_preparation.frame_cache import estimate_nbytes
+from data_preparation.snapshot_store import (
+    file_content_hash,
+    get_snapshot_dir,
+    load_snapshot_manifest,
+    read_current_snapshot_id,
+)
+from span_timing import timed_span
+from utils import DATE_KEY_DTYPE, SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 # Canonical schema definitions (incrementally introduced per dataset)
@@ -125,18 +140,89 @@ DATASET_SCHEMAS = {
 }
 
 
-def add_canonical_columns(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
-    """Add normalized English column aliases while retaining original columns."""
+def get_canonical_col(table_name: str, canonical: str) -> str:
+    """Resolve a normalized English alias to the column that holds its data.
+
+    Aliases are a name map rather than materialized columns, so fetched frames
+    carry each value column once.
+    """
     mapping = CANONICAL_COL_MAPPINGS.get(table_name, {})
-    for canonical, source in mapping.items():
-        if source in df.columns:
-            df[canonical] = df[source]
-    return df
+    if canonical not in mapping:
+        raise KeyError(f'No canonical column {canonical!r} declared for {table_name}')
+    return mapping[canonical]
+
+
+def get_csv_path(table_name: str) -> str:
+    """Path of the snapshot CSV in the current published version (or the flat `CSV_DATA_DIR`)."""
+    return os.path.join(get_snapshot_dir(read_current_snapshot_id()), config.CSV_FILE_MAPPING[table_name])
+
+
+def _resolve_snapshot_file(table_name: str) -> tuple[str, str, str]:
+    """(snapshot id, CSV path, version tag) from one read of the snapshot pointer, so all name one version."""
+    snapshot_id = read_current_snapshot_id()
+    csv_path = os.path.join(get_snapshot_dir(snapshot_id), config.CSV_FILE_MAPPING[table_name])
+    try:
+        stat = os.stat(csv_path)
+    except OSError:
+        return snapshot_id, csv_path, ''
+    version = f'{stat.st_mtime_ns}-{stat.st_size}'
+    return snapshot_id, csv_path, f'{snapshot_id}:{version}' if snapshot_id else version
+
+
+def get_snapshot_version(table_name: str) -> str:
+    """Return a cheap version tag for a CSV snapshot (published version id + mtime + size).
+
+    Used as part of cache keys so cached results are invalidated when a
+    snapshot file is replaced. Returns an empty string when the file is missing.
+    """
+    return _resolve_snapshot_file(table_name)[2]
+
+
+_SNAPSHOT_CONTENT_HASHES: dict[tuple[str, str], str] = {}
+
 
+def get_snapshot_content_hash(table_name: str) -> str:
+    """Return a digest of a CSV snapshot's bytes, hashed once per file version.
 
-def read_csv_data(table_name: str) -> pd.DataFrame:
-    """Read data from CSV file based on table name"""
-    csv_path = os.path.join(config.CSV_DATA_DIR, config.CSV_FILE_MAPPING[table_name])
+    Unlike `get_snapshot_version`, it survives restarts and copies of the same file, so it keys
+    the on-disk result cache. Published versions carry their hashes in the version manifest.
+    Returns an empty string when the file is missing.
+    """
+    snapshot_id, csv_path, version = _resolve_snapshot_file(table_name)
+    if not version:
+        return ''
+    if snapshot_id:
+        try:
+            return load_snapshot_manifest(snapshot_id)['files'][config.CSV_FILE_MAPPING[table_name]]
+        except (FileNotFoundError, KeyError):
+            pass
+    key = (csv_path, version)
+    if key not in _SNAPSHOT_CONTENT_HASHES:
+        _SNAPSHOT_CONTENT_HASHES[key] = file_content_hash(csv_path)
+    return _SNAPSHOT_CONTENT_HASHES[key]
+
+
+# NOTE 数据质量报告
+# Reading a snapshot tallies, per declared numeric column and the date column, the cells that
+# did not parse (`invalid`) or were empty (`missing`) with sample row ids; rows without a date
+# are dropped. The report is kept per file version, like the sorted snapshot, so the debug
+# panel and `scripts/validate_snapshots.py` show it without scanning the file again.
+_VALIDATION_REPORTS: dict[str, tuple[tuple[str, str], pd.DataFrame]] = {}
+_VALIDATION_REPORTS_LOCK = threading.Lock()
+
+
+def read_csv_data(
+    table_name: str,
+    row_filter: Callable[[pd.DataFrame], pd.Series] | None = None,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Read data from CSV file based on table name
+
+    The file is read and typed in chunks of `chunk_rows`; `row_filter` (a boolean mask over a
+    typed chunk) drops rows before they are stored. The validation report of the whole file
+    is kept for `get_validation_report`.
+    """
+    _, csv_path, version = _resolve_snapshot_file(table_name)
     if not os.path.exists(csv_path):
         print(f'Warning: CSV file not found at {csv_path}')
         return pd.DataFrame()
@@ -144,33 +230,52 @@ def read_csv_data(table_name: str) -> pd.DataFrame:
     try:
         schema = DATASET_SCHEMAS.get(table_name)
         dtypes = schema['dtypes'] if schema and 'dtypes' in schema else config.CSV_DTYPE_MAPPING[table_name]
-        # Read CSV as strings first, then coerce to the declared schema below.
-        df = pd.read_csv(csv_path, dtype=str)
+        date_col = schema['date_col'] if schema else '交易日期'
+        physical_to_raw = schema.get('physical_to_raw') if schema else None
+        if physical_to_raw:
+            date_col = {raw: physical for physical, raw in physical_to_raw.items()}.get(date_col, date_col)
 
         # Verify all required columns are present
-        missing_cols = set(dtypes.keys()) - set(df.columns)
+        columns = pd.read_csv(csv_path, dtype=str, nrows=0).columns.tolist()
+        missing_cols = set(dtypes.keys()) - set(columns)
         if missing_cols:
             raise ValueError(f'Missing columns in {table_name} CSV file: {missing_cols}')
 
-        # Verify data types and handle any conversion errors
-        for col, dtype in dtypes.items():
-            try:
-                if dtype is float:
-                    # Convert to numeric, coerce errors to NaN
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                    # Check for NaN values that indicate conversion errors
-                    nan_count = df[col].isna().sum()
-                    if nan_count > 0:
-                        print(f'Warning: {nan_count} rows in column {col} contain invalid numeric values')
-                elif dtype is str:
-                    # Convert to string, replace NaN with empty string
-                    df[col] = df[col].fillna('').astype(str)
-            except Exception as e:
-                raise ValueError(f'Error converting column {col} to {dtype}: {str(e)}')
+        text_cols = [col for col, dtype in dtypes.items() if dtype is str and col != date_col]
+        validator = NumericBlockValidator(
+            [col for col, dtype in dtypes.items() if dtype is float], date_col=date_col if date_col in columns else None
+        )
+        store = TypedFrameStore(columns, dtypes, date_col, capacity=count_csv_rows(csv_path))
+        # Read CSV chunks as strings first, then coerce each to the declared schema below.
+        with timed_span('read_csv'):
+            for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunk_rows):
+                with timed_span('coerce_dtypes'):
+                    # Numeric columns are converted as one block (dirty cells become NaN), rows
+                    # without a yyyymmdd date are dropped, the other dates become int32 keys, and
+                    # text columns replace NaN with ''.
+                    chunk = validator.coerce(chunk)
+                    chunk[text_cols] = chunk[text_cols].fillna('')
+                if row_filter is not None:
+                    chunk = chunk[row_filter(chunk)]
+                # Codes, names and terms repeat on every date: the store keeps them once as categories.
+                store.append(chunk)
+        df = store.to_frame()
+
+        report = validator.report()
+        for col, invalid, missing in report[['column', 'invalid', 'missing']].itertuples(index=False):
+            if col == validator.date_col and invalid + missing > 0:
+                logger.warning(
+                    '%s: dropped rows without a date in %s: %d invalid, %d missing', table_name, col, invalid, missing
+                )
+            elif invalid + missing > 0:
+                logger.warning('%s: NaN cells in %s: %d invalid, %d missing', table_name, col, invalid, missing)
+        # Not kept when the file was replaced during the read: the report may describe the newer one.
+        if version and _resolve_snapshot_file(table_name)[1:] == (csv_path, version):
+            with _VALIDATION_REPORTS_LOCK:
+                _VALIDATION_REPORTS[table_name] = ((csv_path, version), report)
 
         # Materialize legacy/raw Wind columns from Chinese physical headers
         # when the schema declares a mapping.
-        physical_to_raw = schema.get('physical_to_raw') if schema else None
         if physical_to_raw:
             for physical_col, raw_col in physical_to_raw.items():
                 if physical_col in df.columns and raw_col not in df.columns:
@@ -182,70 +287,158 @@ def read_csv_data(table_name: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-class CSVDataSource:
-    """CSV-backed data access with normalized schemas."""
+def get_validation_report(table_name: str, load: bool = True) -> pd.DataFrame | None:
+    """Data-quality report (see `NumericBlockValidator.report`) of the current snapshot of `table_name`.
 
-    def fetch_index_data(self, latest_date: str, _config: param_cls.WindListedSecParam) -> pd.DataFrame:
-        df = read_csv_data('A_IDX_PRICE')
-        if not df.empty:
-            date_col = INDEX_PRICE_SCHEMA['date_col']
-            df = df[
-                (df[date_col] >= _config.start_date)
-                & (df[date_col] <= latest_date)
-                & (df['S_INFO_WINDCODE'].isin(_config.wind_codes))
-            ]
-            df = add_canonical_columns(df, 'A_IDX_PRICE')
-            df = df.sort_values(by=date_col, ascending=False)
-        return df
+    Args:
+        load: when no report is kept for the current file version, scan the file (without
+            keeping its rows) to build one; with False, return None instead.
 
-    def fetch_financial_factors_stocks(self, latest_date: str) -> pd.DataFrame:
-        df = read_csv_data('FINANCIAL_FACTORS_STOCKS')
-        if not df.empty:
-            date_col = FINANCIAL_FACTORS_STOCKS_SCHEMA['date_col']
-            df = df[df[date_col] <= latest_date]
-            df = add_canonical_columns(df, 'FINANCIAL_FACTORS_STOCKS')
-            df = df.sort_values(by=date_col, ascending=False)
-        return df
+    Returns:
+        None when the file is missing or could not be read.
+    """
+    _, csv_path, version = _resolve_snapshot_file(table_name)
+    with _VALIDATION_REPORTS_LOCK:
+        cached = _VALIDATION_REPORTS.get(table_name)
+    if cached is not None and cached[0] == (csv_path, version):
+        return cached[1].copy()
+    if not load:
+        return None
 
-    def fetch_table(self, latest_date: str, table_name: str) -> pd.DataFrame:
-        df = read_csv_data(table_name)
-        if df.empty:
-            return df
+    read_csv_data(table_name, row_filter=lambda df: np.zeros(len(df), dtype=bool))
+    with _VALIDATION_REPORTS_LOCK:
+        cached = _VALIDATION_REPORTS.get(table_name)
+    return cached[1].copy() if cached is not None else None
 
-        schema = DATASET_SCHEMAS.get(table_name)
-        if schema is not None:
-            date_col = schema['date_col']
-        else:
-            date_col = '交易日期'
-        start_date = None
-        try:
-            wind_portal = getattr(param_cls.WindPortal, table_name)
-        except AttributeError:
-            wind_portal = None
-        if wind_portal is not None and wind_portal in style_config.DATA_CONFIG:
-            start_date = style_config.DATA_CONFIG[wind_portal]['DATA_START_DT']
 
-        if start_date is not None:
-            df = df[(df[date_col] >= start_date) & (df[date_col] <= latest_date)]
-        else:
-            df = df[df[date_col] <= latest_date]
+def get_source_row_filter(table_name: str) -> Callable[[pd.DataFrame], pd.Series] | None:
+    """Row mask of the fixed `CSVDataSource.fetch_table` filters of `table_name`, or None.
 
+    The sorted snapshot is loaded through it, so rows no page fetches are never stored.
+    """
+    try:
+        wind_portal = getattr(param_cls.WindPortal, table_name)
+    except AttributeError:
+        return None
+    if wind_portal not in style_config.DATA_CONFIG:
+        return None
+    data_config = style_config.DATA_CONFIG[wind_portal]
+    start_key = int(data_config['DATA_START_DT'])
+
+    def row_filter(df: pd.DataFrame) -> pd.Series:
+        mask = df['交易日期'] >= start_key
         if table_name == 'CN_BOND_YIELD':
-            df = df[
-                df['曲线名称'].isin(style_config.DATA_CONFIG[param_cls.WindPortal.CN_BOND_YIELD]['YIELD_CURVE_NAMES'])
-                & df['交易期限'].isin(style_config.DATA_CONFIG[param_cls.WindPortal.CN_BOND_YIELD]['YIELD_CURVE_TERMS'])
-            ]
+            mask &= df['曲线名称'].isin(data_config['YIELD_CURVE_NAMES']) & df['交易期限'].isin(
+                data_config['YIELD_CURVE_TERMS']
+            )
         elif table_name == 'A_IDX_VAL':
-            df = df[df['证券代码'].isin(style_config.DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_CODE'])]
+            mask &= df['证券代码'].isin(data_config['WIND_CODE'])
         elif table_name == 'EDB':
-            df = df[df['指标代码'].isin(style_config.DATA_CONFIG[param_cls.WindPortal.EDB]['WIND_CODE'])]
+            mask &= df['指标代码'].isin(data_config['WIND_CODE'])
         elif table_name == 'SHIBOR_PRICES':
-            df = df[df['期限'].isin(style_config.DATA_CONFIG[param_cls.WindPortal.SHIBOR_PRICES]['B_INFO_TERM'])]
+            mask &= df['期限'].isin(data_config['B_INFO_TERM'])
+        return mask
+
+    return row_filter
+
+
+# NOTE 按日期排序的快照缓存
+# Each snapshot is read, typed and ordered newest-first once per file version; fetches
+# then cut one contiguous date range out of it with searchsorted instead of filtering
+# and re-sorting the whole table on every call. Sessions that miss on the same file
+# version together share one read through `_SORTED_DATASET_LOADS`. Entries are per table,
+# so switching to a new published snapshot replaces (rather than accumulates) them.
+_SORTED_DATASETS: dict[str, tuple[tuple[str, str], pd.DataFrame, np.ndarray]] = {}
+_SORTED_DATASETS_LOCK = threading.Lock()
+_SORTED_DATASET_LOADS = SingleFlight()
+
+
+def _get_cached_sorted_dataset(
+    table_name: str, csv_path: str, version: str
+) -> tuple[pd.DataFrame, np.ndarray] | None:
+    with _SORTED_DATASETS_LOCK:
+        cached = _SORTED_DATASETS.get(table_name)
+    if cached is not None and cached[0] == (csv_path, version):
+        return cached[1], cached[2]
+    return None
+
+
+def _load_sorted_dataset(table_name: str, csv_path: str, version: str) -> tuple[pd.DataFrame, np.ndarray]:
+    # A load that finished between the caller's cache check and joining the flight is reused.
+    cached = _get_cached_sorted_dataset(table_name, csv_path, version)
+    if cached is not None:
+        return cached
+
+    df = read_csv_data(table_name, row_filter=get_source_row_filter(table_name))
+    if df.empty:
+        return df, np.empty(0, dtype=DATE_KEY_DTYPE)
+
+    schema = DATASET_SCHEMAS.get(table_name)
+    neg_date_keys = -df[schema['date_col'] if schema else '交易日期'].to_numpy()
+    order = np.argsort(neg_date_keys, kind='stable')
+    df = df.take(order).reset_index(drop=True)
+    neg_date_keys = neg_date_keys[order]
+    # Not cached when the snapshot was switched during the read: the frame may be the newer one.
+    if version and _resolve_snapshot_file(table_name)[1:] == (csv_path, version):
+        with _SORTED_DATASETS_LOCK:
+            _SORTED_DATASETS[table_name] = ((csv_path, version), df, neg_date_keys)
+    return df, neg_date_keys
+
+
+def get_sorted_dataset(table_name: str) -> tuple[pd.DataFrame, np.ndarray]:
+    """The snapshot ordered by date descending (file order within a date) and its negated date keys.
+
+    Negated keys ascend down the rows, so any date range is a `np.searchsorted` slice.
+    """
+    _, csv_path, version = _resolve_snapshot_file(table_name)
+    cached = _get_cached_sorted_dataset(table_name, csv_path, version)
+    if cached is not None:
+        return cached
+    return _SORTED_DATASET_LOADS.do((csv_path, version), _load_sorted_dataset, table_name, csv_path, version)
+
+
+def get_sorted_dataset_usage() -> pd.DataFrame:
+    """Bytes held by the sorted snapshot cache, one row per table."""
+    with _SORTED_DATASETS_LOCK:
+        cached = list(_SORTED_DATASETS.items())
+    return pd.DataFrame(
+        [
+            {'table': table_name, 'rows': len(df), 'bytes': estimate_nbytes(df) + int(neg_date_keys.nbytes)}
+            for table_name, (_, df, neg_date_keys) in cached
+        ],
+        columns=['table', 'rows', 'bytes'],
+    )
+
+
+def select_date_range(table_name: str, latest_date: str, start_date: str | None = None) -> pd.DataFrame:
+    """Rows of `table_name` dated within [start_date, latest_date], newest first.
+
+    Returns a view of the cached sorted snapshot; callers filter or copy it before
+    handing it out.
+    """
+    df, neg_date_keys = get_sorted_dataset(table_name)
+    lo = np.searchsorted(neg_date_keys, -int(latest_date), side='left')
+    hi = len(df) if start_date is None else np.searchsorted(neg_date_keys, -int(start_date), side='right')
+    return df.iloc[lo:hi]
+
+
+class CSVDataSource:
+    """CSV-backed data access with normalized schemas."""
 
-        df = add_canonical_columns(df, table_name)
-        df = df.sort_values(by=date_col, ascending=False)
+    def fetch_index_data(self, latest_date: str, _config: param_cls.WindListedSecParam) -> pd.DataFrame:
+        df = select_date_range('A_IDX_PRICE', latest_date, start_date=_config.start_date)
+        if not df.empty:
+            df = df[df['S_INFO_WINDCODE'].isin(_config.wind_codes)]
         return df
 
+    def fetch_financial_factors_stocks(self, latest_date: str) -> pd.DataFrame:
+        return select_date_range('FINANCIAL_FACTORS_STOCKS', latest_date).copy()
+
+    def fetch_table(self, latest_date: str, table_name: str) -> pd.DataFrame:
+        # The start date and curve/code/term filters were applied when the sorted snapshot
+        # was loaded (`get_source_row_filter`).
+        return select_date_range(table_name, latest_date).copy()
+
 
 _CSV_DATASOURCE = CSVDataSource()
 
@@ -257,32 +450,16 @@ def get_data_source() -> CSVDataSource:
 # Functions to fetch data from local CSVs (thin wrappers over CSVDataSource)
 def fetch_index_data_from_local(latest_date: str, _config: param_cls.WindListedSecParam):
     """Fetch index data from local CSV file"""
-    start_time = time.time()
-    print(f' - Fetching data from CSV: {param_cls.WindLocal.A_IDX_PRICE.value}')
-
-    df = get_data_source().fetch_index_data(latest_date=latest_date, _config=_config)
-
-    print(f' - [IDX] {time.time() - start_time:.2f}s')
-    return df
+    with timed_span(f'fetch:{param_cls.WindLocal.A_IDX_PRICE.value}'):
+        return get_data_source().fetch_index_data(latest_date=latest_date, _config=_config)
 
 
 def fetch_data_from_local(latest_date: str, table_name: str) -> pd.DataFrame:
     """Fetch data from local CSV file"""
-    start_time = time.time()
-    print(f' - Fetching data from CSV: {table_name}')
-
-    df = get_data_source().fetch_table(latest_date=latest_date, table_name=table_name)
-
-    print(f' - [GEN] {time.time() - start_time:.2f}s')
-    return df
+    with timed_span(f'fetch:{table_name}'):
+        return get_data_source().fetch_table(latest_date=latest_date, table_name=table_name)
 
 
 def fetch_financial_factors_stocks_from_local(latest_date: str) -> pd.DataFrame:
-    start_time = time.time()
-    table_name = 'FINANCIAL_FACTORS_STOCKS'
-    print(f' - Fetching data from CSV: {table_name}')
-
-    df = get_data_source().fetch_financial_factors_stocks(latest_date=latest_date)
-
-    print(f' - [GEN] {time.time() - start_time:.2f}s')
-    return df
+    with timed_span('fetch:FINANCIAL_FACTORS_STOCKS'):
+        return get_data_source().fetch_financial_factors_stocks(latest_date=latest_date)
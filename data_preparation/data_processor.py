@@ -1,12 +1,18 @@
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
+from span_timing import span_timer
 from utils import get_np_quantile_inv_q
 
 
+@span_timer
 def reshape_long_df_into_wide_form(long_df, index_col, name_col, value_col, add_suffix=False):
     wide_df = long_df.pivot(index=index_col, columns=name_col, values=value_col)
     wide_df.columns = wide_df.columns.astype(str)
+    if not wide_df.columns.is_monotonic_increasing:
+        # Categorical names pivot in order of appearance; keep the sorted layout object columns get.
+        wide_df = wide_df.sort_index(axis=1)
     if add_suffix:
         # wide_df.columns = [f'{name_col}_{col}' for col in wide_df.columns]
         wide_df = wide_df.add_suffix('_' + value_col)
@@ -165,17 +171,13 @@ def append_year_on_year_growth_column(
     indexed_df,
     yoy_col: str,
     target_col: str | None = None,
-    dt_format: str = r'%Y%m%d',
     dropna: bool = True,
 ):
     if target_col is None:
         target_col = indexed_df.columns[-1]
 
-    indexed_df.index = pd.to_datetime(indexed_df.index, format=dt_format)
-
-    indexed_df[yoy_col] = indexed_df.groupby([indexed_df.index.month])[target_col].pct_change(fill_method=None)
-
-    indexed_df.index = indexed_df.index.strftime(dt_format)
+    months = indexed_df.index.to_numpy() // 100 % 100
+    indexed_df[yoy_col] = indexed_df.groupby(months)[target_col].pct_change(fill_method=None)
 
     if dropna:
         return indexed_df.dropna(inplace=False)
@@ -225,3 +227,176 @@ def append_signal_column(
         choices=choices,
         default=middle_signal,
     )
+
+
+def calculate_rolling_quantile_bands(
+    values: np.ndarray,
+    window_size: int,
+    quantiles: list[float],
+    method: str = 'median_unbiased',
+) -> np.ndarray:
+    """Rolling quantiles of `values` for several quantile levels (in %) in one pass.
+
+    Matches `append_rolling_quantile_column` window by window: the first
+    `window_size - 1` rows and any window containing NaN yield NaN.
+
+    Returns:
+        (len(values), len(quantiles)) array.
+    """
+    values = np.asarray(values, dtype='float64')
+    bands = np.full((len(values), len(quantiles)), np.nan)
+    if len(values) < window_size or not len(quantiles):
+        return bands
+
+    windows = sliding_window_view(values, window_size)
+    bands[window_size - 1 :] = np.quantile(windows, np.asarray(quantiles) / 100, axis=1, method=method).T
+    return bands
+
+
+class ColumnPipeline:
+    """Derive columns of a wide numeric frame into one preallocated float block.
+
+    Each step mirrors an `append_*_column` helper. `trim=True` (or `trim()`) marks
+    where the helper would have returned `dropna()`: later steps only see the rows
+    kept so far, exactly as they would on the trimmed frame, but the dropped rows
+    are compacted out of the block once at the end instead of copying the frame
+    per step. The returned frame wraps the block without another copy.
+
+    Example:
+        pipeline = ColumnPipeline(wide_df).ratio('a', 'b', 'a/b').rolling_mean('a/b', 20, '均值', trim=True)
+        result_df = pipeline.run()
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._steps: list[tuple] = []
+        self._marks: dict[str, pd.DataFrame] = {}
+
+    def _add(self, out_col: str, func, trim: bool) -> 'ColumnPipeline':
+        self._steps.append(('col', out_col, func))
+        if trim:
+            self.trim()
+        return self
+
+    def trim(self) -> 'ColumnPipeline':
+        self._steps.append(('trim', None, None))
+        return self
+
+    def mark(self, name: str, columns: list[str]) -> 'ColumnPipeline':
+        """Snapshot `columns` on the rows kept at this point, read back with `frame_at`."""
+        self._steps.append(('mark', name, columns))
+        return self
+
+    def ratio(self, numerator_col: str, denominator_col: str, ratio_col: str, trim: bool = False):
+        return self._add(ratio_col, lambda get: get(numerator_col) / get(denominator_col), trim)
+
+    def difference(self, minuend_col: str, subtrahend_col: str, difference_col: str, trim: bool = False):
+        return self._add(difference_col, lambda get: get(minuend_col) - get(subtrahend_col), trim)
+
+    def sum(
+        self,
+        sum_1_col: str,
+        sum_2_col: str,
+        sum_col: str,
+        multiplier_1: float = 1,
+        multiplier_2: float = 1,
+        multiplier_sum: float = 1,
+        trim: bool = False,
+    ):
+        return self._add(
+            sum_col,
+            lambda get: (get(sum_1_col) * multiplier_1 + get(sum_2_col) * multiplier_2) * multiplier_sum,
+            trim,
+        )
+
+    def pct_change(self, target_col: str, periods: int, pct_change_col: str, trim: bool = False):
+        return self._add(pct_change_col, lambda get: pd.Series(get(target_col)).pct_change(periods).to_numpy(), trim)
+
+    def rolling_mean(self, target_col: str, window_size: int, rolling_mean_col: str, trim: bool = False):
+        return self._add(
+            rolling_mean_col,
+            lambda get: pd.Series(get(target_col)).rolling(window=window_size).mean().to_numpy(),
+            trim,
+        )
+
+    def rolling_sum(self, target_col: str, window_size: int, rolling_sum_col: str, trim: bool = False):
+        return self._add(
+            rolling_sum_col,
+            lambda get: pd.Series(get(target_col)).rolling(window=window_size).sum().to_numpy(),
+            trim,
+        )
+
+    def rolling_quantile(
+        self,
+        target_col: str,
+        window_size: int,
+        rolling_quantile_col: str,
+        quantile: float = 50,
+        method: str = 'median_unbiased',
+        trim: bool = False,
+    ):
+        return self._add(
+            rolling_quantile_col,
+            lambda get: calculate_rolling_quantile_bands(get(target_col), window_size, [quantile], method=method)[:, 0],
+            trim,
+        )
+
+    def run(self) -> pd.DataFrame:
+        """Evaluate every step and return the frame trimmed to the rows kept by the last trim."""
+        in_cols = list(self._df.columns)
+        cols = list(in_cols)
+        for kind, out_col, _ in self._steps:
+            if kind == 'col' and out_col not in cols:
+                cols.append(out_col)
+        col_pos = {col: pos for pos, col in enumerate(cols)}
+
+        n_rows = len(self._df)
+        # Column-major so each column is contiguous for the per-column kernels.
+        block = np.full((n_rows, len(cols)), np.nan, order='F')
+        for pos in range(len(in_cols)):
+            block[:, pos] = self._df.iloc[:, pos].to_numpy(dtype='float64')
+        filled = np.zeros(len(cols), dtype=bool)
+        filled[: len(in_cols)] = True
+
+        keep = np.ones(n_rows, dtype=bool)
+        rows = None  # None: every row is kept, so columns are read as views
+        for kind, out_col, arg in self._steps:
+            if kind == 'trim':
+                for pos in np.flatnonzero(filled):
+                    keep &= ~np.isnan(block[:, pos])
+                rows = None if keep.all() else np.flatnonzero(keep)
+            elif kind == 'mark':
+                self._marks[out_col] = self._take(block, keep, [col_pos[col] for col in arg], arg)
+            else:
+                pos = col_pos[out_col]
+
+                def get(col: str, rows: np.ndarray | None = rows) -> np.ndarray:
+                    return block[:, col_pos[col]] if rows is None else block[rows, col_pos[col]]
+
+                values = arg(get)
+                if rows is None:
+                    block[:, pos] = values
+                else:
+                    block[:, pos] = np.nan
+                    block[rows, pos] = values
+                filled[pos] = True
+
+        if rows is not None:
+            # Compact the kept rows to the top of each column in place instead of copying the block.
+            for pos in range(len(cols)):
+                block[: len(rows), pos] = block[rows, pos]
+            block = block[: len(rows)]
+        return self._wrap(block, self._df.index[keep], cols)
+
+    def frame_at(self, mark: str) -> pd.DataFrame:
+        """The columns snapshotted by `mark` (after `run`)."""
+        return self._marks[mark]
+
+    def _take(self, block: np.ndarray, keep: np.ndarray, col_idx: list[int], columns: list[str]) -> pd.DataFrame:
+        values = np.empty((int(keep.sum()), len(col_idx)), order='F')
+        for out_pos, pos in enumerate(col_idx):
+            np.compress(keep, block[:, pos], out=values[:, out_pos])
+        return self._wrap(values, self._df.index[keep], columns)
+
+    def _wrap(self, values: np.ndarray, index: pd.Index, columns: list[str]) -> pd.DataFrame:
+        return pd.DataFrame(values, index=index, columns=pd.Index(columns, name=self._df.columns.name), copy=False)
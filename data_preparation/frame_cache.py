@@ -0,0 +1,263 @@
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+from utils import SingleFlight
+
+# NOTE 进程内结果内存预算
+# Derived frames are cached once per process and shared by every Streamlit session instead
+# of being copied per session (as `st.cache_data` does on each call). The cache accounts the
+# deep `memory_usage` of what it holds, records which sessions read each entry, and evicts
+# least recently used entries past `ST_IDX_FRAME_CACHE_MAX_BYTES`. Entries only one session
+# has read (e.g. a date nobody else picked) also count against that session's
+# `ST_IDX_SESSION_CACHE_MAX_BYTES`, so one user sweeping a slider cannot flush everyone's
+# results. Callers get shallow copies: adding or replacing columns is safe, writing values in
+# place is not.
+FRAME_CACHE_MAX_BYTES_ENV = 'ST_IDX_FRAME_CACHE_MAX_BYTES'
+SESSION_CACHE_MAX_BYTES_ENV = 'ST_IDX_SESSION_CACHE_MAX_BYTES'
+FRAME_CACHE_DEFAULT_MAX_BYTES = 512 * 1024**2
+SESSION_CACHE_DEFAULT_MAX_BYTES = 128 * 1024**2
+
+
+def estimate_nbytes(value) -> int:
+    """Deep memory footprint of a (nested) result of frames, series, arrays and containers."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _shallow_copy(value):
+    """New frame/container objects over the cached data, so callers cannot rebind shared columns."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return {key: _shallow_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shallow_copy(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_shallow_copy(item) for item in value)
+    return value
+
+
+def current_session_id() -> str | None:
+    """Id of the Streamlit session running this thread, or None outside a script run."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+class FrameCache:
+    """Thread-safe LRU of results bounded by their estimated bytes, globally and per session.
+
+    Concurrent misses on one key are coalesced with `SingleFlight`, so sessions that open the
+    same page together compute it once. A result larger than `max_bytes` is returned but not kept.
+    """
+
+    def __init__(self, max_bytes: int, session_max_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self.session_max_bytes = session_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+
+    def _lookup(self, key, session_id: str | None):
+        """Return the cached value (not copied) and mark its use, or raise KeyError."""
+        with self._lock:
+            entry = self._entries[key]
+            now = time.monotonic()
+            if entry['expires_at'] is not None and now >= entry['expires_at']:
+                self._drop(key)
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            entry['last_used'] = now
+            entry['hits'] += 1
+            if session_id is not None:
+                entry['sessions'].add(session_id)
+            return entry['value']
+
+    def get(self, key, session_id: str | None = None):
+        return _shallow_copy(self._lookup(key, session_id))
+
+    def put(self, key, name: str, value, ttl: float | None = None, session_id: str | None = None) -> None:
+        nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {
+                'name': name,
+                'value': value,
+                'nbytes': nbytes,
+                'sessions': {session_id} if session_id is not None else set(),
+                'hits': 0,
+                'created': now,
+                'last_used': now,
+                'expires_at': now + ttl if ttl is not None else None,
+            }
+            self._bytes += nbytes
+            self._evict(keep=key, session_id=session_id)
+
+    def get_or_compute(self, key, name: str, compute: Callable[[], object], ttl: float | None = None):
+        session_id = current_session_id()
+        try:
+            value = self._lookup(key, session_id)
+            with self._lock:
+                self.hits += 1
+            return _shallow_copy(value)
+        except KeyError:
+            pass
+
+        def load():
+            # A load that finished between the miss above and joining the flight is reused.
+            try:
+                return self._lookup(key, session_id)
+            except KeyError:
+                pass
+            value = compute()
+            with self._lock:
+                self.misses += 1
+            self.put(key, name, value, ttl=ttl, session_id=session_id)
+            return value
+
+        value = self._loads.do(key, load)
+        if session_id is not None:
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key]['sessions'].add(session_id)
+        return _shallow_copy(value)
+
+    def _drop(self, key) -> None:
+        self._bytes -= self._entries.pop(key)['nbytes']
+
+    def _evict(self, keep, session_id: str | None) -> None:
+        """Drop LRU entries (never `keep`) past the session budget, then past the global one."""
+        if session_id is not None and self.session_max_bytes is not None:
+            private = [key for key, entry in self._entries.items() if entry['sessions'] == {session_id}]
+            private_bytes = sum(self._entries[key]['nbytes'] for key in private)
+            for key in private:
+                if private_bytes <= self.session_max_bytes:
+                    break
+                if key != keep:
+                    private_bytes -= self._entries[key]['nbytes']
+                    self._drop(key)
+                    self.evictions += 1
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key != keep:
+                self._drop(key)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'session_max_bytes': self.session_max_bytes,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def entry_usage(self) -> pd.DataFrame:
+        """One row per entry, most recently used first."""
+        now = time.monotonic()
+        with self._lock:
+            rows = [
+                {
+                    'name': entry['name'],
+                    'bytes': entry['nbytes'],
+                    'sessions': len(entry['sessions']),
+                    'hits': entry['hits'],
+                    'idle_seconds': now - entry['last_used'],
+                }
+                for entry in reversed(self._entries.values())
+            ]
+        return pd.DataFrame(rows, columns=['name', 'bytes', 'sessions', 'hits', 'idle_seconds'])
+
+    def session_usage(self) -> pd.DataFrame:
+        """Per session: entries read, their bytes (shared ones counted in full) and the private share."""
+        usage = {}
+        with self._lock:
+            for entry in self._entries.values():
+                for session_id in entry['sessions']:
+                    row = usage.setdefault(session_id, {'session': session_id, 'entries': 0, 'bytes': 0, 'private_bytes': 0})
+                    row['entries'] += 1
+                    row['bytes'] += entry['nbytes']
+                    if len(entry['sessions']) == 1:
+                        row['private_bytes'] += entry['nbytes']
+        return pd.DataFrame(
+            sorted(usage.values(), key=lambda row: -row['bytes']),
+            columns=['session', 'entries', 'bytes', 'private_bytes'],
+        )
+
+
+_FRAME_CACHE: FrameCache | None = None
+_FRAME_CACHE_LOCK = threading.Lock()
+
+
+def get_frame_cache() -> FrameCache:
+    """Return the process-wide cache, with budgets read from the environment on every call."""
+    global _FRAME_CACHE
+    max_bytes = int(os.environ.get(FRAME_CACHE_MAX_BYTES_ENV) or FRAME_CACHE_DEFAULT_MAX_BYTES)
+    session_max_bytes = int(os.environ.get(SESSION_CACHE_MAX_BYTES_ENV) or SESSION_CACHE_DEFAULT_MAX_BYTES)
+    with _FRAME_CACHE_LOCK:
+        if _FRAME_CACHE is None:
+            _FRAME_CACHE = FrameCache(max_bytes, session_max_bytes)
+        _FRAME_CACHE.max_bytes = max_bytes
+        _FRAME_CACHE.session_max_bytes = session_max_bytes
+        return _FRAME_CACHE
+
+
+def frame_cached(ttl: float | None = None):
+    """Cache a function's result in the process-wide `FrameCache`, like `st.cache_data`.
+
+    Arguments whose names start with an underscore are left out of the key (pass frames that
+    way and identify them by e.g. the snapshot version); the others must be hashable.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key_args = tuple((arg, value) for arg, value in bound.arguments.items() if not arg.startswith('_'))
+            key = (func.__module__, func.__qualname__, key_args)
+            return get_frame_cache().get_or_compute(key, func.__qualname__, lambda: func(*args, **kwargs), ttl=ttl)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from span_timing import timed_span
+from utils import SingleFlight
+
+# NOTE 跨进程结果缓存
+# Several Streamlit workers on one host share derived frames through Arrow IPC files under
+# `ST_IDX_RESULT_CACHE_DIR`; each entry is a directory renamed into place once complete, so
+# readers never see a half-written result. Entries persist across restarts, keyed by the
+# input snapshots' content hash and the config blocks they depend on, and the least recently
+# used ones are evicted past `ST_IDX_RESULT_CACHE_MAX_BYTES`. Unset, `cached_result` just
+# calls the function.
+# Every key also carries `code_fingerprint()`: `RESULT_CACHE_VERSION`, the pandas/pyarrow
+# versions and a hash of every source the cached results can depend on (the config, data and
+# page packages, `utils.py` and the SQL templates the column aliases come from), so a deploy
+# that changes any of them misses the old entries (which then age out) instead of serving them.
+RESULT_CACHE_VERSION = 1
+RESULT_CACHE_CODE_PATHS = ('config', 'data_preparation', 'visualization', 'sql_template', 'utils.py')
+RESULT_CACHE_CODE_SUFFIXES = ('.py', '.sql')
+RESULT_CACHE_DIR_ENV = 'ST_IDX_RESULT_CACHE_DIR'
+RESULT_CACHE_MAX_BYTES_ENV = 'ST_IDX_RESULT_CACHE_MAX_BYTES'
+RESULT_CACHE_DEFAULT_MAX_BYTES = 512 * 1024**2
+RESULT_CACHE_MANIFEST = 'manifest.json'
+RESULT_CACHE_LOCK_STALE_SECONDS = 300
+RESULT_CACHE_POLL_SECONDS = 0.05
+_SERIES_COL = '__series__'
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_CODE_FINGERPRINT: str | None = None
+
+
+def _encode(value, frames: list[pa.Table]):
+    """Flatten frames/series out of a (nested) result into Arrow tables; return the JSON skeleton."""
+    if isinstance(value, pd.DataFrame):
+        frames.append(pa.Table.from_pandas(value, preserve_index=True))
+        return {'frame': len(frames) - 1}
+    if isinstance(value, pd.Series):
+        frames.append(pa.Table.from_pandas(value.to_frame(_SERIES_COL), preserve_index=True))
+        return {'series': len(frames) - 1, 'name': value.name}
+    if isinstance(value, tuple):
+        return {'tuple': [_encode(item, frames) for item in value]}
+    if isinstance(value, list):
+        return {'list': [_encode(item, frames) for item in value]}
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError('result cache only stores dicts with str keys')
+        return {'dict': [[key, _encode(item, frames)] for key, item in value.items()]}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return {'value': value}
+    raise TypeError(f'result cache cannot store {type(value).__name__}')
+
+
+def _decode(node: dict, frames: list[pa.Table]):
+    if 'frame' in node:
+        return frames[node['frame']].to_pandas()
+    if 'series' in node:
+        return frames[node['series']].to_pandas()[_SERIES_COL].rename(node['name'])
+    if 'tuple' in node:
+        return tuple(_decode(item, frames) for item in node['tuple'])
+    if 'list' in node:
+        return [_decode(item, frames) for item in node['list']]
+    if 'dict' in node:
+        return {key: _decode(item, frames) for key, item in node['dict']}
+    return node['value']
+
+
+def _table_to_ipc(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dump_result(value) -> tuple[dict, list[bytes]]:
+    """Serialize a result tree into a JSON skeleton and one Arrow IPC file buffer per frame."""
+    frames = []
+    node = _encode(value, frames)
+    return node, [_table_to_ipc(table) for table in frames]
+
+
+def load_result(payload: tuple[dict, list[bytes]]):
+    node, buffers = payload
+    return _decode(node, [pa.ipc.open_file(pa.py_buffer(buffer)).read_all() for buffer in buffers])
+
+
+def config_fingerprint(*blocks) -> str:
+    """Digest of the config blocks (dicts, param models) a result depends on, via their repr."""
+    return hashlib.sha256(repr(blocks).encode('utf-8')).hexdigest()[:16]
+
+
+def _code_files() -> list[Path]:
+    files = []
+    for relative_path in RESULT_CACHE_CODE_PATHS:
+        path = _PROJECT_ROOT / relative_path
+        candidates = sorted(path.rglob('*')) if path.is_dir() else [path]
+        files.extend(file for file in candidates if file.is_file() and file.suffix in RESULT_CACHE_CODE_SUFFIXES)
+    return files
+
+
+def code_fingerprint() -> str:
+    """Digest of `RESULT_CACHE_VERSION`, pandas/pyarrow versions and the sources in `RESULT_CACHE_CODE_PATHS`."""
+    global _CODE_FINGERPRINT
+    if _CODE_FINGERPRINT is None:
+        digest = hashlib.sha256(f'{RESULT_CACHE_VERSION}:{pd.__version__}:{pa.__version__}'.encode('utf-8'))
+        for path in _code_files():
+            digest.update(path.relative_to(_PROJECT_ROOT).as_posix().encode('utf-8'))
+            digest.update(path.read_bytes())
+        _CODE_FINGERPRINT = digest.hexdigest()[:16]
+    return _CODE_FINGERPRINT
+
+
+def result_key(name: str, key_parts) -> str:
+    payload = json.dumps([code_fingerprint(), name, key_parts], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class ResultCache:
+    """Arrow-file result store shared by every process pointed at the same `root`.
+
+    Entries are `<root>/<name>/<key>/` directories holding one `.arrow` file per frame and a
+    manifest, whose mtime records the entry's last use. A leader computes under an `O_EXCL`
+    lock file while other processes poll for the entry; threads within one process are
+    coalesced with `SingleFlight` before touching disk.
+    """
+
+    def __init__(self, root, max_bytes: int | None = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._loads = SingleFlight()
+
+    def entry_path(self, name: str, key: str) -> Path:
+        return self.root / name / key
+
+    def get(self, name: str, key: str):
+        """Return the stored result, or raise KeyError when the entry does not exist."""
+        entry = self.entry_path(name, key)
+        try:
+            manifest_path = entry / RESULT_CACHE_MANIFEST
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            frames = []
+            for i in range(manifest['frames']):
+                with pa.OSFile(str(entry / f'{i}.arrow'), 'rb') as source:
+                    frames.append(pa.ipc.open_file(source).read_all())
+            os.utime(manifest_path)
+        except FileNotFoundError:
+            # Missing, or evicted while being read.
+            raise KeyError(key) from None
+        return _decode(manifest['value'], frames)
+
+    def put(self, name: str, key: str, value) -> None:
+        node, buffers = dump_result(value)
+        manifest = {'value': node, 'frames': len(buffers)}
+
+        entry = self.entry_path(name, key)
+        tmp_entry = entry.with_name(f'{key}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}')
+        tmp_entry.mkdir(parents=True)
+        try:
+            for i, buffer in enumerate(buffers):
+                (tmp_entry / f'{i}.arrow').write_bytes(buffer)
+            (tmp_entry / RESULT_CACHE_MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_entry, entry)
+        except OSError:
+            # Another worker published the same entry first (or the disk is unavailable); keep theirs.
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def entries(self) -> list[tuple[Path, int, float]]:
+        """(entry directory, bytes, last use timestamp) of every published entry."""
+        entries = []
+        for manifest_path in self.root.glob(f'*/*/{RESULT_CACHE_MANIFEST}'):
+            entry = manifest_path.parent
+            if '.' in entry.name:
+                # `<key>.tmp-*` / `<key>.evict-*` directories are not published entries.
+                continue
+            try:
+                last_used = manifest_path.stat().st_mtime
+                size = sum(path.stat().st_size for path in entry.iterdir())
+            except FileNotFoundError:
+                continue
+            entries.append((entry, size, last_used))
+        return entries
+
+    def evict(self, max_bytes: int) -> int:
+        """Drop least recently used entries until the cache fits in `max_bytes`; return the bytes freed."""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        excess = sum(size for _, size, _ in entries) - max_bytes
+        freed = 0
+        for entry, size, _ in entries:
+            if freed >= excess:
+                break
+            evicted = entry.with_name(f'{entry.name}.evict-{uuid.uuid4().hex[:8]}')
+            try:
+                # Renamed first so no reader opens a half-deleted entry; on Windows this fails while
+                # another process has the entry's files open, and the entry is kept.
+                os.replace(entry, evicted)
+            except OSError:
+                continue
+            shutil.rmtree(evicted, ignore_errors=True)
+            freed += size
+        return freed
+
+    def get_or_compute(self, name: str, key_parts, func, *args, **kwargs):
+        key = result_key(name, key_parts)
+        return self._loads.do((name, key), self._get_or_compute, name, key, func, *args, **kwargs)
+
+    def _get_or_compute(self, name: str, key: str, func, *args, **kwargs):
+        lock_path = self.root / name / f'{key}.lock'
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                with timed_span(f'result_cache_hit:{name}'):
+                    return self.get(name, key)
+            except KeyError:
+                pass
+
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                self._wait_for_leader(lock_path)
+                continue
+
+            try:
+                os.write(fd, str(os.getpid()).encode('ascii'))
+                os.close(fd)
+                value = func(*args, **kwargs)
+                try:
+                    self.put(name, key, value)
+                except OSError as e:
+                    print(f'Warning: result cache write failed for {name}: {e}')
+                return value
+            finally:
+                lock_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _wait_for_leader(lock_path: Path) -> None:
+        """Block while another process holds the lock; break it if its holder died mid-compute."""
+        while True:
+            try:
+                age = time.time() - lock_path.stat().st_mtime
+            except FileNotFoundError:
+                return
+            if age > RESULT_CACHE_LOCK_STALE_SECONDS:
+                lock_path.unlink(missing_ok=True)
+                return
+            time.sleep(RESULT_CACHE_POLL_SECONDS)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+_RESULT_CACHES: dict[str, ResultCache] = {}
+
+
+def get_result_cache() -> ResultCache | None:
+    """Return the host-wide cache configured by `ST_IDX_RESULT_CACHE_DIR`, or None when unset."""
+    root = os.environ.get(RESULT_CACHE_DIR_ENV)
+    if not root:
+        return None
+    if root not in _RESULT_CACHES:
+        max_bytes = int(os.environ.get(RESULT_CACHE_MAX_BYTES_ENV) or RESULT_CACHE_DEFAULT_MAX_BYTES)
+        _RESULT_CACHES[root] = ResultCache(root, max_bytes=max_bytes)
+    return _RESULT_CACHES[root]
+
+
+def cached_result(name: str, key_parts, func, *args, **kwargs):
+    """Call `func` through the shared result cache when one is configured.
+
+    `key_parts` must identify the result without the (unhashed) frame arguments, e.g. the
+    snapshot content hashes, latest date and `config_fingerprint` of the config it reads;
+    None skips the cache.
+    """
+    cache = get_result_cache()
+    if cache is None or key_parts is None:
+        return func(*args, **kwargs)
+    return cache.get_or_compute(name, key_parts, func, *args, **kwargs)
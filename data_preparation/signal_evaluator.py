@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+SIGNAL_STATS_COLS = ['signal', 'horizon', 'n_signals', 'hit_rate', 'mean_return']
+
+
+def calculate_forward_pair_returns(pair_price_df: pd.DataFrame, horizon_sizes: dict[str, int]) -> pd.DataFrame:
+    """Forward long-minus-short simple returns for a two-column (long, short) price frame.
+
+    The value on date t is the return earned from the close of t to the close
+    `horizon` rows later; trailing rows without a full horizon are NaN.
+
+    Returns:
+        Frame on the price dates with one column per horizon name.
+    """
+    long_col, short_col = pair_price_df.columns[:2]
+    fwd_returns = {}
+    for horizon_name, horizon_size in horizon_sizes.items():
+        fwd_pct = pair_price_df.shift(-horizon_size) / pair_price_df - 1
+        fwd_returns[horizon_name] = fwd_pct[long_col] - fwd_pct[short_col]
+    return pd.DataFrame(fwd_returns, index=pair_price_df.index)
+
+
+def summarize_position_returns(positions: np.ndarray, fwd_returns: np.ndarray) -> dict[str, np.ndarray]:
+    """Hit rate and mean forward return for many position series against several horizons at once.
+
+    Args:
+        positions: (n_dates, n_series) array of +1 / -1 / 0 pair positions.
+        fwd_returns: (n_dates, n_horizons) forward pair returns.
+
+    Returns:
+        dict of (n_series, n_horizons) arrays: n_signals, hit_rate, mean_return.
+    """
+    pnl = positions[:, :, None] * fwd_returns[:, None, :]
+    active = (positions[:, :, None] != 0) & ~np.isnan(fwd_returns)[:, None, :]
+    pnl = np.where(active, pnl, 0.0)
+
+    n_signals = active.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hit_rate = (pnl > 0).sum(axis=0) / n_signals
+        mean_return = pnl.sum(axis=0) / n_signals
+    return {'n_signals': n_signals, 'hit_rate': hit_rate, 'mean_return': mean_return}
+
+
+def calculate_signal_positions(signal_wide_df: pd.DataFrame, signal_pairs: dict[str, tuple[str, str]]) -> pd.DataFrame:
+    """Map `交易信号` labels to pair positions: +1 for pair[0], -1 for pair[1], 0 for any other label.
+
+    Dates without a signal value stay NaN so they can be forward-filled later.
+    """
+    position_df = pd.DataFrame(index=signal_wide_df.index)
+    for signal_name, (long_leg, short_leg) in signal_pairs.items():
+        signal = signal_wide_df[signal_name]
+        position = np.select([signal == long_leg, signal == short_leg], [1.0, -1.0], default=0.0)
+        position_df[signal_name] = np.where(signal.isna(), np.nan, position)
+    return position_df
+
+
+def evaluate_signals(
+    signal_wide_df: pd.DataFrame,
+    signal_pairs: dict[str, tuple[str, str]],
+    leg_price_df: pd.DataFrame,
+    horizon_sizes: dict[str, int],
+    trading_days: int,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Evaluate categorical style signals as long/short positions on their index pairs.
+
+    Signals are taken as known at the close of their own date and carried forward
+    onto the trading calendar of `leg_price_df` until the next observation, so
+    lower-frequency (e.g. monthly) signals hold between updates.
+
+    Args:
+        signal_wide_df: dates x signal names of signal labels (e.g. 成长/价值/中性).
+        signal_pairs: signal name -> (long leg, short leg) columns of `leg_price_df`.
+        leg_price_df: trading dates x leg names of index closes.
+        horizon_sizes: horizon name -> number of trading days.
+        trading_days: trading days per year used to annualize turnover.
+
+    Returns:
+        stats_df: one row per (signal, horizon) with n_signals, hit_rate, mean_return.
+        summary_df: per-signal active_ratio, annualized turnover and cumulative P&L.
+        cum_pnl_df: trading dates x signals cumulative (additive) long/short P&L.
+    """
+    leg_price_df = leg_price_df.sort_index()
+    trade_dt = leg_price_df.index
+
+    position_df = calculate_signal_positions(signal_wide_df.sort_index(), signal_pairs)
+    position_df = position_df.reindex(position_df.index.union(trade_dt)).ffill().reindex(trade_dt)
+    leg_ret_df = leg_price_df.pct_change(fill_method=None)
+
+    stats_frames = []
+    cum_pnl_frames = []
+    signals_by_pair: dict[tuple[str, str], list[str]] = {}
+    for signal_name, pair in signal_pairs.items():
+        signals_by_pair.setdefault(tuple(pair), []).append(signal_name)
+
+    # Signals sharing a pair are scored together against the same forward returns.
+    for (long_leg, short_leg), signal_names in signals_by_pair.items():
+        pair_position_df = position_df[signal_names]
+        fwd_return_df = calculate_forward_pair_returns(leg_price_df[[long_leg, short_leg]], horizon_sizes)
+        stats = summarize_position_returns(pair_position_df.fillna(0.0).to_numpy(), fwd_return_df.to_numpy())
+        for signal_idx, signal_name in enumerate(signal_names):
+            stats_frames.append(
+                pd.DataFrame(
+                    {
+                        'signal': signal_name,
+                        'horizon': list(horizon_sizes),
+                        'n_signals': stats['n_signals'][signal_idx],
+                        'hit_rate': stats['hit_rate'][signal_idx],
+                        'mean_return': stats['mean_return'][signal_idx],
+                    }
+                )
+            )
+
+        held_position_df = pair_position_df.shift(1)
+        pair_ret = leg_ret_df[long_leg] - leg_ret_df[short_leg]
+        daily_pnl_df = held_position_df.mul(pair_ret, axis=0)
+        cum_pnl_frames.append(daily_pnl_df.fillna(0.0).cumsum().where(held_position_df.notna()))
+
+    cum_pnl_df = pd.concat(cum_pnl_frames, axis=1)[list(signal_pairs)]
+    has_signal = position_df.notna()
+    summary_df = pd.DataFrame(
+        {
+            'active_ratio': (position_df.ne(0) & has_signal).sum() / has_signal.sum(),
+            'turnover': position_df.diff().abs().mean() * trading_days,
+            'cum_pnl': cum_pnl_df.ffill().iloc[-1] if len(cum_pnl_df) else np.nan,
+        }
+    ).reindex(list(signal_pairs))
+    summary_df.index.name = 'signal'
+
+    stats_df = pd.concat(stats_frames, ignore_index=True) if stats_frames else pd.DataFrame(columns=SIGNAL_STATS_COLS)
+    return stats_df, summary_df, cum_pnl_df
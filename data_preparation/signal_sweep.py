@@ -0,0 +1,176 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from config import style_config
+from data_preparation.data_processor import calculate_rolling_quantile_bands
+from data_preparation.signal_evaluator import calculate_forward_pair_returns, summarize_position_returns
+from utils import TradeDtType, get_avg_dt_count_via_dt_type
+
+SWEEP_TARGET_COL = 'target'
+SWEEP_UPPER_GATE_COL = 'upper_gate'
+SWEEP_LOWER_GATE_COL = 'lower_gate'
+SWEEP_FWD_RETURN_PREFIX = 'fwd_'
+
+SWEEP_RESULT_COLS = [
+    'signal',
+    'window_name',
+    'window_size',
+    'quantile_ceiling',
+    'quantile_floor',
+    'horizon',
+    'n_signals',
+    'hit_rate',
+    'mean_return',
+]
+
+
+def build_sweep_input(
+    target: pd.Series,
+    pair_price_df: pd.DataFrame,
+    horizon_sizes: dict[str, int],
+    upper_gate: pd.Series | None = None,
+    lower_gate: pd.Series | None = None,
+) -> pd.DataFrame:
+    """Align an indicator series, its optional trend gates and pair forward returns on the indicator dates."""
+    sweep_input_df = pd.DataFrame({SWEEP_TARGET_COL: target}).sort_index()
+    for col, gate in ((SWEEP_UPPER_GATE_COL, upper_gate), (SWEEP_LOWER_GATE_COL, lower_gate)):
+        sweep_input_df[col] = True if gate is None else gate.reindex(sweep_input_df.index).fillna(False).astype(bool)
+
+    fwd_return_df = calculate_forward_pair_returns(pair_price_df.sort_index(), horizon_sizes)
+    fwd_return_df = fwd_return_df.add_prefix(SWEEP_FWD_RETURN_PREFIX)
+    return sweep_input_df.join(fwd_return_df, how='left')
+
+
+def _sweep_window(task: dict) -> pd.DataFrame:
+    """Evaluate every grid point that shares one rolling window (runs in a worker process)."""
+    target = task['target']
+    upper_position = task['upper_position']
+
+    if task['kind'] == 'quantile_band':
+        ceilings, floors = task['ceilings'], task['floors']
+        bands = calculate_rolling_quantile_bands(target, task['window_size'], list(ceilings) + list(floors))
+        with np.errstate(invalid='ignore'):
+            upper_hit = (target[:, None] >= bands[:, : len(ceilings)]) & task['upper_gate'][:, None]
+            lower_hit = (target[:, None] <= bands[:, len(ceilings) :]) & task['lower_gate'][:, None]
+        # np.select semantics: the upper band condition wins when both hold.
+        positions = np.where(
+            upper_hit[:, :, None],
+            upper_position,
+            np.where(lower_hit[:, None, :], -upper_position, 0),
+        ).reshape(len(target), -1)
+        param_grid = list(product(ceilings, floors))
+    else:
+        rolling_mean = pd.Series(target).rolling(window=task['window_size']).mean().to_numpy()
+        positions = np.where(
+            np.isnan(rolling_mean), 0, np.where(target >= rolling_mean, upper_position, -upper_position)
+        )[:, None]
+        param_grid = [(np.nan, np.nan)]
+
+    stats = summarize_position_returns(positions.astype('float64'), task['fwd_returns'])
+
+    rows = []
+    for param_idx, (ceiling, floor) in enumerate(param_grid):
+        for horizon_idx, horizon_name in enumerate(task['horizon_names']):
+            rows.append(
+                (
+                    task['signal'],
+                    task['window_name'],
+                    task['window_size'],
+                    ceiling,
+                    floor,
+                    horizon_name,
+                    stats['n_signals'][param_idx, horizon_idx],
+                    stats['hit_rate'][param_idx, horizon_idx],
+                    stats['mean_return'][param_idx, horizon_idx],
+                )
+            )
+    return pd.DataFrame(rows, columns=SWEEP_RESULT_COLS)
+
+
+def build_sweep_tasks(sweep_inputs: dict[str, pd.DataFrame], sweep_config: dict) -> list[dict]:
+    """Split the sweep into one task per (signal, rolling window) so band statistics are computed once per window."""
+    tasks = []
+    for signal_name, sweep_input_df in sweep_inputs.items():
+        signal_cfg = sweep_config[signal_name]
+        fwd_cols = [col for col in sweep_input_df.columns if col.startswith(SWEEP_FWD_RETURN_PREFIX)]
+        upper_position = 1 if signal_cfg['UPPER_SIGNAL'] == signal_cfg['PAIR'][0] else -1
+        shared = {
+            'signal': signal_name,
+            'kind': signal_cfg['KIND'],
+            'target': sweep_input_df[SWEEP_TARGET_COL].to_numpy(dtype='float64'),
+            'upper_gate': sweep_input_df[SWEEP_UPPER_GATE_COL].to_numpy(dtype=bool),
+            'lower_gate': sweep_input_df[SWEEP_LOWER_GATE_COL].to_numpy(dtype=bool),
+            'upper_position': upper_position,
+            'fwd_returns': sweep_input_df[fwd_cols].to_numpy(dtype='float64'),
+            'horizon_names': [col[len(SWEEP_FWD_RETURN_PREFIX) :] for col in fwd_cols],
+            'ceilings': signal_cfg.get('QUANTILE_CEILINGS', ()),
+            'floors': signal_cfg.get('QUANTILE_FLOORS', ()),
+        }
+        for window_name in signal_cfg['WINDOW_NAMES']:
+            tasks.append(
+                {
+                    **shared,
+                    'window_name': window_name,
+                    'window_size': get_avg_dt_count_via_dt_type(dt_type=signal_cfg['DT_TYPE'], period=window_name),
+                }
+            )
+    return tasks
+
+
+def run_signal_sweep(
+    sweep_inputs: dict[str, pd.DataFrame],
+    sweep_config: dict | None = None,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """Evaluate every parameter combination in `sweep_config` for the given signals.
+
+    Args:
+        sweep_inputs: signal name -> frame from `build_sweep_input`.
+        sweep_config: grids keyed by signal name; defaults to `style_config.SIGNAL_SWEEP_CONFIG`.
+        max_workers: process pool size; 1 runs in-process.
+
+    Returns:
+        Long frame with one row per (signal, window, ceiling, floor, horizon).
+    """
+    if sweep_config is None:
+        sweep_config = style_config.SIGNAL_SWEEP_CONFIG
+
+    tasks = build_sweep_tasks(sweep_inputs, sweep_config)
+    if max_workers == 1:
+        results = [_sweep_window(task) for task in tasks]
+    else:
+        # Spawned workers avoid inheriting the caller's threads (e.g. a Streamlit server) via fork.
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(_sweep_window, tasks))
+
+    if not results:
+        return pd.DataFrame(columns=SWEEP_RESULT_COLS)
+    return pd.concat(results, ignore_index=True)
+
+
+def get_sweep_horizon_sizes(horizon_names: tuple[str, ...] | None = None) -> dict[str, int]:
+    if horizon_names is None:
+        horizon_names = style_config.SIGNAL_SWEEP_HORIZONS
+    return {name: get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period=name) for name in horizon_names}
+
+
+def write_sweep_results(result_df: pd.DataFrame, path: str) -> None:
+    """Write sweep results to a Parquet file with categorical label columns."""
+    result_df = result_df.astype(
+        {
+            'signal': 'category',
+            'window_name': 'category',
+            'horizon': 'category',
+            'window_size': 'int32',
+            'quantile_ceiling': 'float32',
+            'quantile_floor': 'float32',
+            'n_signals': 'int32',
+            'hit_rate': 'float32',
+            'mean_return': 'float32',
+        }
+    )
+    result_df.to_parquet(path, index=False)
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from config import config
+
+# NOTE 快照版本
+# Published snapshots live in immutable `<CSV_DATA_DIR>/versions/<id>/` directories with a
+# manifest of content hashes, and the `CURRENT` file names the one readers use. Publishing
+# copies and hashes the CSVs first and replaces the pointer last (`os.replace`, atomic on
+# POSIX and Windows), so a reader resolves either the old or the new complete version and
+# never a half-written file. Without a pointer, readers use the flat CSVs in `CSV_DATA_DIR`.
+SNAPSHOT_ID_ENV = 'ST_IDX_SNAPSHOT_ID'
+SNAPSHOT_POINTER = 'CURRENT'
+SNAPSHOT_VERSIONS_DIR = 'versions'
+SNAPSHOT_MANIFEST = 'manifest.json'
+SNAPSHOT_KEEP_VERSIONS = 3
+
+_SNAPSHOT_MANIFESTS: dict[str, dict] = {}
+# Set by `pinned_snapshot` for one script run (each Streamlit session reruns in its own thread).
+_PINNED_SNAPSHOT_ID: ContextVar[str | None] = ContextVar('pinned_snapshot_id', default=None)
+
+
+def file_content_hash(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()[:16]
+
+
+def _read_pointer(root: str) -> str:
+    try:
+        with open(os.path.join(root, SNAPSHOT_POINTER), encoding='utf-8') as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        return ''
+
+
+def read_current_snapshot_id(root: str | None = None) -> str:
+    """Id of the snapshot readers use.
+
+    In order: the id pinned by an enclosing `pinned_snapshot`, `ST_IDX_SNAPSHOT_ID` when set
+    (pins a process), else `CURRENT`. Returns an empty string for the flat layout (no published versions).
+    """
+    pinned = _PINNED_SNAPSHOT_ID.get()
+    if pinned is not None:
+        return pinned
+    return os.environ.get(SNAPSHOT_ID_ENV) or _read_pointer(root or config.CSV_DATA_DIR)
+
+
+@contextmanager
+def pinned_snapshot(snapshot_id: str | None = None):
+    """Resolve the snapshot id once and have every read inside the block use it.
+
+    Wrap a whole script run (or API request) so that a switch of `CURRENT` in the middle of it
+    cannot mix two versions across its fetches; the next run picks up the new version.
+    Nested blocks keep the outer pin unless given an explicit id.
+    """
+    if snapshot_id is None:
+        snapshot_id = read_current_snapshot_id()
+    token = _PINNED_SNAPSHOT_ID.set(snapshot_id)
+    try:
+        yield snapshot_id
+    finally:
+        _PINNED_SNAPSHOT_ID.reset(token)
+
+
+def get_snapshot_dir(snapshot_id: str, root: str | None = None) -> str:
+    root = root or config.CSV_DATA_DIR
+    return os.path.join(root, SNAPSHOT_VERSIONS_DIR, snapshot_id) if snapshot_id else root
+
+
+def load_snapshot_manifest(snapshot_id: str, root: str | None = None) -> dict:
+    """Manifest (`id`, `created_at`, `files`: CSV name -> content hash) of a published version."""
+    manifest_path = os.path.join(get_snapshot_dir(snapshot_id, root), SNAPSHOT_MANIFEST)
+    # Versions are immutable once published, so their manifests are read once.
+    if manifest_path not in _SNAPSHOT_MANIFESTS:
+        with open(manifest_path, encoding='utf-8') as file:
+            _SNAPSHOT_MANIFESTS[manifest_path] = json.load(file)
+    return _SNAPSHOT_MANIFESTS[manifest_path]
+
+
+def scan_snapshot_files(source_dir: str) -> dict[str, tuple[int, int]]:
+    """CSV name -> (mtime, size) of the mapped snapshot files present in `source_dir`."""
+    state = {}
+    for file_name in sorted(set(config.CSV_FILE_MAPPING.values())):
+        try:
+            stat = os.stat(os.path.join(source_dir, file_name))
+        except OSError:
+            continue
+        state[file_name] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def stage_snapshot(source_dir: str, root: str | None = None) -> str:
+    """Copy the snapshot CSVs of `source_dir` into a new version directory and return its id.
+
+    The version is complete and hashed but not yet current; see `switch_snapshot`.
+
+    Raises:
+        ValueError: a source file changed while it was being copied.
+    """
+    root = root or config.CSV_DATA_DIR
+    versions_dir = os.path.join(root, SNAPSHOT_VERSIONS_DIR)
+    staging_dir = os.path.join(versions_dir, f'.staging-{uuid.uuid4().hex[:8]}')
+    os.makedirs(staging_dir)
+    try:
+        before = scan_snapshot_files(source_dir)
+        files = {}
+        for file_name in before:
+            staged_path = os.path.join(staging_dir, file_name)
+            shutil.copyfile(os.path.join(source_dir, file_name), staged_path)
+            files[file_name] = file_content_hash(staged_path)
+        if scan_snapshot_files(source_dir) != before:
+            raise ValueError(f'Snapshot files in {source_dir} changed while being copied')
+
+        digest = hashlib.sha256(json.dumps(files, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+        snapshot_id = f'{datetime.now():%Y%m%dT%H%M%S%f}-{digest}'
+        manifest = {'id': snapshot_id, 'created_at': datetime.now().isoformat(timespec='seconds'), 'files': files}
+        with open(os.path.join(staging_dir, SNAPSHOT_MANIFEST), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        os.replace(staging_dir, os.path.join(versions_dir, snapshot_id))
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    return snapshot_id
+
+
+def switch_snapshot(snapshot_id: str, root: str | None = None) -> None:
+    """Point readers at `snapshot_id` by atomically replacing the `CURRENT` file."""
+    root = root or config.CSV_DATA_DIR
+    tmp_pointer = os.path.join(root, f'{SNAPSHOT_POINTER}.tmp-{uuid.uuid4().hex[:8]}')
+    with open(tmp_pointer, 'w', encoding='utf-8') as file:
+        file.write(snapshot_id)
+    os.replace(tmp_pointer, os.path.join(root, SNAPSHOT_POINTER))
+
+
+def prune_snapshots(root: str | None = None, keep: int = SNAPSHOT_KEEP_VERSIONS) -> list[str]:
+    """Remove all but the newest `keep` versions (and the current one); return the removed ids.
+
+    Kept versions serve readers that resolved the pointer just before a switch. Removal that
+    fails (e.g. a file still open on Windows) is retried on the next prune.
+    """
+    root = root or config.CSV_DATA_DIR
+    versions_dir = os.path.join(root, SNAPSHOT_VERSIONS_DIR)
+    try:
+        snapshot_ids = sorted(name for name in os.listdir(versions_dir) if not name.startswith('.'))
+    except FileNotFoundError:
+        return []
+    current = _read_pointer(root)
+    removed = [snapshot_id for snapshot_id in snapshot_ids[:-keep] if snapshot_id != current]
+    for snapshot_id in removed:
+        shutil.rmtree(os.path.join(versions_dir, snapshot_id), ignore_errors=True)
+    return removed
+
+
+def publish_snapshot(
+    source_dir: str,
+    root: str | None = None,
+    warm: Callable[[str], None] | None = None,
+    keep: int = SNAPSHOT_KEEP_VERSIONS,
+) -> str:
+    """Stage `source_dir` as a new version, warm it, make it current and prune old versions.
+
+    Args:
+        warm: called with the staged id before the switch, e.g. to fill the shared result
+            cache with that version pinned, so the first rerun after the switch is warm.
+
+    Returns:
+        the current snapshot id; unchanged when the content equals the current version.
+    """
+    root = root or config.CSV_DATA_DIR
+    snapshot_id = stage_snapshot(source_dir, root)
+    current = _read_pointer(root)
+    if current:
+        try:
+            unchanged = load_snapshot_manifest(current, root)['files'] == load_snapshot_manifest(snapshot_id, root)['files']
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            shutil.rmtree(get_snapshot_dir(snapshot_id, root), ignore_errors=True)
+            return current
+    if warm is not None:
+        try:
+            warm(snapshot_id)
+        except BaseException:
+            shutil.rmtree(get_snapshot_dir(snapshot_id, root), ignore_errors=True)
+            raise
+    switch_snapshot(snapshot_id, root)
+    prune_snapshots(root, keep)
+    return snapshot_id
+
+
+class SnapshotWatcher:
+    """Publish `source_dir` whenever its CSVs change and then stay unchanged for `settle_seconds`.
+
+    Polls file mtimes and sizes (no platform file-event API), so an updater may rewrite the
+    CSVs in place, in any order, without readers seeing partial files.
+    """
+
+    def __init__(
+        self,
+        source_dir: str,
+        root: str | None = None,
+        settle_seconds: float = 5.0,
+        warm: Callable[[str], None] | None = None,
+        keep: int = SNAPSHOT_KEEP_VERSIONS,
+    ):
+        self.source_dir = source_dir
+        self.root = root
+        self.settle_seconds = settle_seconds
+        self.warm = warm
+        self.keep = keep
+        self._last_state = None
+        self._changed_at = 0.0
+        self._published_state = None
+
+    def poll(self) -> str | None:
+        """Check once; return the id made current by this poll, if any."""
+        state = scan_snapshot_files(self.source_dir)
+        now = time.monotonic()
+        if state != self._last_state:
+            self._last_state = state
+            self._changed_at = now
+            return None
+        if not state or state == self._published_state or now - self._changed_at < self.settle_seconds:
+            return None
+        try:
+            snapshot_id = publish_snapshot(self.source_dir, self.root, warm=self.warm, keep=self.keep)
+        except (OSError, ValueError) as e:
+            print(f'Warning: snapshot publish failed, retrying after the files settle again: {e}')
+            self._changed_at = now
+            return None
+        self._published_state = state
+        return snapshot_id
+
+    def run(self, poll_seconds: float = 1.0, on_publish: Callable[[str], None] | None = None) -> None:
+        current = _read_pointer(self.root or config.CSV_DATA_DIR)
+        while True:
+            snapshot_id = self.poll()
+            if snapshot_id is not None and snapshot_id != current:
+                current = snapshot_id
+                if on_publish is not None:
+                    on_publish(snapshot_id)
+            time.sleep(poll_seconds)
@@ -0,0 +1,355 @@
+import itertools
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from config import param_cls, style_config
+from data_preparation.data_fetcher import DATASET_SCHEMAS, get_snapshot_version, read_csv_data
+from span_timing import timed_span
+from utils import get_cwd_file_path, read_sql_from_template, to_date_keys
+
+# NOTE 本地SQL引擎
+# Optional offline backend: the CSV snapshots are loaded into SQLite tables named and
+# shaped like the Wind tables the `sql_template` queries were written against, so the
+# templates run unchanged with bound parameters. The Streamlit app keeps using
+# `CSVDataSource`; this is for scripts and for checking the templates against the
+# hand-coded pandas filters.
+SQL_ENGINE_POOL_SIZE = 4
+SQL_ENGINE_SCHEMA = 'wind'
+
+EDB_FREQ_CODES = {'日': '1', '周': '2', '月': '3', '季': '4', '半年': '5', '年': '6'}
+
+# Snapshot table -> Wind tables it populates. `columns` maps Wind column -> CSV column,
+# `constants` fills Wind columns the snapshot was filtered on, and `value_maps` undoes
+# the CASE labels a template applies. Rows whose `key` is already present are skipped,
+# so description tables can be filled from several snapshots.
+SQL_TABLE_SPECS = {
+    'A_IDX_PRICE': {
+        'AIndexEODPrices': {
+            'columns': {'TRADE_DT': '交易日期', 'S_INFO_WINDCODE': '证券代码', 'S_DQ_CLOSE': '收盘价'},
+            'index': ('S_INFO_WINDCODE', 'TRADE_DT'),
+        },
+        'AIndexDescription': {
+            'columns': {'S_INFO_WINDCODE': '证券代码', 'S_INFO_NAME': '证券简称'},
+            'key': ('S_INFO_WINDCODE',),
+        },
+    },
+    'A_IDX_VAL': {
+        'AIndexValuation': {
+            'columns': {
+                'TRADE_DT': '交易日期',
+                'S_INFO_WINDCODE': '证券代码',
+                'TURNOVER': '日换手率',
+                'PE_TTM': '市盈率',
+            },
+            'index': ('S_INFO_WINDCODE', 'TRADE_DT'),
+        },
+        'AIndexDescription': {
+            'columns': {'S_INFO_WINDCODE': '证券代码', 'S_INFO_NAME': '证券简称'},
+            'key': ('S_INFO_WINDCODE',),
+        },
+    },
+    'CN_BOND_YIELD': {
+        'CBondCurveCNBD': {
+            'columns': {
+                'TRADE_DT': '交易日期',
+                'B_ANAL_CURVENAME': '曲线名称',
+                'B_ANAL_CURVETERM': '交易期限',
+                'B_ANAL_YIELD': '到期收益率',
+            },
+            'constants': {'B_ANAL_CURVETYPE': 2},
+            'index': ('B_ANAL_CURVENAME', 'B_ANAL_CURVETERM', 'TRADE_DT'),
+        },
+    },
+    'EDB': {
+        'GFZQEDB': {
+            'columns': {
+                'TDATE': '交易日期',
+                'F2_4112': '指标代码',
+                'F3_4112': '指标名称',
+                'F4_4112': '指标单位',
+                'F5_4112': '指标频率',
+                'INDICATOR_NUM': '指标数值',
+            },
+            'value_maps': {'F5_4112': EDB_FREQ_CODES},
+            'index': ('F2_4112', 'TDATE'),
+        },
+    },
+    'SHIBOR_PRICES': {
+        'ShiborPrices': {
+            'columns': {
+                'TRADE_DT': '交易日期',
+                'S_INFO_WINDCODE': '证券代码',
+                'B_INFO_RATE': '利率',
+                'B_INFO_TERM': '期限',
+            },
+            'index': ('S_INFO_WINDCODE', 'TRADE_DT'),
+        },
+    },
+}
+
+_IN_PLACEHOLDER = re.compile(r'\{\}')
+
+
+def expand_in_placeholders(sql: str, in_params: tuple[tuple, ...]) -> tuple[str, dict]:
+    """Fill each `IN ({})` of a template with named placeholders, one per value.
+
+    Returns:
+        the SQL text and the bind values for the placeholders it now contains.
+    """
+    n_slots = len(_IN_PLACEHOLDER.findall(sql))
+    if n_slots != len(in_params):
+        raise ValueError(f'Template has {n_slots} IN lists, got {len(in_params)} value tuples')
+
+    bind_values = {}
+    slot_sql = []
+    for slot, values in enumerate(in_params):
+        if not values:
+            raise ValueError(f'IN list {slot} is empty')
+        names = [f'in{slot}_{i}' for i in range(len(values))]
+        bind_values.update(zip(names, values))
+        slot_sql.append(', '.join(f':{name}' for name in names))
+    slot_iter = iter(slot_sql)
+    return _IN_PLACEHOLDER.sub(lambda _: next(slot_iter), sql), bind_values
+
+
+def _physical_date_col(table_name: str) -> str:
+    schema = DATASET_SCHEMAS[table_name]
+    physical_to_raw = schema.get('physical_to_raw') or {}
+    return {raw: physical for physical, raw in physical_to_raw.items()}.get(schema['date_col'], schema['date_col'])
+
+
+def _snapshot_rows(df: pd.DataFrame, spec: dict, date_col: str) -> tuple[list[str], list[tuple]]:
+    # Wind tables hold dates as yyyymmdd text, which the templates compare with text parameters.
+    columns = {
+        wind_col: (df[csv_col].astype(str) if csv_col == date_col else df[csv_col]).astype(object)
+        for wind_col, csv_col in spec['columns'].items()
+    }
+    for wind_col, value_map in spec.get('value_maps', {}).items():
+        columns[wind_col] = columns[wind_col].map(value_map)
+    frame = pd.DataFrame(columns)
+    for wind_col, value in spec.get('constants', {}).items():
+        frame[wind_col] = value
+    frame = frame.astype(object).where(frame.notna(), None)
+    return list(frame.columns), list(frame.itertuples(index=False, name=None))
+
+
+class SnapshotSqlEngine:
+    """SQLite database of the CSV snapshots under the `wind` schema, with a small connection pool.
+
+    Each connection attaches the same shared in-memory database (or `database`, a file
+    path) as `wind`; connections are read-only once the tables are loaded.
+    """
+
+    _instance_ids = itertools.count()
+
+    def __init__(
+        self,
+        table_names: list[str] | None = None,
+        database: str | None = None,
+        pool_size: int = SQL_ENGINE_POOL_SIZE,
+    ):
+        if database is None:
+            database = f'file:st_idx_wind_{next(self._instance_ids)}?mode=memory&cache=shared'
+        self.database = database
+        self.versions = {}
+        self._pool = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._closed = False
+
+        # The loading connection stays in the pool, which keeps a shared in-memory database alive.
+        conn = self._connect()
+        try:
+            self._load_snapshots(conn, table_names or list(SQL_TABLE_SPECS))
+            conn.execute('PRAGMA query_only = ON')
+        except Exception:
+            conn.close()
+            raise
+        self._pool.put(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect('file::memory:', uri=True, check_same_thread=False)
+        conn.execute(f'ATTACH DATABASE ? AS {SQL_ENGINE_SCHEMA}', (self.database,))
+        return conn
+
+    def _load_snapshots(self, conn: sqlite3.Connection, table_names: list[str]) -> None:
+        created = set()
+        for table_name in table_names:
+            self.versions[table_name] = get_snapshot_version(table_name)
+            with timed_span(f'sql_load:{table_name}'):
+                df = read_csv_data(table_name)
+                for wind_table, spec in SQL_TABLE_SPECS[table_name].items():
+                    qualified = f'{SQL_ENGINE_SCHEMA}.{wind_table}'
+                    columns = [*spec['columns'], *spec.get('constants', {})]
+                    if wind_table not in created:
+                        key = spec.get('key')
+                        key_sql = f', PRIMARY KEY ({", ".join(key)})' if key else ''
+                        conn.execute(f'DROP TABLE IF EXISTS {qualified}')
+                        conn.execute(f'CREATE TABLE {qualified} ({", ".join(columns)}{key_sql})')
+                        if 'index' in spec:
+                            conn.execute(
+                                f'CREATE INDEX {qualified}_{"_".join(spec["index"])} '
+                                f'ON {wind_table} ({", ".join(spec["index"])})'
+                            )
+                        created.add(wind_table)
+                    if df.empty:
+                        continue
+                    columns, rows = _snapshot_rows(df, spec, _physical_date_col(table_name))
+                    verb = 'INSERT OR IGNORE' if 'key' in spec else 'INSERT'
+                    conn.executemany(
+                        f'{verb} INTO {qualified} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+                        rows,
+                    )
+            conn.commit()
+        conn.execute(f'ANALYZE {SQL_ENGINE_SCHEMA}')
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection; at most `pool_size` are open at once."""
+        if self._closed:
+            raise RuntimeError('SnapshotSqlEngine is closed')
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                conn.execute('PRAGMA query_only = ON')
+            try:
+                yield conn
+            finally:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._pool.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def query(self, sql: str, params: dict | None = None) -> pd.DataFrame:
+        with self.connection() as conn:
+            cursor = conn.execute(sql, params or {})
+            rows = cursor.fetchall()
+            columns = [col[0] for col in cursor.description]
+        return pd.DataFrame(rows, columns=columns)
+
+    def run_sql_template(
+        self,
+        sql_name: str,
+        in_params: tuple[tuple, ...] = (),
+        start_date: str = '00000000',
+        end_date: str = '99991231',
+        sql_dir: str = style_config.SQL_DIR,
+    ) -> pd.DataFrame:
+        """Run `<sql_dir>/<sql_name>` with `in_params` bound to its `IN ({})` lists in order."""
+        sql = read_sql_from_template(get_cwd_file_path(dir=sql_dir, file=sql_name))
+        sql, params = expand_in_placeholders(sql, in_params)
+        params.update({'start_date': str(start_date), 'end_date': str(end_date)})
+        with timed_span(f'sql:{sql_name}'):
+            return self.query(sql, params)
+
+
+# Engines are rebuilt when any loaded snapshot changes (same version tags as the CSV cache).
+_SQL_ENGINE: SnapshotSqlEngine | None = None
+_SQL_ENGINE_LOCK = threading.Lock()
+
+
+def get_sql_engine() -> SnapshotSqlEngine:
+    global _SQL_ENGINE
+    with _SQL_ENGINE_LOCK:
+        engine = _SQL_ENGINE
+        if engine is None or any(get_snapshot_version(name) != version for name, version in engine.versions.items()):
+            if engine is not None:
+                engine.close()
+            engine = _SQL_ENGINE = SnapshotSqlEngine()
+        return engine
+
+
+def _coerce_to_schema(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """Apply the declared CSV dtypes and parse dates into keys, so frames match what `read_csv_data` returns."""
+    schema = DATASET_SCHEMAS[table_name]
+    physical_to_raw = schema.get('physical_to_raw') or {}
+    date_col = _physical_date_col(table_name)
+    for physical_col, raw_col in physical_to_raw.items():
+        if physical_col not in df.columns and raw_col in df.columns:
+            df[physical_col] = df[raw_col]
+    for col, dtype in schema['dtypes'].items():
+        if col not in df.columns:
+            continue
+        if col == date_col:
+            df[col] = to_date_keys(df[col])
+        elif dtype is float:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif dtype is str:
+            df[col] = df[col].fillna('').astype(str).astype('category')
+    for physical_col, raw_col in physical_to_raw.items():
+        if raw_col in df.columns:
+            df[raw_col] = df[physical_col]
+    return df
+
+
+def _sort_newest_first(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    date_col = DATASET_SCHEMAS[table_name]['date_col']
+    order = np.argsort(-df[date_col].to_numpy(), kind='stable')
+    return df.take(order).reset_index(drop=True)
+
+
+class SqlDataSource:
+    """`CSVDataSource` counterpart that answers the templated tables through `SnapshotSqlEngine`.
+
+    Frames carry the same columns and dtypes, newest date first; row order within a date follows the template.
+    """
+
+    def __init__(self, engine: SnapshotSqlEngine | None = None):
+        self._engine = engine
+
+    @property
+    def engine(self) -> SnapshotSqlEngine:
+        return self._engine or get_sql_engine()
+
+    def fetch_index_data(self, latest_date: str, _config: param_cls.WindListedSecParam) -> pd.DataFrame:
+        df = self.engine.run_sql_template(
+            _config.sql_param.sql_name,
+            in_params=(tuple(_config.wind_codes), tuple(_config.wind_codes)),
+            start_date=_config.start_date,
+            end_date=latest_date,
+            sql_dir=_config.sql_param.sql_dir,
+        )
+        return _sort_newest_first(_coerce_to_schema(df, 'A_IDX_PRICE'), 'A_IDX_PRICE')
+
+    def fetch_table(self, latest_date: str, table_name: str) -> pd.DataFrame:
+        wind_portal = getattr(param_cls.WindPortal, table_name, None)
+        if wind_portal not in style_config.DATA_CONFIG:
+            raise ValueError(f'No SQL template configured for {table_name}')
+        data_config = style_config.DATA_CONFIG[wind_portal]
+
+        if table_name == 'CN_BOND_YIELD':
+            in_params = (data_config['YIELD_CURVE_NAMES'], data_config['YIELD_CURVE_TERMS'])
+        elif table_name == 'A_IDX_VAL':
+            in_params = (data_config['WIND_CODE'], data_config['WIND_CODE'])
+        elif table_name == 'EDB':
+            in_params = (data_config['WIND_CODE'],)
+        else:
+            in_params = ()
+        df = self.engine.run_sql_template(
+            data_config['SQL_NAME'],
+            in_params=in_params,
+            start_date=data_config['DATA_START_DT'],
+            end_date=latest_date,
+        )
+        if table_name == 'SHIBOR_PRICES':
+            # The Shibor template returns every term; the page only reads the configured ones.
+            df = df[df['期限'].isin(data_config['B_INFO_TERM'])].reset_index(drop=True)
+        return _sort_newest_first(_coerce_to_schema(df, table_name), table_name)
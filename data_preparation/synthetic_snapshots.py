@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import config, param_cls
+
+SYNTHETIC_DATE_COL = '交易日期'
+SYNTHETIC_WALK_VOL = {'daily': 0.01, 'monthly': 0.03, 'quarterly': 0.1}
+
+# Long-form tables are keyed by `key_cols` (the first one identifies the entity);
+# an empty tuple marks a wide table with one value column per series. Synthetic
+# entities get fresh `label_cols` (anything the pages pivot or filter on) and
+# copy the remaining key columns from a template entity.
+SYNTHETIC_TABLE_SPECS = {
+    'A_IDX_PRICE': {'frequency': 'daily', 'key_cols': ('证券代码', '证券简称'), 'label_cols': ('证券简称',)},
+    'CN_BOND_YIELD': {'frequency': 'daily', 'key_cols': ('曲线名称', '交易期限'), 'label_cols': ()},
+    'A_IDX_VAL': {'frequency': 'daily', 'key_cols': ('证券代码', '证券简称'), 'label_cols': ('证券简称',)},
+    'EDB': {
+        'frequency': 'monthly',
+        'key_cols': ('指标代码', '指标名称', '指标单位', '指标频率'),
+        'label_cols': ('指标名称',),
+    },
+    'SHIBOR_PRICES': {'frequency': 'daily', 'key_cols': ('证券代码', '期限'), 'label_cols': ('期限',)},
+    'FINANCIAL_FACTORS_STOCKS': {
+        'frequency': 'quarterly',
+        'key_cols': ('证券代码', '证券简称', '申万一级行业', '申万二级行业', '申万三级行业'),
+        'label_cols': ('证券简称',),
+    },
+    'FINANCIAL_FACTORS_BACKTEST_NAV': {'frequency': 'daily', 'key_cols': (), 'label_cols': ()},
+}
+
+
+def read_snapshot_template(table_name: str, template_dir: str | None) -> pd.DataFrame:
+    """Read a shipped snapshot as strings to borrow its header, entity keys and value levels."""
+    if template_dir is None:
+        return pd.DataFrame(columns=list(config.CSV_DTYPE_MAPPING[table_name]))
+    path = os.path.join(template_dir, config.CSV_FILE_MAPPING[table_name])
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=list(config.CSV_DTYPE_MAPPING[table_name]))
+    return pd.read_csv(path, dtype=str)
+
+
+def generate_calendar(frequency: str, param: param_cls.SyntheticSnapshotParam, rng: np.random.Generator) -> list[str]:
+    """Dates in `config.WIND_DT_FORMAT` ending at `param.end_date`.
+
+    Daily calendars drop `param.gap_rate` of business days at random (holidays,
+    suspensions); the last date is always kept so every table ends on `end_date`.
+    """
+    end = pd.Timestamp(param.end_date)
+    if frequency == 'quarterly':
+        dates = pd.date_range(end=end, periods=param.n_quarters, freq='QE')
+    elif frequency == 'monthly':
+        dates = pd.date_range(end=end, periods=param.n_years * 12, freq='ME')
+    else:
+        dates = pd.bdate_range(start=end - pd.DateOffset(years=param.n_years), end=end)
+        if param.gap_rate > 0:
+            keep = rng.random(len(dates)) >= param.gap_rate
+            keep[-1] = True
+            dates = dates[keep]
+    return dates.strftime(config.WIND_DT_FORMAT).tolist()
+
+
+def generate_entities(
+    template_df: pd.DataFrame,
+    key_cols: tuple[str, ...],
+    label_cols: tuple[str, ...],
+    n_entities: int,
+) -> pd.DataFrame:
+    """Entity key rows: the template's own entities first (so config-referenced codes exist), then synthetic ones."""
+    template_entities = template_df[list(key_cols)].drop_duplicates().reset_index(drop=True)
+    if len(template_entities) >= n_entities:
+        return template_entities.iloc[:n_entities]
+
+    n_extra = n_entities - len(template_entities)
+    if template_entities.empty:
+        extra = pd.DataFrame({col: [f'{col}{i}' for i in range(n_extra)] for col in key_cols})
+    else:
+        extra = template_entities.iloc[np.arange(n_extra) % len(template_entities)].reset_index(drop=True)
+    extra[key_cols[0]] = [f'SYN{i:05d}' for i in range(n_extra)]
+    for col in label_cols:
+        extra[col] = [f'合成{i}' for i in range(n_extra)]
+    return pd.concat([template_entities, extra], ignore_index=True)
+
+
+def generate_value_panel(
+    template_values: pd.Series,
+    n_dates: int,
+    n_entities: int,
+    frequency: str,
+    nan_rate: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """(n_dates, n_entities) values shaped like the template column.
+
+    0/1 columns (pool signals) are drawn as Bernoulli with the template hit rate;
+    anything else is a multiplicative random walk around the template median.
+    """
+    values = pd.to_numeric(template_values, errors='coerce').dropna()
+    if len(values) and values.isin([0.0, 1.0]).all():
+        return (rng.random((n_dates, n_entities)) < values.mean()).astype('float64')
+
+    level = float(values.median()) if len(values) else 1.0
+    log_steps = rng.normal(0.0, SYNTHETIC_WALK_VOL[frequency], size=(n_dates, n_entities))
+    panel = level * np.exp(np.cumsum(log_steps, axis=0))
+    if nan_rate > 0:
+        panel[rng.random(panel.shape) < nan_rate] = np.nan
+    return panel
+
+
+def generate_snapshot_table(
+    table_name: str,
+    param: param_cls.SyntheticSnapshotParam,
+    template_dir: str | None = config.CSV_DATA_DIR,
+    rng: np.random.Generator | None = None,
+) -> pd.DataFrame:
+    """Generate one schema-valid snapshot table.
+
+    Columns follow the template header when one exists (so extra display columns
+    are kept), otherwise `CSV_DTYPE_MAPPING`; every column not declared as `str`
+    is numeric.
+    """
+    if rng is None:
+        rng = np.random.default_rng(param.seed)
+    spec = SYNTHETIC_TABLE_SPECS[table_name]
+    dtypes = config.CSV_DTYPE_MAPPING[table_name]
+    template_df = read_snapshot_template(table_name, template_dir)
+    columns = list(template_df.columns)
+    key_cols = spec['key_cols']
+
+    dates = generate_calendar(spec['frequency'], param, rng)
+    value_cols = [col for col in columns if col != SYNTHETIC_DATE_COL and col not in key_cols]
+    str_value_cols = [col for col in value_cols if dtypes.get(col, float) is str]
+    if str_value_cols:
+        raise ValueError(f'No synthetic generator for text columns in {table_name}: {str_value_cols}')
+
+    if not key_cols:
+        data = {SYNTHETIC_DATE_COL: dates}
+        for col in value_cols:
+            data[col] = generate_value_panel(template_df[col], len(dates), 1, spec['frequency'], 0.0, rng)[:, 0]
+        return pd.DataFrame(data, columns=columns)
+
+    n_entities = param.n_stocks if table_name == 'FINANCIAL_FACTORS_STOCKS' else param.n_codes
+    entities = generate_entities(template_df, key_cols, spec['label_cols'], n_entities)
+    data = {SYNTHETIC_DATE_COL: np.repeat(dates, len(entities))}
+    for col in key_cols:
+        data[col] = np.tile(entities[col].to_numpy(), len(dates))
+    for col in value_cols:
+        panel = generate_value_panel(
+            template_df[col], len(dates), len(entities), spec['frequency'], param.nan_rate, rng
+        )
+        data[col] = panel.ravel()
+    return pd.DataFrame(data, columns=columns)
+
+
+def write_synthetic_snapshots(
+    out_dir: str,
+    param: param_cls.SyntheticSnapshotParam,
+    table_names: list[str] | None = None,
+    template_dir: str | None = config.CSV_DATA_DIR,
+) -> dict[str, int]:
+    """Write generated snapshots under `out_dir` with the `CSV_FILE_MAPPING` file names.
+
+    Returns:
+        table name -> number of rows written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(param.seed)
+    row_counts = {}
+    for table_name in table_names or list(config.CSV_FILE_MAPPING):
+        df = generate_snapshot_table(table_name, param, template_dir=template_dir, rng=rng)
+        df.to_csv(os.path.join(out_dir, config.CSV_FILE_MAPPING[table_name]), index=False, float_format='%.6f')
+        row_counts[table_name] = len(df)
+    return row_counts
@@ -61,6 +61,9 @@ try {
   # 关键：确保 Python 不缓冲（双保险）
   $env:PYTHONUNBUFFERED = "1"
 
+  # 派生指标磁盘缓存：按快照内容哈希 + 配置块 + 计算代码版本命中，重启后直接复用；代码更新后旧条目不再命中，按 LRU 淘汰
+  $env:ST_IDX_RESULT_CACHE_DIR = Join-Path $ProjectDir "data\result_cache"
+
   # 关键：用 Tee-Object 让输出实时落盘（合并 stdout+stderr）
   & $VenvPython @Args 2>&1 | Tee-Object -FilePath $AppLog -Append
 
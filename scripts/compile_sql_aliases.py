@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+
+import argparse
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import style_config  # noqa: E402
+from utils import SQL_COL_ALIAS_ARTIFACT, compile_sql_col_aliases  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compile the column alias maps of the SQL templates.')
+    parser.add_argument('--sql-dir', default=str(PROJECT_ROOT / style_config.SQL_DIR), help='Template directory')
+    args = parser.parse_args()
+
+    aliases = compile_sql_col_aliases(args.sql_dir)
+    for sql_name, col_alias in aliases.items():
+        print(f'{sql_name}: {len(col_alias)} aliases')
+    print(f'Wrote {pathlib.Path(args.sql_dir) / SQL_COL_ALIAS_ARTIFACT}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
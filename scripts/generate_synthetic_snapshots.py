@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+import argparse
+import pathlib
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config, param_cls  # noqa: E402
+from data_preparation.synthetic_snapshots import write_synthetic_snapshots  # noqa: E402
+
+
+def main() -> int:
+    defaults = param_cls.SyntheticSnapshotParam()
+    parser = argparse.ArgumentParser(description='Write schema-valid synthetic CSV snapshots for scale testing.')
+    parser.add_argument('--out-dir', required=True, help='Directory for the generated CSV files')
+    parser.add_argument('--codes', type=int, default=defaults.n_codes, help='Entities per long-form table')
+    parser.add_argument('--years', type=int, default=defaults.n_years, help='History length of daily/monthly tables')
+    parser.add_argument('--stocks', type=int, default=defaults.n_stocks, help='Stocks in the stock-pool table')
+    parser.add_argument('--quarters', type=int, default=defaults.n_quarters, help='Report dates in the stock-pool table')
+    parser.add_argument('--end-date', default=defaults.end_date, help='Last date (YYYYMMDD)')
+    parser.add_argument('--gap-rate', type=float, default=defaults.gap_rate, help='Share of business days dropped')
+    parser.add_argument('--nan-rate', type=float, default=defaults.nan_rate, help='Share of numeric values set to NaN')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--tables', nargs='*', choices=list(config.CSV_FILE_MAPPING), help='Subset of tables')
+    parser.add_argument('--template-dir', default=config.CSV_DATA_DIR, help='Snapshots to borrow headers/keys from')
+    args = parser.parse_args()
+
+    param = param_cls.SyntheticSnapshotParam(
+        n_codes=args.codes,
+        n_years=args.years,
+        n_stocks=args.stocks,
+        n_quarters=args.quarters,
+        end_date=args.end_date,
+        gap_rate=args.gap_rate,
+        nan_rate=args.nan_rate,
+        seed=args.seed,
+    )
+    start_time = time.perf_counter()
+    row_counts = write_synthetic_snapshots(
+        args.out_dir, param, table_names=args.tables, template_dir=str(PROJECT_ROOT / args.template_dir)
+    )
+    for table_name, n_rows in row_counts.items():
+        print(f'{table_name:<32} {n_rows:>10} rows')
+    print(f'Wrote {len(row_counts)} tables to {args.out_dir} in {time.perf_counter() - start_time:.2f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+import argparse
+import ast
+import pathlib
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def read_app_shell_modules(app_path: pathlib.Path = PROJECT_ROOT / 'app.py') -> tuple[str, ...]:
+    """Modules `app.py` imports at the top level, in order."""
+    modules = []
+    for node in ast.parse(app_path.read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return tuple(dict.fromkeys(modules))
+
+
+# The app shell is what `app.py` imports before any page (read from `app.py`, so it cannot go
+# stale); each page module is then profiled on top of it, which is the extra cost of opening
+# that page for the first time.
+APP_SHELL_MODULES = read_app_shell_modules()
+PAGE_MODULES = ('visualization.financial_factors_stocks', 'visualization.stg_idx', 'visualization.style')
+
+
+def profile_imports(modules: tuple[str, ...], preloaded: tuple[str, ...] = ()) -> dict[str, int]:
+    """Self import time (us) per module for importing `modules` in a fresh interpreter after `preloaded`."""
+    code = ''.join(f'import {module}\n' for module in preloaded)
+    code += 'import sys\nsys.stderr.write("--profile--\\n")\n'
+    code += ''.join(f'import {module}\n' for module in modules)
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    self_us = {}
+    for line in stderr.split('--profile--\n', 1)[1].splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, module = line.removeprefix('import time:').split('|')
+        self_us[module.strip()] = int(self_time)
+    return self_us
+
+
+def summarize(label: str, self_us: dict[str, int], top: int) -> None:
+    by_package = defaultdict(int)
+    for module, us in self_us.items():
+        by_package[module.split('.')[0]] += us
+    print(f'{label}: {sum(self_us.values()) / 1e3:.1f} ms, {len(self_us)} modules')
+    for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f'    {package:<40} {us / 1e3:>8.1f} ms')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Import-time breakdown of the app shell and of each page.')
+    parser.add_argument('--top', type=int, default=8, help='Packages listed per entry')
+    args = parser.parse_args()
+
+    summarize('app shell', profile_imports(APP_SHELL_MODULES), args.top)
+    for module in PAGE_MODULES:
+        summarize(f'+ {module}', profile_imports((module,), preloaded=APP_SHELL_MODULES), args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config  # noqa: E402
+from data_preparation.result_cache import RESULT_CACHE_DIR_ENV  # noqa: E402
+from data_preparation.snapshot_store import (  # noqa: E402
+    SNAPSHOT_ID_ENV,
+    SNAPSHOT_KEEP_VERSIONS,
+    SnapshotWatcher,
+    publish_snapshot,
+)
+
+# Updaters keep writing CSVs into `--source` (by default the flat `data/csv/`); the app reads
+# the published copy named by `data/csv/CURRENT`, so it never sees a file mid-write.
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'data' / 'result_cache'
+DEFAULT_STATIC_DIR = PROJECT_ROOT / 'data' / 'static_dashboard'
+
+
+def build_warmer(cache_dir: pathlib.Path, static_dir: pathlib.Path):
+    """Render every page with the staged version pinned, filling the shared result cache and static views."""
+
+    def warm(snapshot_id: str) -> None:
+        env = {**os.environ, SNAPSHOT_ID_ENV: snapshot_id, RESULT_CACHE_DIR_ENV: str(cache_dir.resolve())}
+        command = [sys.executable, str(PROJECT_ROOT / 'scripts' / 'render_static.py'), '--out', str(static_dir)]
+        print(f'warming {snapshot_id} ...')
+        if subprocess.run(command, env=env).returncode != 0:
+            raise ValueError(f'Rendering pages on snapshot {snapshot_id} failed; keeping the current version')
+
+    return warm
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Publish CSV snapshots as versions and switch the app to them.')
+    parser.add_argument('--source', default=config.CSV_DATA_DIR, help='Directory the updater writes CSVs into')
+    parser.add_argument('--watch', action='store_true', help='Keep polling --source and publish on every change')
+    parser.add_argument('--settle-seconds', type=float, default=5.0, help='Quiet period before publishing')
+    parser.add_argument('--poll-seconds', type=float, default=1.0, help='Polling interval with --watch')
+    parser.add_argument('--keep', type=int, default=SNAPSHOT_KEEP_VERSIONS, help='Published versions to keep')
+    parser.add_argument('--cache-dir', type=pathlib.Path, default=DEFAULT_CACHE_DIR, help='Shared result cache root')
+    parser.add_argument('--static-dir', type=pathlib.Path, default=DEFAULT_STATIC_DIR, help='Static dashboard output')
+    parser.add_argument('--no-warm', action='store_true', help='Switch without rendering the pages first')
+    args = parser.parse_args()
+
+    warm = None if args.no_warm else build_warmer(args.cache_dir, args.static_dir)
+    if not args.watch:
+        print(f'current snapshot: {publish_snapshot(args.source, warm=warm, keep=args.keep)}')
+        return 0
+
+    watcher = SnapshotWatcher(args.source, settle_seconds=args.settle_seconds, warm=warm, keep=args.keep)
+    print(f'watching {args.source}')
+    try:
+        watcher.run(poll_seconds=args.poll_seconds, on_publish=lambda snapshot_id: print(f'switched to {snapshot_id}'))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
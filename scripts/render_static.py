@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+import argparse
+import pathlib
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from visualization.pages import PAGES  # noqa: E402
+from visualization.static_render import render_dashboard  # noqa: E402
+
+# Point `ST_IDX_STATIC_DIR` at the output so the live app opens pages on these default views;
+# `index.html` is a standalone copy of the dashboard.
+DEFAULT_OUT_DIR = PROJECT_ROOT / 'data' / 'static_dashboard'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Render every page at default settings to static Vega-Lite/Arrow files.')
+    parser.add_argument('--out', type=pathlib.Path, default=DEFAULT_OUT_DIR, help='Output directory')
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=None, help='Pages to render (default: all)')
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (1 = in-process)')
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    try:
+        manifest = render_dashboard(str(args.out), pages=args.pages, max_workers=args.workers)
+    except ValueError as e:
+        print(f'Error: {e}')
+        return 1
+    for page, entry in manifest['pages'].items():
+        kinds = [item['kind'] for item in entry['items']]
+        print(f'{page}: {kinds.count("chart")} charts, {kinds.count("table")} tables -> {args.out / entry["dir"]}')
+    print(f'Wrote {args.out / "index.html"} in {time.perf_counter() - start_time:.2f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+DEFAULT_RESULTS_DIR = PROJECT_ROOT / 'benchmark_results'
+
+
+def load_results(path: pathlib.Path) -> dict[tuple[str, str], dict]:
+    report = json.loads(path.read_text(encoding='utf-8'))
+    return {(row['group'], row['name']): row for row in report['results']}
+
+
+def compare_results(base_path: pathlib.Path, head_path: pathlib.Path, threshold: float) -> int:
+    """Print median timings and peak memory side by side; return the number of cases slower than `threshold` x base."""
+    base, head = load_results(base_path), load_results(head_path)
+    regressions = 0
+    print(f'{"case":<60} {"base":>10} {"head":>10} {"ratio":>7} {"base MB":>9} {"head MB":>9}')
+    for key in sorted(base.keys() & head.keys()):
+        base_median, head_median = base[key]['median'], head[key]['median']
+        ratio = head_median / base_median if base_median else float('inf')
+        flag = ' !' if ratio > threshold else ''
+        regressions += bool(flag)
+        print(
+            f'{"/".join(key):<60} {base_median:>10.4f} {head_median:>10.4f} {ratio:>7.2f} '
+            f'{_format_peak(base[key]):>9} {_format_peak(head[key]):>9}{flag}'
+        )
+    for key in sorted(head.keys() - base.keys()):
+        print(f'{"/".join(key):<60} {"-":>10} {head[key]["median"]:>10.4f} {"-":>7} {"-":>9} {_format_peak(head[key]):>9}')
+    return regressions
+
+
+def _format_peak(row: dict) -> str:
+    # Results written before peak memory was recorded have no `peak_mb`.
+    return f'{row["peak_mb"]:.1f}' if row.get('peak_mb') is not None else '-'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run the `benchmark` pytest suite and store timings as JSON.')
+    parser.add_argument('--out', default=None, help='Output JSON path (default: benchmark_results/<commit>.json)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case')
+    parser.add_argument('--scale', type=int, default=10, help='Size multiplier for synthetic inputs')
+    parser.add_argument('--compare', default=None, help='Baseline JSON to compare the new results against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    if args.out is None:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+        out_path = DEFAULT_RESULTS_DIR / f'{commit or "local"}.json'
+    else:
+        out_path = pathlib.Path(args.out).resolve()
+
+    cmd = [
+        sys.executable,
+        '-m',
+        'pytest',
+        '-m',
+        'benchmark',
+        '-q',
+        'tests',
+        f'--benchmark-json={out_path}',
+        f'--benchmark-repeat={args.repeat}',
+        f'--benchmark-scale={args.scale}',
+    ]
+    returncode = subprocess.call(cmd, cwd=PROJECT_ROOT)
+    if returncode:
+        return returncode
+    print(f'Wrote benchmark results to {out_path}')
+
+    if args.compare:
+        regressions = compare_results(pathlib.Path(args.compare), out_path, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+import argparse
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import param_cls  # noqa: E402
+from data_preparation.backtest_engine import read_stock_return_panel, run_pool_backtests  # noqa: E402
+from data_preparation.data_fetcher import read_csv_data  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Rebuild equal-weight stock-pool NAVs from pool signals.')
+    parser.add_argument('--returns', required=True, help='Long stock return file (交易日期, 证券代码, 日收益率), CSV or Parquet')
+    parser.add_argument('--out', required=True, help='Output CSV path for the wide NAV table')
+    parser.add_argument('--buy-cost', type=float, default=0.0, help='Buy cost rate on traded notional, e.g. 0.0005')
+    parser.add_argument('--sell-cost', type=float, default=0.0, help='Sell cost rate on traded notional, e.g. 0.0015')
+    args = parser.parse_args()
+
+    stocks_long_df = read_csv_data('FINANCIAL_FACTORS_STOCKS')
+    if stocks_long_df.empty:
+        print('Error: FINANCIAL_FACTORS_STOCKS is empty or missing')
+        return 1
+
+    ret_wide_df = read_stock_return_panel(args.returns)
+    param = param_cls.PoolBacktestParam(buy_cost_rate=args.buy_cost, sell_cost_rate=args.sell_cost)
+    nav_wide_df = run_pool_backtests(stocks_long_df, ret_wide_df, param)
+    nav_wide_df.to_csv(args.out, float_format='%.6f')
+    print(f'Wrote {len(nav_wide_df)} rows x {nav_wide_df.shape[1]} pools to {args.out}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
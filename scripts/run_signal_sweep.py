@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+import argparse
+import pathlib
+import sys
+import time
+from datetime import date
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config, param_cls, style_config  # noqa: E402
+from data_preparation.data_fetcher import fetch_data_from_local, fetch_index_data_from_local  # noqa: E402
+from data_preparation.data_processor import reshape_long_df_into_wide_form  # noqa: E402
+from data_preparation.signal_sweep import (  # noqa: E402
+    build_sweep_input,
+    get_sweep_horizon_sizes,
+    run_signal_sweep,
+    write_sweep_results,
+)
+from visualization.style import (  # noqa: E402
+    get_index_erp_gates,
+    get_style_focus_gates,
+    prepare_big_small_momentum_data,
+    prepare_index_erp_base_data,
+    prepare_style_focus_base_data,
+    prepare_term_spread_data,
+)
+
+
+def load_sweep_inputs(latest_date: str) -> dict:
+    """Build the indicator series and pair prices for every signal in SIGNAL_SWEEP_CONFIG from the CSV snapshots."""
+    val_col_param = style_config.DATA_COL_PARAM[param_cls.WindPortal.A_IDX_VAL]
+    long_idx_val_df = fetch_data_from_local(latest_date=latest_date, table_name='A_IDX_VAL')
+    long_bond_yield_df = fetch_data_from_local(latest_date=latest_date, table_name='CN_BOND_YIELD')
+
+    wind_idx_param = param_cls.WindListedSecParam(
+        wind_codes=tuple(style_config.STYLE_IDX_CODES.values()),
+        start_date=style_config.START_DT,
+        sql_param=param_cls.SqlParam(sql_name=config.IDX_PRICE_SQL_NAME),
+        end_date=latest_date,
+    )
+    idx_col_param = param_cls.WindIdxColParam()
+    raw_long_idx_df = fetch_index_data_from_local(latest_date=latest_date, _config=wind_idx_param)
+    idx_name_df = (
+        raw_long_idx_df[[idx_col_param.code_col, idx_col_param.name_col]]
+        .drop_duplicates()
+        .set_index(idx_col_param.code_col, drop=True)
+        .reindex(wind_idx_param.wind_codes)
+    )
+    raw_wide_idx_df = reshape_long_df_into_wide_form(
+        long_df=raw_long_idx_df,
+        index_col=idx_col_param.dt_col,
+        name_col=idx_col_param.name_col,
+        value_col=idx_col_param.price_col,
+    )
+
+    def get_pair_price_df(pair: tuple[str, str]):
+        names = [idx_name_df.loc[style_config.STYLE_IDX_CODES[leg]].values[0] for leg in pair]
+        return raw_wide_idx_df[names]
+
+    horizon_sizes = get_sweep_horizon_sizes()
+    erp_col = style_config.INDEX_ERP_CONFIG['ERP_COL']
+    focus_col = style_config.STYLE_FOCUS_CONFIG['STYLE_FOCUS_COL']
+
+    _, _, wide_raw_cn_bond_yield_df = prepare_term_spread_data(long_raw_cn_bond_yield_df=long_bond_yield_df)
+    erp_df = prepare_index_erp_base_data(
+        long_wind_all_a_idx_val_df=long_idx_val_df.query(f'{val_col_param.name_col} == "万得全A"'),
+        wide_raw_cn_bond_yield_df=wide_raw_cn_bond_yield_df,
+    )
+    _, _, big_small_df = prepare_big_small_momentum_data(raw_wide_idx_df=raw_wide_idx_df, idx_name_df=idx_name_df)
+    style_focus_df = prepare_style_focus_base_data(
+        long_big_small_idx_val_df=long_idx_val_df.query(f'{val_col_param.name_col} in ("沪深300", "中证1000")'),
+        big_small_df=big_small_df,
+    )
+    erp_upper_gate, erp_lower_gate = get_index_erp_gates(erp_df)
+    focus_upper_gate, focus_lower_gate = get_style_focus_gates(style_focus_df)
+    short_term_col, long_term_col = sorted(style_config.TERM_SPREAD_CONFIG['YIELD_CURVE_TERMS'])
+
+    return {
+        'INDEX_ERP': build_sweep_input(
+            target=erp_df[erp_col],
+            pair_price_df=get_pair_price_df(style_config.SIGNAL_SWEEP_CONFIG['INDEX_ERP']['PAIR']),
+            horizon_sizes=horizon_sizes,
+            upper_gate=erp_upper_gate,
+            lower_gate=erp_lower_gate,
+        ),
+        'STYLE_FOCUS': build_sweep_input(
+            target=style_focus_df[focus_col],
+            pair_price_df=get_pair_price_df(style_config.SIGNAL_SWEEP_CONFIG['STYLE_FOCUS']['PAIR']),
+            horizon_sizes=horizon_sizes,
+            upper_gate=focus_upper_gate,
+            lower_gate=focus_lower_gate,
+        ),
+        'TERM_SPREAD': build_sweep_input(
+            target=wide_raw_cn_bond_yield_df[long_term_col] - wide_raw_cn_bond_yield_df[short_term_col],
+            pair_price_df=get_pair_price_df(style_config.SIGNAL_SWEEP_CONFIG['TERM_SPREAD']['PAIR']),
+            horizon_sizes=horizon_sizes,
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Sweep style signal parameters and score each grid point.')
+    parser.add_argument('--out', required=True, help='Output Parquet path')
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (1 = in-process)')
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    sweep_inputs = load_sweep_inputs(latest_date=date.today().strftime(config.WIND_DT_FORMAT))
+    result_df = run_signal_sweep(sweep_inputs, max_workers=args.workers)
+    write_sweep_results(result_df, args.out)
+    print(f'Wrote {len(result_df)} rows to {args.out} in {time.perf_counter() - start_time:.2f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
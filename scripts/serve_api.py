@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.result_cache import RESULT_CACHE_DIR_ENV  # noqa: E402
+from visualization.indicator_api import INDICATOR_DATASETS, create_server  # noqa: E402
+
+# Defaults to the app workers' cache directory (`scripts/serve_workers.py`), so frames already
+# computed for the dashboard are served from disk.
+DEFAULT_PORT = 8701
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'data' / 'result_cache'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Serve computed indicators as read-only JSON/Arrow over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Bind port')
+    parser.add_argument('--cache-dir', type=pathlib.Path, default=DEFAULT_CACHE_DIR, help='Shared result cache root')
+    args = parser.parse_args()
+
+    args.cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ[RESULT_CACHE_DIR_ENV] = str(args.cache_dir.resolve())
+    server = create_server(args.host, args.port)
+    print(f'indicator api: http://{args.host}:{args.port}/datasets ({len(INDICATOR_DATASETS)} datasets)')
+    print(f'result cache: {args.cache_dir}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.compute_service import COMPUTE_WORKERS_ENV  # noqa: E402
+from data_preparation.result_cache import RESULT_CACHE_DIR_ENV, ResultCache  # noqa: E402
+
+# Each worker is a separate `streamlit run` process (its own GIL) on consecutive ports; the
+# reverse proxy in `ops/Caddyfile` pins a browser to one worker since sessions live in memory.
+DEFAULT_BASE_PORT = 8601
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'data' / 'result_cache'
+
+
+def build_worker_command(port: int) -> list[str]:
+    return [
+        sys.executable,
+        '-m',
+        'streamlit',
+        'run',
+        str(PROJECT_ROOT / 'app.py'),
+        '--server.headless',
+        'true',
+        '--server.address',
+        '127.0.0.1',
+        '--server.port',
+        str(port),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run several app workers sharing one on-disk result cache.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Number of Streamlit processes')
+    parser.add_argument('--base-port', type=int, default=DEFAULT_BASE_PORT, help='Port of the first worker')
+    parser.add_argument('--cache-dir', type=pathlib.Path, default=DEFAULT_CACHE_DIR, help='Shared result cache root')
+    parser.add_argument('--compute-workers', type=int, default=0, help='Indicator pool processes per worker')
+    parser.add_argument('--clear-cache', action='store_true', help='Drop cached results before starting')
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        ResultCache(args.cache_dir).clear()
+    args.cache_dir.mkdir(parents=True, exist_ok=True)
+    env = {
+        **os.environ,
+        RESULT_CACHE_DIR_ENV: str(args.cache_dir.resolve()),
+        COMPUTE_WORKERS_ENV: str(args.compute_workers),
+        'PYTHONUNBUFFERED': '1',
+    }
+
+    workers = []
+    for i in range(args.workers):
+        port = args.base_port + i
+        workers.append(subprocess.Popen(build_worker_command(port), cwd=PROJECT_ROOT, env=env))
+        print(f'worker {i}: http://127.0.0.1:{port} (pid {workers[-1].pid})')
+    print(f'result cache: {args.cache_dir}')
+
+    exit_code = 0
+    try:
+        while all(worker.poll() is None for worker in workers):
+            time.sleep(1)
+        print('a worker exited; stopping the others')
+        exit_code = 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+    return exit_code
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
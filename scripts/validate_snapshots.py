@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pandas as pd  # noqa: E402
+
+from config import config  # noqa: E402
+from data_preparation.data_fetcher import get_validation_report  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Report unparsable and empty numeric cells of the CSV snapshots.')
+    parser.add_argument('--csv-dir', default=None, help='Snapshot directory (default: config.CSV_DATA_DIR)')
+    parser.add_argument('--tables', nargs='+', choices=list(config.CSV_FILE_MAPPING), default=None)
+    parser.add_argument('--json', type=pathlib.Path, default=None, help='Also write the reports to this JSON file')
+    parser.add_argument(
+        '--max-invalid', type=int, default=0, help='Exit 1 when a column has more unparsable cells than this'
+    )
+    args = parser.parse_args()
+
+    if args.csv_dir:
+        config.CSV_DATA_DIR = args.csv_dir
+
+    reports = {}
+    failed = False
+    for table_name in args.tables or config.CSV_FILE_MAPPING:
+        report_df = get_validation_report(table_name)
+        if report_df is None:
+            print(f'{table_name}: missing or unreadable')
+            failed = True
+            continue
+        reports[table_name] = report_df.to_dict(orient='records')
+        dirty_df = report_df[(report_df['invalid'] > 0) | (report_df['missing'] > 0)]
+        rows = int(report_df['rows'].iloc[0]) if not report_df.empty else 0
+        print(f'{table_name}: {rows} rows, {len(dirty_df)} of {len(report_df)} checked columns with dirty cells')
+        if not dirty_df.empty:
+            with pd.option_context('display.width', 200, 'display.max_columns', None):
+                print(dirty_df.to_string(index=False))
+        failed |= bool((report_df['invalid'] > args.max_invalid).any())
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(reports, ensure_ascii=False, indent=2, default=int), encoding='utf-8')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
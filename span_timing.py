@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# NOTE 分层耗时统计
+# Spans nest per thread (each Streamlit session reruns in its own thread), so the
+# span path reflects the call tree, e.g. `generate_style_charts/fetch:A_IDX_VAL/read_csv`.
+SPAN_LOG_PATH_ENV = 'ST_IDX_SPAN_LOG'
+SPAN_HISTORY_SIZE = 500
+SPAN_STATS_COLS = ['span', 'depth', 'count', 'p50', 'p95', 'last', 'total']
+
+_SPAN_PATH: ContextVar[tuple[str, ...]] = ContextVar('span_path', default=())
+_SPAN_EVENTS: ContextVar[list | None] = ContextVar('span_events', default=None)
+_SPAN_DURATIONS: dict[str, deque] = {}
+_SPAN_TOTALS: dict[str, tuple[int, float]] = {}
+_SPAN_LOCK = threading.Lock()
+
+
+def _record_span(path: str, seconds: float) -> None:
+    with _SPAN_LOCK:
+        durations = _SPAN_DURATIONS.setdefault(path, deque(maxlen=SPAN_HISTORY_SIZE))
+        durations.append(seconds)
+        count, total = _SPAN_TOTALS.get(path, (0, 0.0))
+        _SPAN_TOTALS[path] = (count + 1, total + seconds)
+
+
+def _write_span_events(events: list[dict]) -> None:
+    log_path = os.environ.get(SPAN_LOG_PATH_ENV)
+    if not log_path or not events:
+        return
+    with open(log_path, 'a', encoding='utf-8') as file:
+        for event in events:
+            file.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+@contextmanager
+def timed_span(name: str):
+    """Time a block as a child of the enclosing span.
+
+    Durations are aggregated in-process (see `get_span_stats`). When the outermost
+    span closes and `ST_IDX_SPAN_LOG` is set, every span of that run is appended to
+    the file as one JSON line.
+    """
+    parent_path = _SPAN_PATH.get()
+    path = (*parent_path, name)
+    path_token = _SPAN_PATH.set(path)
+    events_token = _SPAN_EVENTS.set([]) if not parent_path else None
+
+    started_at = datetime.now()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        span = '/'.join(path)
+        _record_span(span, seconds)
+        events = _SPAN_EVENTS.get()
+        if events is not None:
+            events.append(
+                {'ts': started_at.isoformat(timespec='milliseconds'), 'span': span, 'depth': len(path), 'seconds': seconds}
+            )
+        _SPAN_PATH.reset(path_token)
+        if events_token is not None:
+            _SPAN_EVENTS.reset(events_token)
+            _write_span_events(events)
+
+
+def span_timer(func=None, *, name: str | None = None):
+    """Decorator form of `timed_span`; the span name defaults to the function name."""
+
+    def decorator(inner):
+        span_name = name or inner.__name__
+
+        @wraps(inner)
+        def wrapper(*args, **kwargs):
+            with timed_span(span_name):
+                return inner(*args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def get_span_stats() -> 'pd.DataFrame':
+    """p50/p95/last over the most recent `SPAN_HISTORY_SIZE` runs of each span, plus lifetime count/total (seconds)."""
+    # Imported here: the app shell times its spans without loading numpy/pandas.
+    import numpy as np
+    import pandas as pd
+
+    with _SPAN_LOCK:
+        snapshot = {path: (list(durations), _SPAN_TOTALS[path]) for path, durations in _SPAN_DURATIONS.items()}
+
+    rows = []
+    for path, (durations, (count, total)) in sorted(snapshot.items()):
+        p50, p95 = np.percentile(durations, [50, 95])
+        rows.append((path, path.count('/') + 1, count, p50, p95, durations[-1], total))
+    return pd.DataFrame(rows, columns=SPAN_STATS_COLS)
+
+
+def reset_span_stats() -> None:
+    with _SPAN_LOCK:
+        _SPAN_DURATIONS.clear()
+        _SPAN_TOTALS.clear()
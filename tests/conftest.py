@@ -0,0 +1,98 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+BENCHMARK_RESULTS_KEY = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark')
+    group.addoption('--benchmark-json', default=None, help='Write benchmark timings to this JSON file')
+    group.addoption('--benchmark-repeat', type=int, default=5, help='Timed runs per benchmark case')
+    group.addoption('--benchmark-scale', type=int, default=10, help='Size multiplier for synthetic benchmark inputs')
+
+
+def pytest_configure(config):
+    config.stash[BENCHMARK_RESULTS_KEY] = []
+
+
+@pytest.fixture
+def benchmark_scale(request) -> int:
+    return request.config.getoption('--benchmark-scale')
+
+
+@pytest.fixture
+def bench_timer(request):
+    """Time `func(*args, **kwargs)` `--benchmark-repeat` times after one warm-up call and record the result.
+
+    Peak traced memory comes from one extra untimed call, since `tracemalloc` slows
+    allocation-heavy code down too much to share a run with the timings.
+
+    Returns the value of the last call so the caller can sanity-check it.
+    """
+    repeat = request.config.getoption('--benchmark-repeat')
+    results = request.config.stash[BENCHMARK_RESULTS_KEY]
+
+    def run(group: str, name: str, func, *args, rows: int | None = None, **kwargs):
+        value = func(*args, **kwargs)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        results.append(
+            {
+                'group': group,
+                'name': name,
+                'rows': rows,
+                'repeat': repeat,
+                'min': min(timings),
+                'median': statistics.median(timings),
+                'mean': statistics.fmean(timings),
+                'peak_mb': peak_bytes / 2**20,
+            }
+        )
+        return value
+
+    return run
+
+
+def _get_git_commit(root: Path) -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def pytest_sessionfinish(session, exitstatus):
+    out_path = session.config.getoption('--benchmark-json')
+    results = session.config.stash[BENCHMARK_RESULTS_KEY]
+    if not out_path or not results:
+        return
+
+    report = {
+        'commit': _get_git_commit(session.config.rootpath),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'scale': session.config.getoption('--benchmark-scale'),
+        'results': results,
+    }
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
@@ -0,0 +1,116 @@
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import param_cls  # noqa: E402
+from data_preparation.backtest_engine import (  # noqa: E402
+    build_pool_weight_matrix,
+    run_pool_backtests,
+    run_weight_backtest,
+)
+
+
+def _naive_daily_backtest(weight_df: pd.DataFrame, ret_wide_df: pd.DataFrame, param) -> pd.Series:
+    """Day-by-day holdings simulation used as the reference implementation."""
+    ret_wide_df = ret_wide_df.reindex(columns=weight_df.columns).fillna(0.0)
+    holdings = np.zeros(weight_df.shape[1])
+    cash = param.initial_nav
+    navs = []
+    for dt, ret in ret_wide_df.iterrows():
+        holdings = holdings * (1 + ret.to_numpy())
+        if dt in weight_df.index:
+            nav = holdings.sum() + cash
+            target = weight_df.loc[dt].to_numpy() * nav
+            trades = target - holdings
+            cost = np.clip(trades, 0, None).sum() * param.buy_cost_rate + np.clip(-trades, 0, None).sum() * param.sell_cost_rate
+            nav_after = nav - cost
+            holdings = weight_df.loc[dt].to_numpy() * nav_after
+            cash = nav_after - holdings.sum()
+        navs.append(holdings.sum() + cash)
+    return pd.Series(navs, index=ret_wide_df.index)
+
+
+def test_equal_weight_pool_matches_hand_computed_nav() -> None:
+    stocks_long_df = pd.DataFrame(
+        {
+            '交易日期': ['20240102', '20240102', '20240104', '20240104'],
+            '证券代码': ['A', 'B', 'A', 'B'],
+            '景气成长策略': ['1', '1', '0', '1'],
+        }
+    )
+    ret_wide_df = pd.DataFrame(
+        {'A': [0.0, 0.1, 0.0, 0.5], 'B': [0.0, -0.1, 0.2, 0.1]},
+        index=['20240102', '20240103', '20240104', '20240105'],
+    )
+
+    weight_df = build_pool_weight_matrix(stocks_long_df, '景气成长策略')
+    nav, rebalance_df = run_weight_backtest(weight_df, ret_wide_df)
+
+    # Day 2: 0.5 * 1.1 + 0.5 * 0.9 = 1.0; day 3: 0.55 + 0.45 * 1.2 = 1.09; day 4: B only, +10%.
+    assert nav.tolist() == pytest.approx([1.0, 1.0, 1.09, 1.199])
+    assert rebalance_df['换手率'].tolist() == pytest.approx([1.0, 2 * 0.55 / 1.09])
+
+
+def test_vectorized_backtest_matches_daily_simulation_with_costs() -> None:
+    rng = np.random.default_rng(11)
+    trade_dt = pd.date_range('2023-01-02', periods=120, freq='B').strftime('%Y%m%d')
+    codes = [f'S{i:03d}' for i in range(30)]
+    ret_wide_df = pd.DataFrame(rng.normal(0.0005, 0.02, size=(len(trade_dt), len(codes))), index=trade_dt, columns=codes)
+    ret_wide_df = ret_wide_df.mask(rng.random(ret_wide_df.shape) < 0.05)
+
+    rebalance_dt = trade_dt[[0, 30, 60, 90]]
+    member = rng.random((len(rebalance_dt), len(codes))) < 0.3
+    member[2] = False  # Empty pool: the portfolio goes fully to cash.
+    stocks_long_df = pd.DataFrame(
+        {
+            '交易日期': np.repeat(rebalance_dt, len(codes)),
+            '证券代码': np.tile(codes, len(rebalance_dt)),
+            '景气成长策略': member.ravel().astype(int).astype(str),
+        }
+    )
+    param = param_cls.PoolBacktestParam(buy_cost_rate=0.0005, sell_cost_rate=0.0015)
+
+    weight_df = build_pool_weight_matrix(stocks_long_df, '景气成长策略')
+    nav, _ = run_weight_backtest(weight_df, ret_wide_df, param)
+    expected = _naive_daily_backtest(weight_df, ret_wide_df, param)
+
+    np.testing.assert_allclose(nav.to_numpy(), expected.to_numpy(), rtol=1e-10)
+    assert nav.iloc[61:90].nunique() == 1
+
+
+def test_rebalance_on_non_trading_date_uses_previous_close() -> None:
+    weight_df = pd.DataFrame({'A': [1.0]}, index=['20240106'])
+    ret_wide_df = pd.DataFrame({'A': [0.0, 0.1, 0.2]}, index=['20240105', '20240108', '20240109'])
+
+    nav, rebalance_df = run_weight_backtest(weight_df, ret_wide_df)
+
+    assert rebalance_df.index.tolist() == ['20240105']
+    assert nav.tolist() == pytest.approx([1.0, 1.1, 1.32])
+
+
+def test_run_pool_backtests_outputs_configured_nav_columns() -> None:
+    stocks_long_df = pd.DataFrame(
+        {
+            '交易日期': ['20240102', '20240102'],
+            '证券代码': ['A', 'B'],
+            '中性股息策略': ['1', '0'],
+            '细分龙头策略': ['0', '1'],
+            '景气成长策略': ['0', '0'],
+        }
+    )
+    ret_wide_df = pd.DataFrame({'A': [0.0, 0.1], 'B': [0.0, -0.1]}, index=['20240102', '20240103'])
+
+    nav_wide_df = run_pool_backtests(stocks_long_df, ret_wide_df)
+
+    assert nav_wide_df.index.name == '交易日期'
+    assert nav_wide_df.loc['20240103'].to_dict() == pytest.approx(
+        {'中性股息股票池': 1.1, '细分龙头股票池': 0.9, '景气成长股票池': 1.0}
+    )
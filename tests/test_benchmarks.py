@@ -0,0 +1,324 @@
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config, param_cls, style_config  # noqa: E402
+from data_preparation.data_analyzer import calculate_grouped_return, calculate_rolling_performance  # noqa: E402
+from data_preparation.data_fetcher import (  # noqa: E402
+    fetch_data_from_local,
+    fetch_index_data_from_local,
+    read_csv_data,
+)
+from data_preparation.data_processor import (  # noqa: E402
+    ColumnPipeline,
+    append_difference_column,
+    append_ratio_column,
+    append_rolling_mean_column,
+    append_sum_column,
+    reshape_long_df_into_wide_form,
+)
+from data_preparation.synthetic_snapshots import write_synthetic_snapshots  # noqa: E402
+from utils import to_date_keys  # noqa: E402
+from visualization import style  # noqa: E402
+from visualization.financial_factors_stocks import (  # noqa: E402
+    BACKTEST_NAV_BENCH_COL,
+    BACKTEST_NAV_DATE_COL,
+    BACKTEST_NAV_STRATEGY_COL,
+    BACKTEST_NAV_TABLE_NAME,
+    _calc_nav_metrics,
+    _calc_nav_norm_and_excess_nav,
+)
+
+pytestmark = pytest.mark.benchmark
+
+LATEST_DATE = '99991231'
+STYLE_PREPARE_FUNCS = (
+    'prepare_value_growth_data',
+    'prepare_index_turnover_data',
+    'prepare_term_spread_data',
+    'prepare_term_spread_signal',
+    'prepare_index_erp_data',
+    'prepare_big_small_momentum_data',
+    'prepare_style_focus_data',
+    'prepare_shibor_prices_data',
+    'prepare_housing_invest_data',
+)
+TRADING_DAYS = 242
+
+
+def get_synthetic_param(scale: int) -> param_cls.SyntheticSnapshotParam:
+    """Scale 10 is the production-size target: 100 indices x 20 years and 5000 stocks x 40 quarters."""
+    return param_cls.SyntheticSnapshotParam(
+        n_codes=10 * scale, n_years=2 * scale, n_stocks=500 * scale, n_quarters=4 * scale, gap_rate=0.02
+    )
+
+
+@pytest.fixture(scope='module')
+def synthetic_csv_dir(request, tmp_path_factory) -> str:
+    out_dir = tmp_path_factory.mktemp('synthetic_csv')
+    write_synthetic_snapshots(str(out_dir), get_synthetic_param(request.config.getoption('--benchmark-scale')))
+    return str(out_dir)
+
+
+@pytest.fixture(scope='module', params=['shipped', 'synthetic'])
+def style_inputs(request) -> tuple[str, dict]:
+    if request.param == 'shipped':
+        return 'shipped', _load_style_inputs()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(config, 'CSV_DATA_DIR', request.getfixturevalue('synthetic_csv_dir'))
+        scale = request.config.getoption('--benchmark-scale')
+        return f'x{scale}', _load_style_inputs()
+
+
+def _load_style_inputs() -> dict:
+    """Inputs for every style `prepare_*` function, built once per snapshot set (outside the timers)."""
+    long_raw = {
+        table_name: fetch_data_from_local(latest_date=LATEST_DATE, table_name=table_name)
+        for table_name in ('CN_BOND_YIELD', 'A_IDX_VAL', 'EDB', 'SHIBOR_PRICES')
+    }
+    val_col_param = style_config.DATA_COL_PARAM[param_cls.WindPortal.A_IDX_VAL]
+    edb_col_param = style_config.DATA_COL_PARAM[param_cls.WindPortal.EDB]
+
+    wind_idx_param = param_cls.WindListedSecParam(
+        wind_codes=tuple(style_config.STYLE_IDX_CODES.values()),
+        start_date=style_config.START_DT,
+        sql_param=param_cls.SqlParam(sql_name=config.IDX_PRICE_SQL_NAME),
+        end_date=LATEST_DATE,
+    )
+    idx_col_param = param_cls.WindIdxColParam()
+    raw_long_idx_df = fetch_index_data_from_local(latest_date=LATEST_DATE, _config=wind_idx_param)
+    idx_name_df = (
+        raw_long_idx_df[[idx_col_param.code_col, idx_col_param.name_col]]
+        .drop_duplicates()
+        .set_index(idx_col_param.code_col, drop=True)
+        .reindex(wind_idx_param.wind_codes)
+    )
+    raw_wide_idx_df = reshape_long_df_into_wide_form(
+        long_df=raw_long_idx_df,
+        index_col=idx_col_param.dt_col,
+        name_col=idx_col_param.name_col,
+        value_col=idx_col_param.price_col,
+    )
+
+    term_spread_df, _, wide_raw_cn_bond_yield_df = style.prepare_term_spread_data(long_raw['CN_BOND_YIELD'])
+    _, _, big_small_df = style.prepare_big_small_momentum_data(raw_wide_idx_df=raw_wide_idx_df, idx_name_df=idx_name_df)
+    return {
+        'raw_wide_idx_df': raw_wide_idx_df,
+        'idx_name_df': idx_name_df,
+        'long_raw': long_raw,
+        'long_wind_all_a_idx_val_df': long_raw['A_IDX_VAL'].query(f'{val_col_param.name_col} == "万得全A"'),
+        'long_big_small_idx_val_df': long_raw['A_IDX_VAL'].query(
+            f'{val_col_param.name_col} in ("沪深300", "中证1000")'
+        ),
+        'wide_raw_edb_df': reshape_long_df_into_wide_form(
+            long_df=long_raw['EDB'],
+            index_col=edb_col_param.dt_col,
+            name_col=edb_col_param.name_col,
+            value_col=edb_col_param.value_col,
+        ),
+        'term_spread_df': term_spread_df,
+        'wide_raw_cn_bond_yield_df': wide_raw_cn_bond_yield_df,
+        'big_small_df': big_small_df,
+    }
+
+
+def _style_prepare_kwargs(inputs: dict) -> dict[str, dict]:
+    idx_kwargs = {'raw_wide_idx_df': inputs['raw_wide_idx_df'], 'idx_name_df': inputs['idx_name_df']}
+    return {
+        'prepare_value_growth_data': idx_kwargs,
+        'prepare_index_turnover_data': {'long_wind_all_a_idx_val_df': inputs['long_wind_all_a_idx_val_df']},
+        'prepare_term_spread_data': {'long_raw_cn_bond_yield_df': inputs['long_raw']['CN_BOND_YIELD']},
+        'prepare_term_spread_signal': {
+            'term_spread_df': inputs['term_spread_df'],
+            'true_signal': '成长',
+            'false_signal': '价值',
+        },
+        'prepare_index_erp_data': {
+            'long_wind_all_a_idx_val_df': inputs['long_wind_all_a_idx_val_df'],
+            'wide_raw_cn_bond_yield_df': inputs['wide_raw_cn_bond_yield_df'],
+        },
+        'prepare_big_small_momentum_data': idx_kwargs,
+        'prepare_style_focus_data': {
+            'long_big_small_idx_val_df': inputs['long_big_small_idx_val_df'],
+            'big_small_df': inputs['big_small_df'],
+        },
+        'prepare_shibor_prices_data': {'long_raw_shibor_df': inputs['long_raw']['SHIBOR_PRICES']},
+        'prepare_housing_invest_data': {'wide_raw_edb_df': inputs['wide_raw_edb_df']},
+    }
+
+
+def _make_synthetic_long_prices(n_codes: int, n_days: int, data_col_config: param_cls.WindIdxColParam) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    trade_dt = to_date_keys(pd.bdate_range('2005-01-04', periods=n_days).strftime(config.WIND_DT_FORMAT))
+    prices = 1000 * np.cumprod(1 + rng.normal(0.0003, 0.012, size=(n_days, n_codes)), axis=0)
+    codes = [f'{i:06d}.SYN' for i in range(n_codes)]
+    return pd.DataFrame(
+        {
+            data_col_config.dt_col: np.repeat(trade_dt, n_codes),
+            data_col_config.code_col: np.tile(codes, n_days),
+            data_col_config.name_col: np.tile([f'合成{i}' for i in range(n_codes)], n_days),
+            data_col_config.price_col: prices.ravel(),
+        }
+    )
+
+
+@pytest.mark.parametrize('table_name', list(config.CSV_FILE_MAPPING))
+def test_bench_read_csv_data_shipped(bench_timer, table_name: str) -> None:
+    df = bench_timer('read_csv_data', f'{table_name}[shipped]', read_csv_data, table_name)
+    assert not df.empty
+
+
+@pytest.mark.parametrize('table_name', list(config.CSV_FILE_MAPPING))
+def test_bench_read_csv_data_scaled(
+    bench_timer, benchmark_scale, synthetic_csv_dir, monkeypatch, table_name: str
+) -> None:
+    monkeypatch.setattr(config, 'CSV_DATA_DIR', synthetic_csv_dir)
+
+    df = bench_timer('read_csv_data', f'{table_name}[x{benchmark_scale}]', read_csv_data, table_name)
+    assert not df.empty
+
+
+@pytest.mark.parametrize('func_name', STYLE_PREPARE_FUNCS)
+def test_bench_style_prepare(bench_timer, style_inputs, func_name: str) -> None:
+    label, inputs = style_inputs
+    kwargs = _style_prepare_kwargs(inputs)[func_name]
+    result = bench_timer('style_prepare', f'{func_name}[{label}]', getattr(style, func_name), **kwargs)
+    assert result is not None
+
+
+@pytest.mark.parametrize('scale', [1, None], ids=['shipped_size', 'scaled'])
+def test_bench_calculate_grouped_return(bench_timer, benchmark_scale, scale) -> None:
+    data_col_config = param_cls.WindIdxColParam()
+    n_codes = 6 * (scale or benchmark_scale)
+    long_df = _make_synthetic_long_prices(n_codes=n_codes, n_days=1500, data_col_config=data_col_config)
+    trade_dt = sorted(long_df[data_col_config.dt_col].unique().tolist())
+
+    grouped_ret_df = bench_timer(
+        'calculate_grouped_return',
+        f'{n_codes}codes',
+        calculate_grouped_return,
+        long_df,
+        trade_dt[-1],
+        (trade_dt[-250], trade_dt[-1]),
+        trade_dt,
+        data_col_config,
+        rows=len(long_df),
+    )
+    assert len(grouped_ret_df) == n_codes
+
+
+def _relative_momentum_append_chain(wide_df: pd.DataFrame) -> pd.DataFrame:
+    df = append_ratio_column(df=wide_df.copy(), numerator_col='a', denominator_col='b', ratio_col='a/b')
+    df = append_rolling_mean_column(df=df, window_name='一年', window_size=TRADING_DAYS, rolling_mean_col='均值')
+    df['a20'], df['b20'] = df['a'].pct_change(20), df['b'].pct_change(20)
+    df['a10'], df['b10'] = df['a'].pct_change(10), df['b'].pct_change(10)
+    df = df.dropna()
+    df = append_difference_column(df=df, minuend_col='a20', subtrahend_col='b20', difference_col='d20')
+    df = append_difference_column(df=df, minuend_col='a10', subtrahend_col='b10', difference_col='d10')
+    return append_sum_column(df=df, sum_1_col='d20', sum_2_col='d10', sum_col='动量', multiplier_2=2, multiplier_sum=0.5)
+
+
+def _relative_momentum_pipeline(wide_df: pd.DataFrame) -> pd.DataFrame:
+    return (
+        ColumnPipeline(wide_df)
+        .ratio('a', 'b', 'a/b')
+        .rolling_mean('a/b', TRADING_DAYS, '均值', trim=True)
+        .pct_change('a', 20, 'a20')
+        .pct_change('b', 20, 'b20')
+        .pct_change('a', 10, 'a10')
+        .pct_change('b', 10, 'b10')
+        .trim()
+        .difference('a20', 'b20', 'd20')
+        .difference('a10', 'b10', 'd10')
+        .sum('d20', 'd10', '动量', multiplier_2=2, multiplier_sum=0.5)
+        .run()
+    )
+
+
+def test_bench_relative_momentum_chain(bench_timer, benchmark_scale) -> None:
+    rng = np.random.default_rng(7)
+    n_days = 4000 * benchmark_scale
+    wide_df = pd.DataFrame(
+        np.cumprod(1 + rng.normal(0, 0.01, size=(n_days, 2)), axis=0),
+        index=to_date_keys(pd.bdate_range('1990-01-02', periods=n_days).strftime(config.WIND_DT_FORMAT)),
+        columns=['a', 'b'],
+    )
+
+    legacy_df = bench_timer(
+        'relative_momentum', 'append_chain', _relative_momentum_append_chain, wide_df, rows=n_days
+    )
+    pipeline_df = bench_timer('relative_momentum', 'column_pipeline', _relative_momentum_pipeline, wide_df, rows=n_days)
+    pd.testing.assert_frame_equal(pipeline_df, legacy_df)
+
+
+def test_bench_nav_metrics_shipped(bench_timer) -> None:
+    nav_df = read_csv_data(BACKTEST_NAV_TABLE_NAME).set_index(BACKTEST_NAV_DATE_COL).sort_index()
+    strategy_nav, bench_nav = nav_df[BACKTEST_NAV_STRATEGY_COL], nav_df[BACKTEST_NAV_BENCH_COL]
+
+    metrics = bench_timer(
+        'nav_metrics',
+        '_calc_nav_metrics[shipped]',
+        _calc_nav_metrics,
+        strategy_nav,
+        rf_annual=0.0,
+        trading_days=TRADING_DAYS,
+        rows=len(nav_df),
+    )
+    assert np.isfinite(metrics['period_return'])
+    bench_timer(
+        'nav_metrics',
+        '_calc_nav_norm_and_excess_nav[shipped]',
+        _calc_nav_norm_and_excess_nav,
+        strategy_nav,
+        bench_nav,
+        rows=len(nav_df),
+    )
+    bench_timer(
+        'nav_metrics',
+        'calculate_rolling_performance[shipped]',
+        calculate_rolling_performance,
+        nav_df.select_dtypes('number'),
+        window_size=TRADING_DAYS,
+        trading_days=TRADING_DAYS,
+        bench_col=BACKTEST_NAV_BENCH_COL,
+        rows=len(nav_df),
+    )
+
+
+def test_bench_nav_metrics_scaled(bench_timer, benchmark_scale) -> None:
+    rng = np.random.default_rng(5)
+    n_days, n_cols = 4000 * benchmark_scale, 4 * benchmark_scale
+    index = to_date_keys(pd.bdate_range('1990-01-02', periods=n_days).strftime(config.WIND_DT_FORMAT))
+    nav_wide_df = pd.DataFrame(
+        np.cumprod(1 + rng.normal(0.0003, 0.01, size=(n_days, n_cols)), axis=0),
+        index=index,
+        columns=[f'nav{i}' for i in range(n_cols)],
+    )
+
+    bench_timer(
+        'nav_metrics',
+        f'_calc_nav_metrics[x{benchmark_scale}]',
+        _calc_nav_metrics,
+        nav_wide_df['nav0'],
+        rf_annual=0.0,
+        trading_days=TRADING_DAYS,
+        rows=n_days,
+    )
+    bench_timer(
+        'nav_metrics',
+        f'calculate_rolling_performance[x{benchmark_scale}]',
+        calculate_rolling_performance,
+        nav_wide_df,
+        window_size=TRADING_DAYS,
+        trading_days=TRADING_DAYS,
+        bench_col='nav0',
+        rows=n_days * n_cols,
+    )
@@ -0,0 +1,61 @@
+import pathlib
+import sys
+
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.compute_service import COMPUTE_WORKERS_ENV, ComputeService, submit_job  # noqa: E402
+from data_preparation.data_processor import reshape_long_df_into_wide_form  # noqa: E402
+from data_preparation.result_cache import RESULT_CACHE_DIR_ENV, ResultCache, result_key  # noqa: E402
+
+
+def _long_price_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "交易日期": ["20250102", "20250102", "20250103", "20250103"],
+            "证券简称": pd.Categorical(["沪深300", "中证1000", "沪深300", "中证1000"]),
+            "收盘价": [3900.0, 6100.0, 3950.0, 6080.0],
+        }
+    )
+
+
+@pytest.mark.stg_idx_prep
+def test_pool_jobs_return_the_inline_frames_and_fill_the_shared_cache(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv(RESULT_CACHE_DIR_ENV, str(tmp_path))
+    kwargs = {"long_df": _long_price_df(), "index_col": "交易日期", "name_col": "证券简称", "value_col": "收盘价"}
+    expected = reshape_long_df_into_wide_form(**kwargs)
+
+    service = ComputeService(max_workers=2)
+    try:
+        jobs = [
+            service.submit("wide_price_df", ("v1",), reshape_long_df_into_wide_form, **kwargs),
+            service.submit("wide_price_df", None, reshape_long_df_into_wide_form, **kwargs),
+            service.submit("bad_job", None, reshape_long_df_into_wide_form, **{**kwargs, "value_col": "不存在"}),
+        ]
+        pd.testing.assert_frame_equal(jobs[0].result(), expected)
+        pd.testing.assert_frame_equal(jobs[1].result(), expected)
+        with pytest.raises(KeyError):
+            jobs[2].result()
+    finally:
+        service.shutdown()
+
+    cached = ResultCache(tmp_path).get("wide_price_df", result_key("wide_price_df", ("v1",)))
+    pd.testing.assert_frame_equal(cached, expected)
+
+
+@pytest.mark.stg_idx_prep
+def test_inline_jobs_run_once_on_first_result(monkeypatch) -> None:
+    monkeypatch.delenv(COMPUTE_WORKERS_ENV, raising=False)
+    monkeypatch.delenv(RESULT_CACHE_DIR_ENV, raising=False)
+    calls = []
+    job = submit_job("inline", None, lambda x: calls.append(x) or x * 2, 21)
+
+    assert calls == []
+    assert job.result() == 42
+    assert job.result() == 42
+    assert calls == [21]
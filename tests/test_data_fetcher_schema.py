@@ -1,5 +1,8 @@
+import os
 import pathlib
 import sys
+import threading
+import time
 
 import pandas as pd
 import pytest
@@ -18,9 +21,15 @@ from data_preparation.data_fetcher import (  # noqa: E402
     fetch_data_from_local,
     fetch_financial_factors_stocks_from_local,
     fetch_index_data_from_local,
+    get_canonical_col,
+    get_snapshot_content_hash,
     read_csv_data,
+    select_date_range,
 )
 from config import style_config  # noqa: E402
+from data_preparation import data_fetcher  # noqa: E402
+from data_preparation.csv_ingest import count_csv_rows  # noqa: E402
+from utils import DATE_KEY_DTYPE, SingleFlight  # noqa: E402
 
 
 @pytest.mark.schema
@@ -58,15 +67,20 @@ def test_fetch_data_from_local_respects_dataset_schema(table_name: str) -> None:
     assert date_col in df.columns
     assert df[date_col].is_monotonic_decreasing
 
-    # Canonical English aliases MUST be present when declared.
+    # Canonical English aliases MUST resolve to a column on the frame.
     canonical_cols = CANONICAL_COL_MAPPINGS.get(table_name, {})
     for canonical, source in canonical_cols.items():
+        assert get_canonical_col(table_name, canonical) == source
         assert source in df.columns
-        assert canonical in df.columns
+
+    # Trade dates MUST be int32 yyyymmdd keys, whatever the CSV text type.
+    assert df[date_col].dtype == DATE_KEY_DTYPE
 
     # Column dtypes MUST be compatible with the declared mapping.
     for col, expected_dtype in dtypes.items():
         series = df[col]
+        if col == date_col:
+            continue
         if expected_dtype is float:
             # Allow NaNs but require numeric dtype.
             assert pd.api.types.is_numeric_dtype(series), f"{table_name}.{col} expected numeric dtype"
@@ -126,15 +140,21 @@ def test_fetch_index_data_from_local_respects_index_price_schema() -> None:
     assert date_col in df.columns
     assert df[date_col].is_monotonic_decreasing
 
-    # Canonical English aliases MUST be present alongside the CSV columns.
+    # Canonical English aliases MUST resolve to a column on the frame.
     canonical_cols = CANONICAL_COL_MAPPINGS["A_IDX_PRICE"]
     for canonical, source in canonical_cols.items():
+        assert get_canonical_col("A_IDX_PRICE", canonical) == source
         assert source in df.columns
-        assert canonical in df.columns
+
+    # Trade dates (and the physical 交易日期 they are copied from) MUST be int32 yyyymmdd keys.
+    assert df[date_col].dtype == DATE_KEY_DTYPE
+    assert df["交易日期"].dtype == DATE_KEY_DTYPE
 
     # Column dtypes MUST be compatible with the declared mapping.
     for col, expected_dtype in dtypes.items():
         series = df[col]
+        if col == "交易日期":
+            continue
         if expected_dtype is float:
             assert pd.api.types.is_numeric_dtype(series), f"A_IDX_PRICE.{col} expected numeric dtype"
         elif expected_dtype is str:
@@ -142,7 +162,7 @@ def test_fetch_index_data_from_local_respects_index_price_schema() -> None:
 
 
 @pytest.mark.schema
-def test_read_csv_data_coerces_dirty_numeric_values(tmp_path, monkeypatch, capsys) -> None:
+def test_read_csv_data_coerces_dirty_numeric_values(tmp_path, monkeypatch, caplog) -> None:
     """read_csv_data MUST tolerate dirty numeric cells and coerce them to NaN."""
     table_name = "A_IDX_VAL"
     csv_name = "dirty_index_valuations.csv"
@@ -165,10 +185,100 @@ def test_read_csv_data_coerces_dirty_numeric_values(tmp_path, monkeypatch, capsy
     assert pd.isna(df.loc[1, "日换手率"])
     assert pd.isna(df.loc[1, "市盈率"])
 
-    out = capsys.readouterr().out
-    assert "Warning:" in out
-    assert "column 日换手率" in out
-    assert "column 市盈率" in out
+    assert "A_IDX_VAL: NaN cells in 日换手率: 1 invalid, 0 missing" in caplog.messages
+    assert "A_IDX_VAL: NaN cells in 市盈率: 0 invalid, 1 missing" in caplog.messages
+
+
+@pytest.mark.schema
+def test_chunked_read_matches_a_single_chunk_and_filters_each_chunk(tmp_path, monkeypatch, caplog) -> None:
+    """Chunk size MUST NOT change the frame read; row filters drop rows before they are stored."""
+    table_name = "A_IDX_VAL"
+    csv_name = "chunked_index_valuations.csv"
+    rows = [
+        f"2025010{day},{code},{name},{turnover},12.5"
+        for day in range(1, 8)
+        for code, name, turnover in (("000905.SH", "中证500", "0.4"), ("000300.SH", "沪深300", "--"))
+    ]
+    # No trailing newline: the last row still counts.
+    (tmp_path / csv_name).write_text("交易日期,证券代码,证券简称,日换手率,市盈率\n" + "\n".join(rows), encoding="utf-8")
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(config.CSV_FILE_MAPPING, table_name, csv_name)
+    assert count_csv_rows(str(tmp_path / csv_name)) == len(rows)
+
+    whole_df = read_csv_data(table_name, chunk_rows=len(rows))
+    chunked_df = read_csv_data(table_name, chunk_rows=3)
+    pd.testing.assert_frame_equal(chunked_df, whole_df)
+    assert chunked_df["证券代码"].cat.categories.tolist() == ["000300.SH", "000905.SH"]
+    assert f"A_IDX_VAL: NaN cells in 日换手率: {len(rows) // 2} invalid, 0 missing" in caplog.messages
+
+    filtered_df = read_csv_data(table_name, row_filter=lambda df: df["证券代码"] == "000300.SH", chunk_rows=3)
+    assert filtered_df["证券代码"].astype(str).unique().tolist() == ["000300.SH"]
+    assert filtered_df["交易日期"].tolist() == whole_df.loc[whole_df["证券代码"] == "000300.SH", "交易日期"].tolist()
+
+
+@pytest.mark.schema
+def test_validation_report_locates_dirty_cells_once_per_file_version(tmp_path, monkeypatch) -> None:
+    """The report MUST separate unparsable from empty cells, with row ids, and be kept per file version."""
+    table_name = "A_IDX_VAL"
+    csv_name = "reported_index_valuations.csv"
+    csv_path = tmp_path / csv_name
+    csv_path.write_text(
+        "交易日期,证券代码,证券简称,日换手率,市盈率\n"
+        "20250101,000300.SH,沪深300,0.5,12.5\n"
+        "20250102,000300.SH,沪深300,--,\n"
+        "20250103,000300.SH,沪深300,0.6,null\n"
+        "20250106,000300.SH,沪深300,n/a,13.1\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(config.CSV_FILE_MAPPING, table_name, csv_name)
+
+    assert data_fetcher.get_validation_report(table_name, load=False) is None
+    read_csv_data(table_name, chunk_rows=2)
+    report = data_fetcher.get_validation_report(table_name, load=False).set_index("column")
+    assert report.loc["日换手率", ["rows", "invalid", "missing"]].tolist() == [4, 1, 1]
+    assert report.loc["日换手率", "invalid_rows"] == [1]
+    assert report.loc["日换手率", "missing_rows"] == [3]
+    assert report.loc["市盈率", ["invalid", "missing"]].tolist() == [0, 2]
+    assert report.loc["市盈率", "missing_rows"] == [1, 2]
+
+    reads = []
+    original_read_csv_data = data_fetcher.read_csv_data
+    monkeypatch.setattr(
+        data_fetcher, "read_csv_data", lambda *args, **kwargs: reads.append(args) or original_read_csv_data(*args, **kwargs)
+    )
+    assert data_fetcher.get_validation_report(table_name).equals(report.reset_index())
+    assert reads == []
+
+    csv_path.write_text("交易日期,证券代码,证券简称,日换手率,市盈率\n20250107,000300.SH,沪深300,0.7,14.0\n", encoding="utf-8")
+    assert data_fetcher.get_validation_report(table_name)[["rows", "invalid", "missing"]].sum().tolist() == [3, 0, 0]
+    assert reads == [(table_name,)]
+
+
+@pytest.mark.schema
+def test_rows_without_a_valid_date_are_dropped_and_reported(tmp_path, monkeypatch) -> None:
+    """A blank or malformed 交易日期 MUST NOT break the fetch; those rows are dropped and reported."""
+    table_name = "FINANCIAL_FACTORS_BACKTEST_NAV"
+    csv_name = "undated_backtest_nav.csv"
+    (tmp_path / csv_name).write_text(
+        "交易日期,中性股息股票池,中证红利全收益\n"
+        "20250102,1.02,1.0\n"
+        ",1.5,1.5\n"
+        "2025-01-06,1.6,1.6\n"
+        "20250103,1.03,1.0\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(config.CSV_FILE_MAPPING, table_name, csv_name)
+
+    df = fetch_data_from_local("99991231", table_name)
+    assert df["交易日期"].tolist() == [20250103, 20250102]
+    assert df["中性股息股票池"].tolist() == [1.03, 1.02]
+
+    report = data_fetcher.get_validation_report(table_name, load=False).set_index("column")
+    assert report.loc["交易日期", ["rows", "invalid", "missing"]].tolist() == [4, 1, 1]
+    assert report.loc["交易日期", "invalid_rows"] == [2]
+    assert report.loc["交易日期", "missing_rows"] == [1]
 
 
 @pytest.mark.schema
@@ -194,12 +304,147 @@ def test_fetch_financial_factors_stocks_from_local_respects_schema() -> None:
 
     canonical_cols = CANONICAL_COL_MAPPINGS.get(schema["table_name"], {})
     for canonical, source in canonical_cols.items():
+        assert get_canonical_col(schema["table_name"], canonical) == source
         assert source in df.columns
-        assert canonical in df.columns
 
+    assert df[date_col].dtype == DATE_KEY_DTYPE
     for col, expected_dtype in dtypes.items():
         series = df[col]
+        if col == date_col:
+            continue
         if expected_dtype is float:
             assert pd.api.types.is_numeric_dtype(series), f"{schema['table_name']}.{col} expected numeric dtype"
         elif expected_dtype is str:
             assert pd.api.types.is_string_dtype(series), f"{schema['table_name']}.{col} expected string dtype"
+
+
+@pytest.mark.schema
+def test_read_csv_data_stores_text_keys_as_categories() -> None:
+    """Declared text columns other than the trade date MUST load as categoricals, without alias copies."""
+    df = read_csv_data("A_IDX_VAL")
+    if df.empty:
+        return
+
+    assert isinstance(df["证券代码"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["证券简称"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["交易日期"].dtype, pd.CategoricalDtype)
+    assert not set(CANONICAL_COL_MAPPINGS["A_IDX_VAL"]) & set(df.columns)
+
+
+@pytest.mark.schema
+def test_select_date_range_slices_sorted_snapshot_and_tracks_file_changes(tmp_path, monkeypatch) -> None:
+    """Date-range fetches MUST come back newest first and reflect a replaced snapshot file."""
+    table_name = "FINANCIAL_FACTORS_BACKTEST_NAV"
+    csv_name = "unsorted_backtest_nav.csv"
+    csv_path = tmp_path / csv_name
+    csv_path.write_text(
+        "交易日期,中性股息股票池,中证红利全收益\n20250103,1.03,1.0\n20250101,1.01,1.0\n20250106,1.06,1.0\n20250102,1.02,1.0\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(config.CSV_FILE_MAPPING, table_name, csv_name)
+
+    df = select_date_range(table_name, latest_date="20250103", start_date="20250102")
+    assert df["交易日期"].tolist() == [20250103, 20250102]
+
+    csv_path.write_text(
+        "交易日期,中性股息股票池,中证红利全收益\n20250107,1.07,1.0\n20250108,1.08,1.0\n20250102,1.02,1.0\n",
+        encoding="utf-8",
+    )
+    df = select_date_range(table_name, latest_date="99991231")
+    assert df["交易日期"].tolist() == [20250108, 20250107, 20250102]
+
+
+@pytest.mark.schema
+def test_concurrent_cold_fetches_share_one_snapshot_read(tmp_path, monkeypatch) -> None:
+    """Sessions that miss on the same snapshot version together MUST wait on a single read."""
+    table_name = "FINANCIAL_FACTORS_BACKTEST_NAV"
+    csv_name = "shared_backtest_nav.csv"
+    (tmp_path / csv_name).write_text(
+        "交易日期,中性股息股票池,中证红利全收益\n20250102,1.02,1.0\n20250103,1.03,1.0\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(config.CSV_FILE_MAPPING, table_name, csv_name)
+
+    reads = []
+    read_csv_data = data_fetcher.read_csv_data
+
+    def slow_read_csv_data(name: str, **kwargs) -> pd.DataFrame:
+        reads.append(name)
+        time.sleep(0.2)
+        return read_csv_data(name, **kwargs)
+
+    monkeypatch.setattr(data_fetcher, "read_csv_data", slow_read_csv_data)
+
+    n_sessions = 6
+    barrier = threading.Barrier(n_sessions)
+    results = [None] * n_sessions
+
+    def session(i: int) -> None:
+        barrier.wait()
+        results[i] = select_date_range(table_name, latest_date="99991231")
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert reads == [table_name]
+    assert all(df["交易日期"].tolist() == [20250103, 20250102] for df in results)
+
+
+@pytest.mark.schema
+def test_single_flight_shares_failures_and_forgets_finished_calls() -> None:
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def failing() -> None:
+        calls.append(1)
+        started.set()
+        release.wait()
+        raise ValueError("boom")
+
+    errors = []
+
+    def caller() -> None:
+        try:
+            flight.do("key", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=caller)
+    follower.start()
+    time.sleep(0.1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert len(errors) == 2
+    assert flight.in_flight() == 0
+    assert flight.do("key", lambda: 42) == 42
+
+
+@pytest.mark.schema
+def test_snapshot_content_hash_ignores_touches_and_tracks_edits(tmp_path, monkeypatch) -> None:
+    table_name = "FINANCIAL_FACTORS_BACKTEST_NAV"
+    csv_path = tmp_path / "hashed_backtest_nav.csv"
+    csv_path.write_text("交易日期,中性股息股票池,中证红利全收益\n20250102,1.02,1.0\n", encoding="utf-8")
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(tmp_path))
+    monkeypatch.setitem(config.CSV_FILE_MAPPING, table_name, csv_path.name)
+
+    content_hash = get_snapshot_content_hash(table_name)
+    os.utime(csv_path, (1, 1))
+    assert get_snapshot_content_hash(table_name) == content_hash
+
+    csv_path.write_text("交易日期,中性股息股票池,中证红利全收益\n20250102,1.03,1.0\n", encoding="utf-8")
+    assert get_snapshot_content_hash(table_name) not in ("", content_hash)
+
+    csv_path.unlink()
+    assert get_snapshot_content_hash(table_name) == ""
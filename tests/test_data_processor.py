@@ -0,0 +1,87 @@
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.data_processor import (  # noqa: E402
+    ColumnPipeline,
+    append_difference_column,
+    append_ratio_column,
+    append_rolling_mean_column,
+    append_rolling_quantile_column,
+    append_sum_column,
+)
+
+
+def _make_wide_prices(periods: int = 120) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    index = pd.Index(pd.date_range('2023-01-02', periods=periods, freq='B').strftime('%Y%m%d'), name='交易日期')
+    wide_df = pd.DataFrame(
+        np.cumprod(1 + rng.normal(0, 0.01, size=(periods, 2)), axis=0),
+        index=index,
+        columns=pd.Index(['a', 'b'], name='证券简称'),
+    )
+    # Interior gaps make every trim drop rows the later steps must not see.
+    wide_df.iloc[periods // 4, 0] = np.nan
+    wide_df.iloc[periods * 5 // 8, 1] = np.nan
+    return wide_df
+
+
+@pytest.mark.style_prep
+def test_column_pipeline_matches_append_chain_with_trims_and_marks() -> None:
+    wide_df = _make_wide_prices()
+
+    legacy_df = append_ratio_column(df=wide_df.copy(), numerator_col='a', denominator_col='b', ratio_col='a/b')
+    legacy_df = append_rolling_mean_column(df=legacy_df, window_name='一月', window_size=10, rolling_mean_col='均值')
+    legacy_ratio_mean_df = legacy_df.iloc[:, -2:]
+    for col, periods, pct_change_col in (('a', 5, 'a5'), ('b', 5, 'b5'), ('a', 3, 'a3'), ('b', 3, 'b3')):
+        legacy_df[pct_change_col] = legacy_df[col].pct_change(periods)
+    legacy_df = legacy_df.dropna()
+    legacy_df = append_difference_column(df=legacy_df, minuend_col='a5', subtrahend_col='b5', difference_col='d5')
+    legacy_df = append_difference_column(df=legacy_df, minuend_col='a3', subtrahend_col='b3', difference_col='d3')
+    legacy_df = append_sum_column(
+        df=legacy_df, sum_1_col='d5', sum_2_col='d3', sum_col='动量', multiplier_2=2, multiplier_sum=0.5
+    )
+    legacy_df = append_rolling_quantile_column(
+        df=legacy_df, window_name='半月', window_size=8, target_col='动量', rolling_quantile_col='q80', quantile=80
+    )
+
+    pipeline = (
+        ColumnPipeline(wide_df)
+        .ratio('a', 'b', 'a/b')
+        .rolling_mean('a/b', 10, '均值', trim=True)
+        .mark('ratio_mean', ['a/b', '均值'])
+        .pct_change('a', 5, 'a5')
+        .pct_change('b', 5, 'b5')
+        .pct_change('a', 3, 'a3')
+        .pct_change('b', 3, 'b3')
+        .trim()
+        .difference('a5', 'b5', 'd5')
+        .difference('a3', 'b3', 'd3')
+        .sum('d5', 'd3', '动量', multiplier_2=2, multiplier_sum=0.5)
+        .rolling_quantile('动量', 8, 'q80', quantile=80, trim=True)
+    )
+    result_df = pipeline.run()
+
+    assert_frame_equal(result_df, legacy_df)
+    assert_frame_equal(pipeline.frame_at('ratio_mean'), legacy_ratio_mean_df)
+    # The input frame is left untouched.
+    assert list(wide_df.columns) == ['a', 'b']
+
+
+@pytest.mark.style_prep
+def test_column_pipeline_without_trim_keeps_every_row() -> None:
+    wide_df = _make_wide_prices(periods=40)
+
+    result_df = ColumnPipeline(wide_df).rolling_mean('a', 5, '均值').run()
+
+    assert result_df.index.equals(wide_df.index)
+    assert result_df['均值'].isna().sum() == 4 + 5
@@ -23,8 +23,8 @@ def test_stock_pool_filtering_matches_signal_sum_for_selected_date() -> None:
         return
 
     date_col = financial_factors_config.DATE_COL
-    selected_date = str(df[date_col].iloc[0])
-    date_mask = df[date_col].astype(str) == selected_date
+    selected_date = df[date_col].iloc[0]
+    date_mask = df[date_col] == selected_date
 
     for strategy_cfg in financial_factors_config.STOCK_POOL_STRATEGIES.values():
         signal_col = strategy_cfg['signal_col']
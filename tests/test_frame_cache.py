@@ -0,0 +1,83 @@
+import pathlib
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.frame_cache import FrameCache, estimate_nbytes, frame_cached, get_frame_cache  # noqa: E402
+
+
+def _frame(rows: int, value: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame({"中证800": np.full(rows, value)}, index=pd.RangeIndex(rows))
+
+
+@pytest.mark.schema
+def test_global_budget_evicts_least_recently_used() -> None:
+    frame_bytes = estimate_nbytes(_frame(1000))
+    cache = FrameCache(max_bytes=int(frame_bytes * 2.5))
+    for key in ("a", "b"):
+        cache.put(key, key, _frame(1000))
+    cache.get("a")
+    cache.put("c", "c", _frame(1000))
+
+    assert cache.entry_usage()["name"].tolist() == ["c", "a"]
+    assert cache.stats()["bytes"] == 2 * frame_bytes
+    assert cache.stats()["evictions"] == 1
+    with pytest.raises(KeyError):
+        cache.get("b")
+
+    cache.put("huge", "huge", _frame(10_000))
+    assert cache.entry_usage()["name"].tolist() == ["c", "a"]
+
+
+@pytest.mark.schema
+def test_session_budget_only_evicts_that_sessions_private_entries() -> None:
+    frame_bytes = estimate_nbytes(_frame(1000))
+    cache = FrameCache(max_bytes=frame_bytes * 10, session_max_bytes=int(frame_bytes * 1.5))
+    cache.put("shared", "shared", _frame(1000), session_id="s1")
+    cache.get("shared", session_id="s2")
+    cache.put("s1-old", "s1-old", _frame(1000), session_id="s1")
+    cache.put("s2-own", "s2-own", _frame(1000), session_id="s2")
+    cache.put("s1-new", "s1-new", _frame(1000), session_id="s1")
+
+    assert sorted(cache.entry_usage()["name"]) == ["s1-new", "s2-own", "shared"]
+    usage = cache.session_usage().set_index("session")
+    assert usage.loc["s1", "entries"] == 2
+    assert usage.loc["s1", "private_bytes"] == frame_bytes
+    assert usage.loc["s2", "bytes"] == 2 * frame_bytes
+
+
+@pytest.mark.schema
+def test_frame_cached_shares_one_result_without_exposing_it(monkeypatch) -> None:
+    monkeypatch.setattr("data_preparation.frame_cache._FRAME_CACHE", None)
+    calls = []
+
+    @frame_cached()
+    def build(snapshot_version: str, _raw_df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        calls.append(snapshot_version)
+        return {"nav": _raw_df.cumsum()}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(build("v1", _frame(3)))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ["v1"]
+
+    first = build("v1", _frame(3, value=9.0))
+    first["nav"]["中证800"] = 0.0
+    first["nav"]["extra"] = 1.0
+    assert build("v1", None)["nav"].columns.tolist() == ["中证800"]
+    assert build("v1", None)["nav"]["中证800"].tolist() == [1.0, 2.0, 3.0]
+
+    build("v2", _frame(3))
+    assert calls == ["v1", "v2"]
+    assert get_frame_cache().stats()["entries"] == 2
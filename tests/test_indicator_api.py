@@ -0,0 +1,80 @@
+import json
+import pathlib
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.result_cache import RESULT_CACHE_DIR_ENV  # noqa: E402
+from visualization.indicator_api import ARROW_MEDIA_TYPE, create_server, parse_query, select_columns  # noqa: E402
+
+
+@pytest.fixture
+def api_url(tmp_path, monkeypatch):
+    monkeypatch.setenv(RESULT_CACHE_DIR_ENV, str(tmp_path))
+    server = create_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url: str, headers: dict | None = None):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=60) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.headers, exc.read()
+
+
+@pytest.mark.stg_idx_prep
+def test_query_parameters_are_validated() -> None:
+    assert parse_query({"start": ["20250101"], "columns": ["中证800,中证红利"]}) == (
+        "20250101",
+        None,
+        ["中证800", "中证红利"],
+        None,
+    )
+    for query in ({"start": ["2025-01-01"]}, {"start": ["20250301"], "end": ["20250101"]}, {"format": ["csv"]}):
+        with pytest.raises(ValueError):
+            parse_query(query)
+
+
+@pytest.mark.stg_idx_prep
+def test_column_names_select_period_labels() -> None:
+    df = pd.DataFrame([[0.01, 0.02]], columns=["周度 [250106 - 250110]", "自选 [250102 - 250228]"], index=["中证800"])
+    assert select_columns(df, ["自选"]).columns.tolist() == ["自选 [250102 - 250228]"]
+    with pytest.raises(ValueError):
+        select_columns(df, ["季度"])
+
+
+@pytest.mark.stg_idx_prep
+def test_dataset_is_served_as_json_and_arrow_with_etag(api_url) -> None:
+    url = f"{api_url}/datasets/stg_idx_nav?start=20250102&end=20250228&columns=%E4%B8%AD%E8%AF%81800"
+    status, headers, body = _get(url)
+    assert status == 200
+    payload = json.loads(body)
+    assert payload["columns"] == ["中证800"]
+    assert payload["index"][0] >= "20250102" and payload["index"][-1] <= "20250228"
+    assert payload["data"][0] == [1.0]
+
+    assert _get(url, {"If-None-Match": headers["ETag"]})[0] == 304
+
+    status, headers, body = _get(url, {"Accept": ARROW_MEDIA_TYPE})
+    assert status == 200 and headers["Content-Type"] == ARROW_MEDIA_TYPE
+    arrow_df = pa.ipc.open_stream(body).read_all().to_pandas()
+    assert arrow_df.index.tolist() == payload["index"]
+    assert arrow_df["中证800"].tolist() == pytest.approx([row[0] for row in payload["data"]])
+
+    assert _get(f"{api_url}/datasets/unknown")[0] == 404
+    assert _get(f"{api_url}/datasets/stg_idx_nav?end=2025")[0] == 400
@@ -0,0 +1,175 @@
+import os
+import pathlib
+import subprocess
+import sys
+import textwrap
+
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation import result_cache  # noqa: E402
+from data_preparation.result_cache import (  # noqa: E402
+    RESULT_CACHE_DIR_ENV,
+    ResultCache,
+    cached_result,
+    code_fingerprint,
+    config_fingerprint,
+    result_key,
+)
+
+
+def _sample_result():
+    dt_index = pd.Index(["20250102", "20250103", "20250106"], name="交易日期")
+    wide_df = pd.DataFrame(
+        {"10年": [1.6, 1.7, None], "1年": [1.1, 1.2, 1.3]},
+        index=dt_index,
+    ).rename_axis(columns="交易期限")
+    signal_df = pd.DataFrame(
+        {"交易信号": pd.Categorical(["看多", "看空", "看多"]), "比值": [1.0, 0.9, 1.1]},
+        index=dt_index,
+    )
+    signal = pd.Series(["看多", None, "看空"], index=dt_index)
+    return {
+        "wide_df": wide_df,
+        "frames": (signal_df, [signal > "看", signal.rename("交易信号")]),
+        "label": "价值成长",
+    }
+
+
+@pytest.mark.schema
+def test_result_cache_round_trips_nested_frames(tmp_path) -> None:
+    cache = ResultCache(tmp_path)
+    value = _sample_result()
+    cache.put("sample", "k", value)
+    loaded = cache.get("sample", "k")
+
+    pd.testing.assert_frame_equal(loaded["wide_df"], value["wide_df"])
+    loaded_signal_df, (loaded_mask, loaded_signal) = loaded["frames"]
+    pd.testing.assert_frame_equal(loaded_signal_df, value["frames"][0])
+    pd.testing.assert_series_equal(loaded_mask, value["frames"][1][0])
+    pd.testing.assert_series_equal(loaded_signal, value["frames"][1][1])
+    assert loaded["label"] == "价值成长"
+    assert not list(tmp_path.glob("sample/*.tmp-*"))
+
+    with pytest.raises(KeyError):
+        cache.get("sample", "missing")
+
+
+@pytest.mark.schema
+def test_cached_result_computes_inline_without_cache_dir(monkeypatch) -> None:
+    monkeypatch.delenv(RESULT_CACHE_DIR_ENV, raising=False)
+    calls = []
+    assert cached_result("sample", ("v1",), lambda x: calls.append(x) or x, 3) == 3
+    assert cached_result("sample", ("v1",), lambda x: calls.append(x) or x, 3) == 3
+    assert calls == [3, 3]
+
+
+@pytest.mark.schema
+def test_worker_processes_compute_a_result_once(tmp_path) -> None:
+    """Workers that miss on the same key together MUST wait for a single computation."""
+    calls_path = tmp_path / "calls.txt"
+    worker_code = textwrap.dedent(
+        f"""
+        import time
+        import pandas as pd
+        from data_preparation.result_cache import cached_result
+
+        def compute():
+            with open({str(calls_path)!r}, "a") as file:
+                file.write("x")
+            time.sleep(0.5)
+            return pd.DataFrame({{"净值": [1.0, 1.1]}}, index=pd.Index(["20250102", "20250103"], name="交易日期"))
+
+        print(cached_result("nav", ("v1", "20250103"), compute)["净值"].tolist())
+        """
+    )
+    env = {**os.environ, RESULT_CACHE_DIR_ENV: str(tmp_path / "cache"), "PYTHONPATH": str(PROJECT_ROOT)}
+    workers = [
+        subprocess.Popen([sys.executable, "-c", worker_code], cwd=PROJECT_ROOT, env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(3)
+    ]
+    outputs = [worker.communicate(timeout=60)[0].strip() for worker in workers]
+
+    assert all(worker.returncode == 0 for worker in workers)
+    assert outputs == ["[1.0, 1.1]"] * 3
+    assert calls_path.read_text() == "x"
+
+
+@pytest.mark.schema
+def test_stale_lock_of_a_dead_worker_is_broken(tmp_path, monkeypatch) -> None:
+    cache = ResultCache(tmp_path)
+    lock_path = tmp_path / "sample" / f"{result_key('sample', ('v1',))}.lock"
+    lock_path.parent.mkdir(parents=True)
+    lock_path.write_text("12345")
+    os.utime(lock_path, (0, 0))
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_LOCK_STALE_SECONDS", 1)
+
+    assert cache.get_or_compute("sample", ("v1",), lambda: "done") == "done"
+    assert not lock_path.exists()
+    assert cache.get("sample", result_key("sample", ("v1",))) == "done"
+
+
+@pytest.mark.schema
+def test_least_recently_used_entries_are_evicted_past_the_size_bound(tmp_path) -> None:
+    frame = pd.DataFrame({"收盘价": [float(i) for i in range(1000)]})
+    cache = ResultCache(tmp_path)
+    for key in ("a", "b", "c"):
+        cache.put("sample", key, frame)
+    entry_bytes = {entry.name: size for entry, size, _ in cache.entries()}
+    assert set(entry_bytes) == {"a", "b", "c"}
+
+    for age, key in enumerate(("b", "a", "c")):
+        os.utime(cache.entry_path("sample", key) / result_cache.RESULT_CACHE_MANIFEST, (age, age))
+    cache.get("sample", "b")  # a hit counts as a use
+
+    bounded = ResultCache(tmp_path, max_bytes=entry_bytes["a"] + entry_bytes["b"] + 1)
+    bounded.put("sample", "d", frame)
+
+    assert sorted(entry.name for entry, _, _ in bounded.entries()) == ["b", "d"]
+    assert not list(tmp_path.glob("sample/*.evict-*"))
+
+
+@pytest.mark.schema
+def test_config_fingerprint_tracks_block_contents() -> None:
+    block = {"WINDOW": 20, "TRUE_SIGNAL": "看多"}
+    assert config_fingerprint(block) == config_fingerprint(dict(block))
+    assert config_fingerprint(block) != config_fingerprint({**block, "WINDOW": 60})
+
+
+@pytest.mark.schema
+def test_result_key_changes_with_the_computing_code(tmp_path, monkeypatch) -> None:
+    """A deploy that changes any source a result depends on, or the cache version, MUST NOT hit the old entries."""
+    covered = {path.relative_to(PROJECT_ROOT).as_posix() for path in result_cache._code_files()}
+    for relative_path in (
+        "utils.py",
+        "config/config.py",
+        "config/param_cls.py",
+        "config/style_config.py",
+        "data_preparation/data_processor.py",
+        "visualization/style.py",
+        "sql_template/query_edb.sql",
+    ):
+        assert relative_path in covered
+    assert len(code_fingerprint()) == 16
+
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "param_cls.py").write_text("TRUE_SIGNAL = '看多'\n", encoding="utf-8")
+    (tmp_path / "utils.py").write_text("MONTH = 21\n", encoding="utf-8")
+    monkeypatch.setattr(result_cache, "_PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(result_cache, "_CODE_FINGERPRINT", None)
+    key = result_key("sample", ("v1",))
+
+    for relative_path, source in (("utils.py", "MONTH = 22\n"), ("config/param_cls.py", "TRUE_SIGNAL = '买入'\n")):
+        (tmp_path / relative_path).write_text(source, encoding="utf-8")
+        monkeypatch.setattr(result_cache, "_CODE_FINGERPRINT", None)
+        assert result_key("sample", ("v1",)) != key
+        key = result_key("sample", ("v1",))
+
+    monkeypatch.setattr(result_cache, "_CODE_FINGERPRINT", None)
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_VERSION", result_cache.RESULT_CACHE_VERSION + 1)
+    assert result_key("sample", ("v1",)) != key
@@ -0,0 +1,92 @@
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.data_analyzer import (  # noqa: E402
+    ROLLING_PERF_METRICS,
+    calculate_rolling_performance,
+)
+
+
+def _make_nav_wide_df(periods: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    index = pd.date_range(start='2024-01-01', periods=periods, freq='B').strftime('%Y%m%d')
+    rets = rng.normal(loc=0.0005, scale=0.01, size=(periods, 2))
+    nav = np.cumprod(1 + rets, axis=0)
+    return pd.DataFrame(nav, index=index, columns=['strategy', 'benchmark'])
+
+
+@pytest.mark.stg_idx_prep
+def test_rolling_metrics_match_window_by_window_definitions() -> None:
+    """Rolling metrics MUST match a naive per-window recomputation."""
+    nav_wide_df = _make_nav_wide_df()
+    window_size = 10
+    trading_days = 242
+    rf_annual = 0.013
+
+    rolling_perf = calculate_rolling_performance(
+        nav_wide_df,
+        window_size=window_size,
+        trading_days=trading_days,
+        rf_annual=rf_annual,
+        bench_col='benchmark',
+    )
+    assert set(rolling_perf) == set(ROLLING_PERF_METRICS)
+
+    rf_daily = (1 + rf_annual) ** (1 / trading_days) - 1
+    ret = nav_wide_df['strategy'].pct_change()
+    end = len(nav_wide_df) - 1
+    window_ret = ret.iloc[end - window_size + 1 : end + 1]
+
+    expected_vol = window_ret.std(ddof=1) * np.sqrt(trading_days)
+    expected_sharpe = (window_ret - rf_daily).mean() / (window_ret - rf_daily).std(ddof=1) * np.sqrt(trading_days)
+    excess_nav = nav_wide_df['strategy'] / nav_wide_df['benchmark']
+    expected_excess = excess_nav.iloc[end] / excess_nav.iloc[end - window_size] - 1
+
+    assert rolling_perf['volatility']['strategy'].iloc[end] == pytest.approx(expected_vol)
+    assert rolling_perf['sharpe']['strategy'].iloc[end] == pytest.approx(expected_sharpe)
+    assert rolling_perf['excess_return']['strategy'].iloc[end] == pytest.approx(expected_excess)
+    assert rolling_perf['excess_return'].columns.tolist() == ['strategy']
+
+
+@pytest.mark.stg_idx_prep
+def test_rolling_max_drawdown_is_the_max_drawdown_within_each_window() -> None:
+    """Rolling max drawdown MUST be the max drawdown of the window's NAVs, with the peak inside the window."""
+    nav = pd.DataFrame(
+        {'asset': [1.0, 2.0, 1.0, 1.5, 1.2, 1.6, 0.8]},
+        index=[f'2024010{i}' for i in range(1, 8)],
+    )
+
+    max_drawdown = calculate_rolling_performance(nav, window_size=2, trading_days=242)['max_drawdown']['asset']
+
+    # Windows of 2 returns (3 NAVs): [1, 2, 1], [2, 1, 1.5], [1, 1.5, 1.2], [1.5, 1.2, 1.6], [1.2, 1.6, 0.8]
+    assert max_drawdown.iloc[:2].isna().all()
+    assert max_drawdown.iloc[2:].tolist() == pytest.approx([-0.5, -0.5, -0.2, -0.2, -0.5])
+
+    nav_wide_df = _make_nav_wide_df(periods=90)
+    nav_wide_df.iloc[40, 1] = np.nan
+    for window_size in (1, 10, 29, 89):
+        max_drawdown = calculate_rolling_performance(nav_wide_df, window_size=window_size, trading_days=242)[
+            'max_drawdown'
+        ]
+        for end in range(window_size, len(nav_wide_df)):
+            window_nav = nav_wide_df.iloc[end - window_size : end + 1]
+            expected = window_nav.div(window_nav.cummax()).sub(1).min(skipna=False)
+            pd.testing.assert_series_equal(max_drawdown.iloc[end], expected, check_names=False)
+
+
+@pytest.mark.stg_idx_prep
+def test_rolling_sharpe_is_nan_for_constant_nav() -> None:
+    nav = pd.DataFrame({'asset': [1.0] * 10}, index=[f'2024010{i}' for i in range(10)])
+
+    sharpe = calculate_rolling_performance(nav, window_size=5, trading_days=242)['sharpe']['asset']
+
+    assert sharpe.isna().all()
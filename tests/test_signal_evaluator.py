@@ -0,0 +1,76 @@
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.signal_evaluator import (  # noqa: E402
+    calculate_signal_positions,
+    evaluate_signals,
+    summarize_position_returns,
+)
+
+
+@pytest.mark.style_prep
+def test_summarize_position_returns_ignores_flat_and_missing_rows() -> None:
+    positions = np.array([[1.0], [-1.0], [0.0], [1.0]])
+    fwd_returns = np.array([[0.02], [0.01], [0.05], [np.nan]])
+
+    stats = summarize_position_returns(positions, fwd_returns)
+
+    assert stats['n_signals'][0, 0] == 2
+    assert stats['hit_rate'][0, 0] == pytest.approx(0.5)
+    assert stats['mean_return'][0, 0] == pytest.approx(0.005)
+
+
+@pytest.mark.style_prep
+def test_signal_labels_map_to_pair_positions() -> None:
+    signal_wide_df = pd.DataFrame({'s': ['成长', '价值', '中性', None]}, index=['d1', 'd2', 'd3', 'd4'])
+
+    position_df = calculate_signal_positions(signal_wide_df, {'s': ('成长', '价值')})
+
+    assert position_df['s'].iloc[:3].tolist() == [1.0, -1.0, 0.0]
+    assert np.isnan(position_df['s'].iloc[3])
+
+
+@pytest.mark.style_prep
+def test_evaluate_signals_matches_hand_computed_pair_pnl() -> None:
+    dates = ['20240102', '20240103', '20240104', '20240105', '20240108']
+    leg_price_df = pd.DataFrame(
+        {
+            '成长': [100.0, 110.0, 99.0, 99.0, 108.9],
+            '价值': [100.0, 100.0, 100.0, 110.0, 110.0],
+        },
+        index=dates,
+    )
+    # Sparse signals are carried onto later trading dates until the next observation.
+    signal_wide_df = pd.DataFrame(
+        {'成长价值': ['成长', '价值'], '反向': ['价值', '中性']},
+        index=['20240102', '20240104'],
+    )
+    signal_pairs = {'成长价值': ('成长', '价值'), '反向': ('成长', '价值')}
+
+    stats_df, summary_df, cum_pnl_df = evaluate_signals(
+        signal_wide_df=signal_wide_df,
+        signal_pairs=signal_pairs,
+        leg_price_df=leg_price_df,
+        horizon_sizes={'h1': 1},
+        trading_days=4,
+    )
+
+    # Pair daily returns (成长 - 价值): [nan, 0.10, -0.10, -0.10, 0.10]; positions [1, 1, -1, -1, -1].
+    assert cum_pnl_df['成长价值'].tolist() == pytest.approx([np.nan, 0.10, 0.0, 0.10, 0.0], nan_ok=True)
+
+    row = stats_df.query('signal == "成长价值"').iloc[0]
+    assert row['n_signals'] == 4
+    assert row['hit_rate'] == pytest.approx(0.5)
+
+    assert summary_df.loc['成长价值', 'turnover'] == pytest.approx(2 / 4 * 4)
+    assert summary_df.loc['反向', 'active_ratio'] == pytest.approx(2 / 5)
+    assert summary_df.loc['反向', 'cum_pnl'] == pytest.approx(0.0)
@@ -0,0 +1,113 @@
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data_preparation.data_processor import append_rolling_quantile_column  # noqa: E402
+from data_preparation.signal_sweep import (  # noqa: E402
+    build_sweep_input,
+    calculate_rolling_quantile_bands,
+    run_signal_sweep,
+)
+from utils import TradeDtType  # noqa: E402
+
+
+def _make_sweep_frames(periods: int = 160):
+    rng = np.random.default_rng(3)
+    index = pd.date_range('2022-01-03', periods=periods, freq='B').strftime('%Y%m%d')
+    target = pd.Series(np.cumsum(rng.normal(size=periods)), index=index)
+    prices = pd.DataFrame(
+        np.cumprod(1 + rng.normal(0, 0.01, size=(periods, 2)), axis=0),
+        index=index,
+        columns=['long', 'short'],
+    )
+    return target, prices
+
+
+@pytest.mark.style_prep
+def test_rolling_quantile_bands_match_rolling_apply() -> None:
+    target, _ = _make_sweep_frames()
+    target.iloc[50] = np.nan
+
+    bands = calculate_rolling_quantile_bands(target.to_numpy(), window_size=20, quantiles=[90, 10])
+
+    for col_idx, quantile in enumerate([90, 10]):
+        expected = append_rolling_quantile_column(
+            df=pd.DataFrame({'x': target}),
+            window_name='test',
+            window_size=20,
+            rolling_quantile_col='q',
+            quantile=quantile,
+            dropna=False,
+        )['q']
+        np.testing.assert_allclose(bands[:, col_idx], expected.to_numpy(), equal_nan=True)
+
+
+@pytest.mark.style_prep
+def test_sweep_grid_point_matches_np_select_signal() -> None:
+    target, prices = _make_sweep_frames()
+    trend = target.rolling(5).mean()
+    sweep_input_df = build_sweep_input(
+        target=target,
+        pair_price_df=prices,
+        horizon_sizes={'h5': 5},
+        upper_gate=target < trend,
+        lower_gate=target > trend,
+    )
+    sweep_config = {
+        'TEST': {
+            'KIND': 'quantile_band',
+            'DT_TYPE': TradeDtType.STOCK_MKT,
+            'PAIR': ('long', 'short'),
+            'UPPER_SIGNAL': 'long',
+            'WINDOW_NAMES': ('一月',),
+            'QUANTILE_CEILINGS': (80, 90),
+            'QUANTILE_FLOORS': (10, 20),
+        }
+    }
+
+    result_df = run_signal_sweep({'TEST': sweep_input_df}, sweep_config=sweep_config, max_workers=1)
+    assert len(result_df) == 4
+
+    bands = calculate_rolling_quantile_bands(target.to_numpy(), window_size=20, quantiles=[90, 20])
+    positions = np.select(
+        [(target >= bands[:, 0]) & (target < trend), (target <= bands[:, 1]) & (target > trend)],
+        [1, -1],
+        default=0,
+    )
+    fwd = (prices.shift(-5) / prices - 1).pipe(lambda df: df['long'] - df['short'])
+    pnl = pd.Series(positions, index=target.index) * fwd
+    active = (positions != 0) & fwd.notna()
+
+    row = result_df.query('quantile_ceiling == 90 and quantile_floor == 20').iloc[0]
+    assert row['n_signals'] == active.sum()
+    assert row['hit_rate'] == pytest.approx((pnl[active] > 0).mean())
+    assert row['mean_return'] == pytest.approx(pnl[active].mean())
+
+
+@pytest.mark.style_prep
+def test_parallel_sweep_matches_in_process_sweep() -> None:
+    target, prices = _make_sweep_frames()
+    sweep_config = {
+        'TEST': {
+            'KIND': 'mean_cross',
+            'DT_TYPE': TradeDtType.FUND_MKT,
+            'PAIR': ('long', 'short'),
+            'UPPER_SIGNAL': 'short',
+            'WINDOW_NAMES': ('两周', '一月'),
+        }
+    }
+    sweep_inputs = {'TEST': build_sweep_input(target, prices, horizon_sizes={'h1': 1, 'h10': 10})}
+
+    serial_df = run_signal_sweep(sweep_inputs, sweep_config=sweep_config, max_workers=1)
+    parallel_df = run_signal_sweep(sweep_inputs, sweep_config=sweep_config, max_workers=2)
+
+    pd.testing.assert_frame_equal(serial_df, parallel_df)
+    assert serial_df['n_signals'].gt(0).all()
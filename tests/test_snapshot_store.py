@@ -0,0 +1,126 @@
+import os
+import pathlib
+import sys
+
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config  # noqa: E402
+from data_preparation.data_fetcher import (  # noqa: E402
+    get_snapshot_content_hash,
+    get_snapshot_version,
+    select_date_range,
+)
+from data_preparation.snapshot_store import (  # noqa: E402
+    SNAPSHOT_ID_ENV,
+    SNAPSHOT_POINTER,
+    SnapshotWatcher,
+    pinned_snapshot,
+    publish_snapshot,
+    read_current_snapshot_id,
+)
+
+TABLE_NAME = "FINANCIAL_FACTORS_BACKTEST_NAV"
+CSV_NAME = "versioned_backtest_nav.csv"
+
+
+@pytest.fixture
+def snapshot_dirs(tmp_path, monkeypatch):
+    root = tmp_path / "csv"
+    source = tmp_path / "incoming"
+    root.mkdir()
+    source.mkdir()
+    monkeypatch.setattr(config, "CSV_DATA_DIR", str(root))
+    monkeypatch.setattr(config, "CSV_FILE_MAPPING", {TABLE_NAME: CSV_NAME})
+    monkeypatch.delenv(SNAPSHOT_ID_ENV, raising=False)
+    return root, source
+
+
+def _write_nav(path: pathlib.Path, last_nav: float) -> None:
+    path.write_text(
+        f"交易日期,中性股息股票池,中证红利全收益\n20250102,1.02,1.0\n20250103,{last_nav},1.0\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.mark.schema
+def test_readers_switch_to_a_published_version(snapshot_dirs) -> None:
+    root, source = snapshot_dirs
+    _write_nav(source / CSV_NAME, 1.03)
+    first = publish_snapshot(str(source))
+
+    assert (root / SNAPSHOT_POINTER).read_text(encoding="utf-8") == first
+    assert get_snapshot_version(TABLE_NAME).startswith(f"{first}:")
+    assert select_date_range(TABLE_NAME, "99991231")["中性股息股票池"].tolist() == [1.03, 1.02]
+    first_hash = get_snapshot_content_hash(TABLE_NAME)
+
+    assert publish_snapshot(str(source)) == first
+    assert os.listdir(root / "versions") == [first]
+
+    _write_nav(source / CSV_NAME, 1.05)
+    second = publish_snapshot(str(source))
+    assert second != first
+    assert select_date_range(TABLE_NAME, "99991231")["中性股息股票池"].tolist() == [1.05, 1.02]
+    assert get_snapshot_content_hash(TABLE_NAME) not in ("", first_hash)
+
+    # Source edits reach readers only through a publish.
+    _write_nav(source / CSV_NAME, 9.99)
+    assert select_date_range(TABLE_NAME, "99991231")["中性股息股票池"].tolist() == [1.05, 1.02]
+
+
+@pytest.mark.schema
+def test_a_pinned_run_keeps_reading_its_version_across_a_switch(snapshot_dirs) -> None:
+    _, source = snapshot_dirs
+    _write_nav(source / CSV_NAME, 1.03)
+    first = publish_snapshot(str(source))
+
+    with pinned_snapshot() as pinned_id:
+        assert pinned_id == first
+        before = select_date_range(TABLE_NAME, "99991231")["中性股息股票池"].tolist()
+        _write_nav(source / CSV_NAME, 1.05)
+        second = publish_snapshot(str(source))
+        assert read_current_snapshot_id() == first
+        assert get_snapshot_version(TABLE_NAME).startswith(f"{first}:")
+        assert select_date_range(TABLE_NAME, "99991231")["中性股息股票池"].tolist() == before
+
+    assert read_current_snapshot_id() == second
+    assert select_date_range(TABLE_NAME, "99991231")["中性股息股票池"].tolist() == [1.05, 1.02]
+
+
+@pytest.mark.schema
+def test_failed_warmup_keeps_the_current_version(snapshot_dirs) -> None:
+    root, source = snapshot_dirs
+    _write_nav(source / CSV_NAME, 1.03)
+    first = publish_snapshot(str(source))
+    _write_nav(source / CSV_NAME, 1.05)
+
+    def failing_warm(snapshot_id: str) -> None:
+        assert snapshot_id != first
+        raise ValueError("page failed on the new snapshot")
+
+    with pytest.raises(ValueError):
+        publish_snapshot(str(source), warm=failing_warm)
+    assert read_current_snapshot_id() == first
+    assert os.listdir(root / "versions") == [first]
+
+
+@pytest.mark.schema
+def test_watcher_publishes_once_files_settle_and_prunes_old_versions(snapshot_dirs) -> None:
+    root, source = snapshot_dirs
+    warmed = []
+    watcher = SnapshotWatcher(str(source), settle_seconds=0, warm=warmed.append, keep=2)
+
+    published = []
+    for last_nav in (1.03, 1.04, 1.05):
+        _write_nav(source / CSV_NAME, last_nav)
+        assert watcher.poll() is None  # changed since the last poll: wait for it to settle
+        published.append(watcher.poll())
+        assert watcher.poll() is None  # already published
+
+    assert warmed == published
+    assert read_current_snapshot_id() == published[-1]
+    assert sorted(os.listdir(root / "versions")) == sorted(published[1:])
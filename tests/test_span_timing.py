@@ -0,0 +1,66 @@
+import json
+import pathlib
+import sys
+
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import span_timing  # noqa: E402
+from span_timing import SPAN_LOG_PATH_ENV, get_span_stats, reset_span_stats, span_timer, timed_span  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _clean_span_stats():
+    reset_span_stats()
+    yield
+    reset_span_stats()
+
+
+def test_nested_spans_record_call_tree_paths() -> None:
+    @span_timer
+    def prepare_something():
+        with timed_span('inner'):
+            return 1
+
+    with timed_span('root'):
+        prepare_something()
+        prepare_something()
+
+    stats_df = get_span_stats().set_index('span')
+    assert stats_df.index.tolist() == ['root', 'root/prepare_something', 'root/prepare_something/inner']
+    assert stats_df['depth'].tolist() == [1, 2, 3]
+    assert stats_df.loc['root/prepare_something', 'count'] == 2
+    assert stats_df.loc['root', 'total'] >= stats_df.loc['root/prepare_something', 'total']
+
+
+def test_span_percentiles_aggregate_recorded_durations() -> None:
+    for seconds in [0.1, 0.2, 0.3, 0.4, 1.0]:
+        span_timing._record_span('fetch:A_IDX_VAL', seconds)
+
+    row = get_span_stats().iloc[0]
+    assert row['count'] == 5
+    assert row['p50'] == pytest.approx(0.3)
+    assert row['p95'] == pytest.approx(0.88)
+    assert row['last'] == pytest.approx(1.0)
+    assert row['total'] == pytest.approx(2.0)
+
+
+def test_root_span_appends_json_lines_when_log_path_set(tmp_path, monkeypatch) -> None:
+    log_path = tmp_path / 'spans.jsonl'
+    monkeypatch.setenv(SPAN_LOG_PATH_ENV, str(log_path))
+
+    with timed_span('app_rerun'):
+        with timed_span('fetch:EDB'):
+            pass
+    with pytest.raises(ValueError):
+        with timed_span('app_rerun'):
+            raise ValueError('boom')
+
+    events = [json.loads(line) for line in log_path.read_text(encoding='utf-8').splitlines()]
+    assert [event['span'] for event in events] == ['app_rerun/fetch:EDB', 'app_rerun', 'app_rerun']
+    assert events[0]['depth'] == 2
+    assert all(event['seconds'] >= 0 for event in events)
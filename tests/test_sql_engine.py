@@ -0,0 +1,77 @@
+import pathlib
+import sys
+
+import pandas as pd
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config, param_cls  # noqa: E402
+from data_preparation.data_fetcher import get_data_source  # noqa: E402
+from data_preparation.sql_engine import (  # noqa: E402
+    SnapshotSqlEngine,
+    SqlDataSource,
+    expand_in_placeholders,
+)
+
+
+@pytest.fixture(scope="module")
+def sql_engine():
+    engine = SnapshotSqlEngine()
+    yield engine
+    engine.close()
+
+
+def _comparable(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    df = df[columns].astype({col: str for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+    return df.sort_values(columns).reset_index(drop=True)
+
+
+@pytest.mark.schema
+@pytest.mark.parametrize("table_name", ["CN_BOND_YIELD", "A_IDX_VAL", "EDB", "SHIBOR_PRICES"])
+def test_sql_templates_match_csv_data_source(sql_engine, table_name: str) -> None:
+    """Running a table's sql_template over the loaded snapshot returns the rows CSVDataSource filters out."""
+    latest_date = "99991231"
+    csv_df = get_data_source().fetch_table(latest_date=latest_date, table_name=table_name)
+    sql_df = SqlDataSource(sql_engine).fetch_table(latest_date=latest_date, table_name=table_name)
+
+    columns = list(csv_df.columns)
+    assert set(sql_df.columns) == set(columns)
+    assert sql_df[columns].dtypes.astype(str).tolist() == csv_df.dtypes.astype(str).tolist()
+    pd.testing.assert_frame_equal(_comparable(sql_df, columns), _comparable(csv_df, columns))
+
+
+@pytest.mark.schema
+def test_sql_index_price_template_matches_csv_data_source(sql_engine) -> None:
+    wind_config = param_cls.WindListedSecParam(
+        wind_codes=config.STG_IDX_CODES + config.BENCH_IDX_CODES,
+        start_date=config.START_DT,
+        sql_param=param_cls.SqlParam(sql_name=config.IDX_PRICE_SQL_NAME),
+    )
+    csv_df = get_data_source().fetch_index_data(latest_date="99991231", _config=wind_config)
+    sql_df = SqlDataSource(sql_engine).fetch_index_data(latest_date="99991231", _config=wind_config)
+
+    columns = list(csv_df.columns)
+    assert sql_df["交易日期"].tolist() == csv_df["交易日期"].tolist()
+    pd.testing.assert_frame_equal(_comparable(sql_df, columns), _comparable(csv_df, columns))
+
+
+@pytest.mark.schema
+def test_in_lists_are_bound_parameters_and_use_the_index(sql_engine) -> None:
+    sql, params = expand_in_placeholders(
+        "SELECT * FROM wind.AIndexEODPrices WHERE S_INFO_WINDCODE IN ({}) AND TRADE_DT BETWEEN :start_date AND :end_date",
+        (("000300.SH", "x') OR 1=1 --"),),
+    )
+    params.update({"start_date": "00000000", "end_date": "99991231"})
+
+    df = sql_engine.query(sql, params)
+    assert set(df["S_INFO_WINDCODE"]) <= {"000300.SH"}
+
+    plan = sql_engine.query(f"EXPLAIN QUERY PLAN {sql}", params)
+    assert plan["detail"].str.contains("USING INDEX").any()
+
+    with pytest.raises(ValueError):
+        expand_in_placeholders("SELECT 1 WHERE 1 IN ({}) AND 2 IN ({})", (("a",),))
@@ -0,0 +1,77 @@
+import json
+import pathlib
+import sys
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from visualization.static_render import capture_page_outputs, render_dashboard  # noqa: E402
+from visualization.static_view import STATIC_DIR_ENV, STATIC_MANIFEST, render_static_page  # noqa: E402
+
+
+@pytest.mark.stg_idx_prep
+def test_render_dashboard_writes_page_artifacts_and_manifest(tmp_path) -> None:
+    manifest = render_dashboard(str(tmp_path), pages=["策略指数"], max_workers=1)
+
+    assert json.loads((tmp_path / STATIC_MANIFEST).read_text(encoding="utf-8")) == manifest
+    entry = manifest["pages"]["策略指数"]
+    page_dir = tmp_path / entry["dir"]
+    charts = [item for item in entry["items"] if item["kind"] == "chart"]
+    assert charts
+    for item in charts:
+        spec = json.loads((page_dir / item["file"]).read_text(encoding="utf-8"))
+        assert "$schema" in spec
+    assert "vegaEmbed" in (page_dir / "index.html").read_text(encoding="utf-8")
+    assert entry["dir"] in (tmp_path / "index.html").read_text(encoding="utf-8")
+
+    orphan_dir = tmp_path / "stg_idx-0123abcd"  # left behind by an interrupted render
+    orphan_dir.mkdir()
+    rerendered = render_dashboard(str(tmp_path), pages=["策略指数"], max_workers=1)
+    assert rerendered["pages"]["策略指数"]["dir"] != entry["dir"]
+    assert not page_dir.exists()
+    assert not orphan_dir.exists()
+
+
+@pytest.mark.stg_idx_prep
+def test_render_dashboard_refuses_a_directory_with_other_content(tmp_path) -> None:
+    (tmp_path / "csv" / "versions").mkdir(parents=True)
+    (tmp_path / "keepme").mkdir()
+    with pytest.raises(ValueError):
+        render_dashboard(str(tmp_path), pages=["策略指数"], max_workers=1)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["csv", "keepme"]
+    assert (tmp_path / "csv" / "versions").is_dir()
+
+
+@pytest.mark.stg_idx_prep
+def test_static_view_falls_back_to_live_page_on_changed_snapshots(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv(STATIC_DIR_ENV, str(tmp_path))
+    assert not render_static_page("策略指数")
+
+    manifest = {
+        "pages": {
+            "策略指数": {"dir": "stg_idx-00000000", "generated_at": "", "snapshots": {"A_IDX_PRICE": "stale"}, "items": []}
+        }
+    }
+    (tmp_path / STATIC_MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    assert not render_static_page("策略指数")
+
+
+@pytest.mark.stg_idx_prep
+def test_captured_outputs_keep_page_texts_and_warnings() -> None:
+    with capture_page_outputs() as outputs:
+        st.subheader("回测净值")
+        st.warning("未读取到回测净值数据")
+        st.write("【核心思路】", pd.DataFrame({"a": [1]}))
+        st.caption("入池数量：60")
+    assert [kind for kind, _ in outputs] == ["subheader", "text", "text", "table", "text"]
+    assert [value for kind, value in outputs if kind == "text"] == [
+        ("warning", "未读取到回测净值数据"),
+        ("write", "【核心思路】"),
+        ("caption", "入池数量：60"),
+    ]
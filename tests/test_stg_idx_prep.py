@@ -12,7 +12,11 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import config, param_cls  # noqa: E402
-from data_preparation.data_analyzer import calculate_grouped_return  # noqa: E402
+from data_preparation.data_analyzer import (  # noqa: E402
+    Period,
+    calculate_grouped_return,
+    get_1st_trade_dt_of_period,
+)
 from data_preparation.data_fetcher import INDEX_PRICE_SCHEMA, fetch_index_data_from_local  # noqa: E402
 from data_preparation.data_processor import (  # noqa: E402
     convert_price_ts_into_nav_ts,
@@ -32,6 +36,18 @@ def _load_stg_idx_raw_prices(latest_date: str) -> tuple[pd.DataFrame, param_cls.
     return raw_long_df, data_col_config
 
 
+@pytest.mark.stg_idx_prep
+@pytest.mark.parametrize(("period_name", "period_format"), [("week", "%Y%W"), ("month", "%Y%m"), ("year", "%Y")])
+def test_first_trade_dt_of_period_matches_strftime_periods(period_name: str, period_format: str) -> None:
+    """Integer period keys MUST pick the same period start as grouping on strftime labels."""
+    trade_dt = pd.bdate_range("2019-12-20", "2025-01-10").strftime(config.WIND_DT_FORMAT).tolist()
+    labels = [datetime.strptime(dt, config.WIND_DT_FORMAT).strftime(period_format) for dt in trade_dt]
+
+    for end_dt in trade_dt[::7]:
+        expected = trade_dt[labels.index(labels[trade_dt.index(end_dt)])]
+        assert get_1st_trade_dt_of_period(end_dt, trade_dt, Period(period_name=period_name)) == expected
+
+
 @pytest.mark.schema
 @pytest.mark.stg_idx_prep
 def test_stg_idx_loader_columns_from_canonical_index_price_schema() -> None:
@@ -58,7 +74,7 @@ def test_stg_idx_grouped_return_basic_invariants() -> None:
 
     assert not raw_long_df.empty
 
-    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique())
+    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique().tolist())
 
     # Use a simple "last N dates" window that mirrors the intent of the
     # stg_idx RET_BAR slider without depending on Streamlit helpers.
@@ -68,7 +84,7 @@ def test_stg_idx_grouped_return_basic_invariants() -> None:
     start_dt = trade_dt[start_idx]
     custom_dt = (start_dt, end_dt)
 
-    grouped_ret_df = calculate_grouped_return(raw_long_df, latest_date, custom_dt, trade_dt, data_col_config)
+    grouped_ret_df = calculate_grouped_return(raw_long_df, int(latest_date), custom_dt, trade_dt, data_col_config)
 
     assert not grouped_ret_df.empty
 
@@ -93,7 +109,7 @@ def test_stg_idx_nav_wide_df_basic_invariants() -> None:
 
     assert not raw_long_df.empty
 
-    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique())
+    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique().tolist())
     slider_config = param_cls.DtSliderParam(
         name=config.CUSTOM_PERIOD_SLIDER_NAME,
         start_dt=config.START_DT,
@@ -134,7 +150,7 @@ def test_stg_idx_excess_correlation_basic_invariants() -> None:
 
     assert not raw_long_df.empty
 
-    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique())
+    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique().tolist())
 
     wide_price_df = reshape_long_df_into_wide_form(
         raw_long_df,
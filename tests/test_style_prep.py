@@ -1,5 +1,9 @@
+import os
 import pathlib
+import subprocess
 import sys
+import threading
+import time
 
 import pandas as pd
 import pytest
@@ -16,12 +20,16 @@ from data_preparation.data_fetcher import (  # noqa: E402
     fetch_index_data_from_local,
 )
 from data_preparation.data_processor import append_rolling_mean_column, apply_signal_from_conditions, reshape_long_df_into_wide_form  # noqa: E402
-from visualization import data_visualizer  # noqa: E402
+from utils import SQL_COL_ALIAS_ARTIFACT, load_sql_col_aliases, to_date_keys  # noqa: E402
+from visualization import data_visualizer, pages  # noqa: E402
 from visualization.style import (  # noqa: E402
+    get_index_erp_gates,
+    get_style_focus_gates,
     prepare_big_small_momentum_data,
     prepare_housing_invest_data,
     prepare_index_erp_data,
     prepare_index_turnover_data,
+    prepare_rate_indicator_store,
     prepare_shibor_prices_data,
     prepare_style_focus_data,
     prepare_term_spread_data,
@@ -622,7 +630,7 @@ def test_housing_invest_style_draw_helper_smoke():
 @pytest.mark.style_prep
 def test_prepare_bar_line_with_signal_data_respects_existing_signal_column():
     """prepare_bar_line_with_signal_data SHOULD NOT overwrite an existing signal column."""
-    index = pd.date_range(start='2024-01-01', periods=5, freq='D').strftime('%Y%m%d')
+    index = to_date_keys(pd.date_range(start='2024-01-01', periods=5, freq='D').strftime('%Y%m%d'))
     df = pd.DataFrame(
         {
             'TRADE_DT': index,
@@ -663,7 +671,7 @@ def test_prepare_bar_line_with_signal_data_respects_existing_signal_column():
 @pytest.mark.style_prep
 def test_prepare_bar_line_with_signal_data_computes_signal_when_missing():
     """prepare_bar_line_with_signal_data SHOULD compute signal when not present."""
-    index = pd.date_range(start='2024-01-01', periods=3, freq='D').strftime('%Y%m%d')
+    index = to_date_keys(pd.date_range(start='2024-01-01', periods=3, freq='D').strftime('%Y%m%d'))
     df = pd.DataFrame(
         {
             'TRADE_DT': index,
@@ -705,7 +713,7 @@ def test_prepare_bar_line_with_signal_data_computes_signal_when_missing():
 @pytest.mark.style_prep
 def test_prepare_bar_line_with_signal_data_converts_to_pct_when_flag_set():
     """prepare_bar_line_with_signal_data SHOULD divide numeric columns by 100 when isConvertedToPct is True."""
-    index = pd.date_range(start='2024-01-01', periods=3, freq='D').strftime('%Y%m%d')
+    index = to_date_keys(pd.date_range(start='2024-01-01', periods=3, freq='D').strftime('%Y%m%d'))
     df = pd.DataFrame(
         {
             'TRADE_DT': index,
@@ -738,7 +746,7 @@ def test_prepare_bar_line_with_signal_data_converts_to_pct_when_flag_set():
 
     result = data_visualizer.prepare_bar_line_with_signal_data(dt_indexed_df=df, config=chart_config)
 
-    # TRADE_DT should remain unchanged (string index -> column).
+    # TRADE_DT keys should remain unchanged (index -> column), only float values are scaled.
     assert result['TRADE_DT'].tolist() == list(index)
 
     # Bar and line Y columns should be divided by 100.
@@ -753,7 +761,7 @@ def test_prepare_bar_line_with_signal_data_converts_to_pct_when_flag_set():
 @pytest.mark.style_prep
 def test_draw_bar_line_chart_with_highlighted_signal_respects_isLineDrawn():
     """draw_bar_line_chart_with_highlighted_signal SHOULD honor isLineDrawn when line_param is present."""
-    index = pd.date_range(start='2024-01-01', periods=3, freq='D').strftime('%Y%m%d')
+    index = to_date_keys(pd.date_range(start='2024-01-01', periods=3, freq='D').strftime('%Y%m%d'))
     df = pd.DataFrame(
         {
             'TRADE_DT': index,
@@ -817,7 +825,7 @@ def test_draw_bar_line_chart_with_highlighted_signal_respects_isLineDrawn():
 @pytest.mark.style_prep
 def test_get_custom_dt_with_slider_and_prepare_bar_line_with_signal_data_respects_window():
     """Slider default window SHOULD match DtSliderParam offsets and be used by prepare_bar_line_with_signal_data."""
-    index = pd.date_range(start='2024-01-01', periods=10, freq='D').strftime('%Y%m%d')
+    index = to_date_keys(pd.date_range(start='2024-01-01', periods=10, freq='D').strftime('%Y%m%d'))
     df = pd.DataFrame(
         {
             'TRADE_DT': index,
@@ -858,7 +866,7 @@ def test_get_custom_dt_with_slider_and_prepare_bar_line_with_signal_data_respect
 
     # Monkeypatch st.select_slider so that get_custom_dt_with_slider returns a deterministic window.
     trade_dt = df.index
-    selected_dt = [dt for dt in trade_dt if dt >= dt_slider_param.start_dt]
+    selected_dt = [dt for dt in trade_dt if dt >= int(dt_slider_param.start_dt)]
     expected_window = (
         selected_dt[-dt_slider_param.default_start_offset],
         selected_dt[-dt_slider_param.default_end_offset],
@@ -1288,7 +1296,7 @@ def test_prepare_index_erp_data_basic_invariants():
 
     # ERP frame must contain ERP value, rolling mean, and quantile bands
     erp_col = style_config.INDEX_ERP_CONFIG["ERP_COL"]
-    mean_col = "近一月均值"
+    mean_col = style_config.INDEX_ERP_CONFIG["MEAN_1M_COL"]
     ceil_col = style_config.INDEX_ERP_CONFIG["QUANTILE_CEILING_COL"]
     floor_col = style_config.INDEX_ERP_CONFIG["QUANTILE_FLOOR_COL"]
     for col in (erp_col, mean_col, ceil_col, floor_col):
@@ -1301,6 +1309,15 @@ def test_prepare_index_erp_data_basic_invariants():
         assert len(cond) == len(wide_erp_df)
         assert cond.dtype == bool
 
+    # The signal sweep reuses the same gates, so the page conditions must be quantile band & gate
+    upper_gate, lower_gate = get_index_erp_gates(wide_erp_df)
+    pd.testing.assert_series_equal(
+        erp_conditions[0], (wide_erp_df[erp_col] >= wide_erp_df[ceil_col]) & upper_gate, check_names=False
+    )
+    pd.testing.assert_series_equal(
+        erp_conditions[1], (wide_erp_df[erp_col] <= wide_erp_df[floor_col]) & lower_gate, check_names=False
+    )
+
 
 @pytest.mark.style_prep
 def test_index_erp_bar_line_pipeline_basic_invariants():
@@ -1525,6 +1542,12 @@ def test_prepare_style_focus_data_basic_invariants():
     }
     assert signal_values.issubset(expected)
 
+    # The signal sweep reuses the same gates: a signal day must pass its gate
+    upper_gate, lower_gate = get_style_focus_gates(style_focus_df)
+    signal = style_focus_df[style_config.STYLE_FOCUS_CONFIG["SIGNAL_COL"]]
+    assert upper_gate[signal == style_config.STYLE_FOCUS_CHART_PARAM.bar_param.false_signal].all()
+    assert lower_gate[signal == style_config.STYLE_FOCUS_CHART_PARAM.bar_param.true_signal].all()
+
 
 @pytest.mark.style_prep
 def test_style_focus_style_chart_config_matches_bar_line_param():
@@ -1988,3 +2011,126 @@ def test_housing_invest_bar_line_pipeline_basic_invariants():
         style_config.HOUSING_INVEST_CONFIG["FALSE_SIGNAL"],
     }
     assert signal_values.issubset(expected)
+
+
+@pytest.mark.style_prep
+def test_rate_indicator_store_matches_per_tab_signal_assignment():
+    """Shared ERP/term-spread store MUST match the per-tab signal assignment it replaces."""
+    latest_date = "99991231"
+    long_raw_cn_bond_yield_df = fetch_data_from_local(latest_date=latest_date, table_name="CN_BOND_YIELD")
+    long_a_idx_val_df = fetch_data_from_local(latest_date=latest_date, table_name="A_IDX_VAL")
+    name_col = style_config.DATA_COL_PARAM[param_cls.WindPortal.A_IDX_VAL].name_col
+    long_wind_all_a_idx_val_df = long_a_idx_val_df.query(f"{name_col} == '万得全A'")
+
+    store = prepare_rate_indicator_store(
+        long_raw_cn_bond_yield_df=long_raw_cn_bond_yield_df,
+        long_wind_all_a_idx_val_df=long_wind_all_a_idx_val_df,
+    )
+
+    term_spread_df, yield_curve_df, wide_raw_cn_bond_yield_df = prepare_term_spread_data(long_raw_cn_bond_yield_df)
+    pd.testing.assert_frame_equal(store["term_spread_df"], term_spread_df)
+    pd.testing.assert_frame_equal(store["yield_curve_df"], yield_curve_df.div(100).dropna())
+
+    signal_col = style_config.INDEX_ERP_CONFIG["SIGNAL_COL"]
+    for framework, chart_param in (
+        ("价值成长", style_config.INDEX_ERP_CHART_PARAM),
+        ("大小盘", style_config.INDEX_ERP_2_CHART_PARAM),
+    ):
+        wide_erp_df, erp_conditions = prepare_index_erp_data(
+            long_wind_all_a_idx_val_df=long_wind_all_a_idx_val_df,
+            wide_raw_cn_bond_yield_df=wide_raw_cn_bond_yield_df,
+        )
+        expected = apply_signal_from_conditions(
+            df=wide_erp_df,
+            signal_col=signal_col,
+            conditions=erp_conditions,
+            choices=[chart_param.bar_param.true_signal, chart_param.bar_param.false_signal],
+            default=chart_param.bar_param.no_signal,
+        )
+        pd.testing.assert_frame_equal(store["erp_dfs"][framework], expected)
+
+    value_growth_signal = store["term_spread_signals"]["价值成长"]
+    big_small_signal = store["term_spread_signals"]["大小盘"]
+    assert set(value_growth_signal.unique()) <= {
+        style_config.TERM_SPREAD_CHART_PARAM.bar_param.true_signal,
+        style_config.TERM_SPREAD_CHART_PARAM.bar_param.false_signal,
+    }
+    assert big_small_signal.index.equals(term_spread_df.index)
+
+
+@pytest.mark.style_prep
+def test_style_config_import_does_not_read_sql_templates() -> None:
+    """Alias maps load on first access; importing the config must not parse templates."""
+    code = (
+        "import utils\n"
+        "def fail(*args, **kwargs):\n"
+        "    raise AssertionError('SQL templates read at import')\n"
+        "utils.load_sql_col_aliases = utils.get_wind_col_alias_with_sql_parser = fail\n"
+        "from config import style_config\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+
+
+@pytest.mark.style_prep
+def test_app_shell_imports_no_page_modules() -> None:
+    """Pages, altair and the pandas stack are imported when a page first opens, not when the app shell starts."""
+    code = (
+        "import ast, importlib, sys\n"
+        "tree = ast.parse(open('app.py', encoding='utf-8').read())\n"
+        "for node in tree.body:\n"
+        "    if isinstance(node, (ast.Import, ast.ImportFrom)):\n"
+        "        for name in [node.module] if isinstance(node, ast.ImportFrom) else [a.name for a in node.names]:\n"
+        "            importlib.import_module(name)\n"
+        "import visualization.pages\n"
+        "loaded = {'altair', 'numpy', 'pandas', 'pyarrow', 'config.style_config', 'utils'}\n"
+        "loaded |= {module for module, _ in visualization.pages.PAGES.values()}\n"
+        "assert not loaded & set(sys.modules), loaded & set(sys.modules)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+
+
+@pytest.mark.style_prep
+def test_load_page_waits_for_an_import_in_progress(tmp_path, monkeypatch) -> None:
+    """A session opening a page another session is still importing gets the finished module."""
+    (tmp_path / "slow_page.py").write_text(
+        "import time\ntime.sleep(0.5)\n\n\ndef render():\n    return 'rendered'\n", encoding="utf-8"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(pages.PAGES, "慢页面", ("slow_page", "render"))
+    monkeypatch.delitem(sys.modules, "slow_page", raising=False)
+
+    importer = threading.Thread(target=pages.load_page, args=("慢页面",))
+    importer.start()
+    while "slow_page" not in sys.modules:
+        time.sleep(0.01)
+    render = pages.load_page("慢页面")
+    importer.join()
+    assert render() == "rendered"
+    sys.modules.pop("slow_page", None)
+
+
+@pytest.mark.style_prep
+def test_col_params_match_sql_template_aliases() -> None:
+    col_alias = style_config.DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]["WIND_COL_ALIAS"]
+    val_col_param = style_config.DATA_COL_PARAM[param_cls.WindPortal.A_IDX_VAL]
+    assert val_col_param.dt_col == col_alias["TRADE_DT"]
+    assert val_col_param.name_col == col_alias["S_INFO_NAME"]
+    assert val_col_param.code_col == col_alias["S_INFO_WINDCODE"]
+    assert val_col_param.turnover_col == col_alias["TURNOVER"]
+    assert val_col_param.pe_ttm_col == col_alias["PE_TTM"]
+    yield_col_alias = style_config.TERM_SPREAD_CONFIG["WIND_COL_ALIAS"]
+    assert yield_col_alias["B_ANAL_YIELD"] == style_config.YIELD_CURVE_COL_PARAM.ytm_col
+
+
+@pytest.mark.style_prep
+def test_sql_alias_artifact_is_recompiled_when_a_template_changes(tmp_path) -> None:
+    sql_path = tmp_path / "query.sql"
+    sql_path.write_text("SELECT a.TRADE_DT AS 交易日期, CLOSE AS 收盘价 FROM t a", encoding="utf-8")
+
+    assert load_sql_col_aliases(tmp_path) == {"query.sql": {"TRADE_DT": "交易日期", "CLOSE": "收盘价"}}
+    assert (tmp_path / SQL_COL_ALIAS_ARTIFACT).exists()
+
+    sql_path.write_text("SELECT TRADE_DT AS 日期 FROM t", encoding="utf-8")
+    stat = sql_path.stat()
+    os.utime(sql_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_sql_col_aliases(tmp_path) == {"query.sql": {"TRADE_DT": "日期"}}
@@ -0,0 +1,73 @@
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config, param_cls, style_config  # noqa: E402
+from data_preparation.data_fetcher import fetch_data_from_local, read_csv_data  # noqa: E402
+from data_preparation.synthetic_snapshots import generate_snapshot_table, write_synthetic_snapshots  # noqa: E402
+from utils import DATE_KEY_DTYPE  # noqa: E402
+
+SMALL_PARAM = param_cls.SyntheticSnapshotParam(n_codes=20, n_years=2, n_stocks=50, n_quarters=6, nan_rate=0.05)
+
+
+@pytest.fixture(scope='module')
+def synthetic_dir(tmp_path_factory) -> pathlib.Path:
+    out_dir = tmp_path_factory.mktemp('synthetic_csv')
+    write_synthetic_snapshots(str(out_dir), SMALL_PARAM)
+    return out_dir
+
+
+@pytest.mark.schema
+@pytest.mark.parametrize('table_name', list(config.CSV_FILE_MAPPING))
+def test_synthetic_snapshots_pass_csv_schema(synthetic_dir, monkeypatch, table_name: str) -> None:
+    monkeypatch.setattr(config, 'CSV_DATA_DIR', str(synthetic_dir))
+
+    df = read_csv_data(table_name)
+
+    assert not df.empty
+    for col, dtype in config.CSV_DTYPE_MAPPING[table_name].items():
+        if col != '交易日期':
+            assert df[col].dtype.kind == ('f' if dtype is float else 'O'), col
+    assert df['交易日期'].dtype == DATE_KEY_DTYPE
+    assert df['交易日期'].max() == int(SMALL_PARAM.end_date)
+
+
+@pytest.mark.schema
+def test_synthetic_snapshots_keep_configured_codes_and_sizes(synthetic_dir, monkeypatch) -> None:
+    monkeypatch.setattr(config, 'CSV_DATA_DIR', str(synthetic_dir))
+
+    idx_price_df = read_csv_data('A_IDX_PRICE')
+    assert idx_price_df['证券代码'].nunique() == SMALL_PARAM.n_codes
+    assert set(config.STG_IDX_CODES + config.BENCH_IDX_CODES) <= set(idx_price_df['证券代码'])
+
+    stocks_df = read_csv_data('FINANCIAL_FACTORS_STOCKS')
+    assert len(stocks_df) == SMALL_PARAM.n_stocks * SMALL_PARAM.n_quarters
+    assert stocks_df['中性股息策略'].isin([0.0, 1.0]).all()
+
+    # Page-level filters still find their entities and stay pivot-able (one row per date x key).
+    val_df = fetch_data_from_local(latest_date=SMALL_PARAM.end_date, table_name='A_IDX_VAL')
+    wind_codes = style_config.DATA_CONFIG[param_cls.WindPortal.A_IDX_VAL]['WIND_CODE']
+    assert set(val_df['证券代码']) == set(wind_codes)
+    shibor_df = fetch_data_from_local(latest_date=SMALL_PARAM.end_date, table_name='SHIBOR_PRICES')
+    assert not shibor_df.duplicated(['交易日期', '期限']).any()
+
+
+@pytest.mark.schema
+def test_synthetic_calendar_gaps_and_nan_rate() -> None:
+    param = param_cls.SyntheticSnapshotParam(n_codes=40, n_years=4, gap_rate=0.1, nan_rate=0.2)
+    no_gap_param = param.model_copy(update={'gap_rate': 0.0})
+
+    df = generate_snapshot_table('A_IDX_PRICE', param, rng=np.random.default_rng(1))
+    no_gap_df = generate_snapshot_table('A_IDX_PRICE', no_gap_param, rng=np.random.default_rng(1))
+
+    n_dates, n_business_days = df['交易日期'].nunique(), no_gap_df['交易日期'].nunique()
+    assert n_dates / n_business_days == pytest.approx(0.9, abs=0.03)
+    assert df['收盘价'].isna().mean() == pytest.approx(0.2, abs=0.02)
+    assert df['收盘价'].dropna().gt(0).all()
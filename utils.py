@@ -1,13 +1,15 @@
 import inspect
+import json
 import os
 import re
 import sys
-import time
-from datetime import datetime
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future
 from enum import Enum
-from functools import wraps
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
@@ -59,6 +61,30 @@ def get_rolling_window_col(window_name: str, window_type: str, extra_info: str =
     return f'近{window_name}{extra_info}{window_type}'
 
 
+# NOTE 日期键
+# Trade dates are int32 yyyymmdd keys from the CSV reader on: fetched frames, wide indexes and
+# `prepare_*` outputs hold keys, so range filters and `.loc` slices compare integers on a sorted
+# index. `'%Y%m%d'` strings (config start dates, API parameters) are parsed with `to_date_keys`
+# where they enter, and keys become strings again only for display (`format_date_keys`).
+DATE_KEY_DTYPE = np.int32
+
+
+def to_date_keys(dates) -> np.ndarray:
+    """`'%Y%m%d'` strings or keys (list, Index, Series or array) -> int32 yyyymmdd keys."""
+    return np.asarray(dates, dtype=object).astype(DATE_KEY_DTYPE)
+
+
+def format_date_keys(date_keys) -> pd.Index:
+    """int32 yyyymmdd keys -> `'%Y%m%d'` strings, for chart axes and widget labels."""
+    return pd.Index(date_keys).astype(str)
+
+
+def date_keys_to_datetime64(date_keys) -> np.ndarray:
+    date_keys = np.asarray(date_keys, dtype=np.int64)
+    months = (date_keys // 10000 - 1970) * 12 + date_keys // 100 % 100 - 1
+    return months.astype('datetime64[M]').astype('datetime64[D]') + (date_keys % 100 - 1)
+
+
 def load_env():
     load_dotenv()
     # print('Environment variables loaded')
@@ -80,17 +106,42 @@ def get_cwd_file_path(dir: str, file: str):
     return Path(get_script_dir()) / dir / file
 
 
-def msg_printer(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        print(f' [INFO] || {datetime.now():%y%b%d %H:%M:%S} || {func.__name__} ||')
-        T1 = time.perf_counter()
-        res = func(*args, **kwargs)
-        T2 = time.perf_counter()
-        print(f' - {T2 - T1:.2f}s')
-        return res
-
-    return wrapper
+# NOTE 并发去重
+# Sessions that miss a cache at the same moment (e.g. right after a snapshot update) would
+# each recompute the value. `SingleFlight.do` lets the first caller for a key compute it
+# while later callers for that key wait and receive the same result (or exception).
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight computation.
+
+    Nothing is cached: once the call finishes, the next caller for the key computes again,
+    so callers keep their own cache and only route misses through `do`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict = {}
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
 
 
 def read_sql_from_template(path):
@@ -132,6 +183,95 @@ def get_wind_col_alias_with_sql_parser(path_sql):
     return column_dict
 
 
+# NOTE SQL别名预编译
+# Alias maps of every template in a SQL directory are compiled into one JSON artifact
+# next to the templates. Each entry records its template's mtime + size; a lookup
+# re-parses only when the directory's templates no longer match the artifact.
+SQL_COL_ALIAS_ARTIFACT = '.col_aliases.json'
+
+_SQL_COL_ALIASES: dict[str, tuple[dict[str, str], dict[str, dict[str, str]]]] = {}
+_SQL_COL_ALIASES_LOCK = threading.Lock()
+_SQL_COL_ALIAS_LOADS = SingleFlight()
+
+
+def _get_sql_versions(sql_dir: Path) -> dict[str, str]:
+    versions = {}
+    for path in sorted(sql_dir.glob('*.sql')):
+        stat = path.stat()
+        versions[path.name] = f'{stat.st_mtime_ns}-{stat.st_size}'
+    return versions
+
+
+def compile_sql_col_aliases(sql_dir: str | Path) -> dict[str, dict[str, str]]:
+    """Parse every `*.sql` under `sql_dir` and write the alias maps to `SQL_COL_ALIAS_ARTIFACT`.
+
+    Returns:
+        template file name -> {Wind column: alias}.
+    """
+    sql_dir = Path(sql_dir)
+    versions = _get_sql_versions(sql_dir)
+    aliases = {name: get_wind_col_alias_with_sql_parser(sql_dir / name) for name in versions}
+    artifact = {name: {'version': versions[name], 'aliases': aliases[name]} for name in versions}
+    try:
+        with open(sql_dir / SQL_COL_ALIAS_ARTIFACT, 'w', encoding='utf-8') as file:
+            json.dump(artifact, file, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f'Warning: could not write {SQL_COL_ALIAS_ARTIFACT} under {sql_dir}: {e}')
+    return aliases
+
+
+def load_sql_col_aliases(sql_dir: str | Path) -> dict[str, dict[str, str]]:
+    """Alias maps for every template under `sql_dir`, from the compiled artifact while it is current."""
+    sql_dir = Path(sql_dir)
+    versions = _get_sql_versions(sql_dir)
+    with _SQL_COL_ALIASES_LOCK:
+        cached = _SQL_COL_ALIASES.get(str(sql_dir))
+    if cached is not None and cached[0] == versions:
+        return cached[1]
+    return _SQL_COL_ALIAS_LOADS.do((str(sql_dir), tuple(versions.items())), _load_sql_col_aliases, sql_dir, versions)
+
+
+def _load_sql_col_aliases(sql_dir: Path, versions: dict[str, str]) -> dict[str, dict[str, str]]:
+    try:
+        with open(sql_dir / SQL_COL_ALIAS_ARTIFACT, encoding='utf-8') as file:
+            artifact = json.load(file)
+    except (OSError, ValueError):
+        artifact = {}
+    if {name: entry['version'] for name, entry in artifact.items()} == versions:
+        aliases = {name: entry['aliases'] for name, entry in artifact.items()}
+    else:
+        aliases = compile_sql_col_aliases(sql_dir)
+    with _SQL_COL_ALIASES_LOCK:
+        _SQL_COL_ALIASES[str(sql_dir)] = (versions, aliases)
+    return aliases
+
+
+class SqlColAlias(Mapping):
+    """Read-only {Wind column: alias} map of one template, loaded on first access.
+
+    Lets config modules declare alias maps without touching the template files at import time.
+    """
+
+    def __init__(self, sql_dir: str, sql_name: str):
+        self.sql_dir = sql_dir
+        self.sql_name = sql_name
+
+    def _aliases(self) -> dict[str, str]:
+        return load_sql_col_aliases(Path(get_script_dir()) / self.sql_dir)[self.sql_name]
+
+    def __getitem__(self, key: str) -> str:
+        return self._aliases()[key]
+
+    def __iter__(self):
+        return iter(self._aliases())
+
+    def __len__(self) -> int:
+        return len(self._aliases())
+
+    def __repr__(self) -> str:
+        return f'SqlColAlias({self.sql_dir!r}, {self.sql_name!r})'
+
+
 def divide_by_100(x):
     try:
         return x / 100
@@ -1,3 +1,5 @@
+from bisect import bisect_left
+
 import altair as alt
 import streamlit as st
 
@@ -8,11 +10,13 @@ from data_preparation.data_processor import (
     apply_signal_from_conditions,
     reshape_wide_df_into_long_form,
 )
-from utils import divide_by_100
+from span_timing import span_timer
+from utils import divide_by_100, format_date_keys
 
 
 def get_custom_dt_with_slider(trade_dt, config: param_cls.DtSliderParam):
-    selected_dt = [dt for dt in trade_dt if dt >= config.start_dt]
+    # trade_dt holds ascending date keys, so the options start at a binary-searched position.
+    selected_dt = list(trade_dt[bisect_left(trade_dt, int(config.start_dt)) :])
     return st.select_slider(
         config.name,
         options=selected_dt,
@@ -20,6 +24,7 @@ def get_custom_dt_with_slider(trade_dt, config: param_cls.DtSliderParam):
             selected_dt[-config.default_start_offset],
             selected_dt[-config.default_end_offset],
         ),
+        format_func=str,
         key=config.key,
     )
 
@@ -35,6 +40,12 @@ def get_custom_dt_with_select_slider(trade_dt, config: param_cls.SelectSliderPar
     return trade_dt[-config.default_select_offset[selected_key]]
 
 
+def _with_date_labels(df, dt_col: str):
+    """`df` with the date keys of `dt_col` as `'%Y%m%d'` strings, the labels the chart axes show."""
+    return df.assign(**{dt_col: format_date_keys(df[dt_col])})
+
+
+@span_timer
 def draw_grouped_bars(grouped_df, group_name_df, config: param_cls.BaseBarParam):
     reindex_grouped_df = grouped_df.stack().reset_index()
     reindex_grouped_df.columns = list(config.axis_names.values())
@@ -84,6 +95,7 @@ def draw_grouped_bars(grouped_df, group_name_df, config: param_cls.BaseBarParam)
     st.altair_chart(bar, theme='streamlit', use_container_width=True)
 
 
+@span_timer
 def draw_grouped_lines(wide_df, config: param_cls.IdxLineParam):
     trade_dt = wide_df.index
     if config.dt_slider_param is not None:
@@ -100,6 +112,7 @@ def draw_grouped_lines(wide_df, config: param_cls.IdxLineParam):
         config.data_col_param.price_col,
     )
     long_df.columns = list(config.axis_names.values())
+    long_df = _with_date_labels(long_df, config.axis_names['X'])
 
     # Add hover selection
     hover = alt.selection_point(
@@ -170,6 +183,7 @@ def draw_grouped_lines(wide_df, config: param_cls.IdxLineParam):
     st.altair_chart(final_chart, theme='streamlit', use_container_width=True)
 
 
+@span_timer
 def draw_heatmap(wide_df, config: param_cls.HeatmapParam):
     long_df = reshape_wide_df_into_long_form(
         wide_df.rename_axis(config.axis_names['X']),
@@ -241,6 +255,7 @@ def add_altair_bar_with_highlighted_signal(df, config: param_cls.SignalBarParam)
     else:
         signal_order = [config.false_signal, config.true_signal, config.no_signal]
 
+    df = _with_date_labels(df, config.axis_names['X'])
     return (
         alt.Chart(
             df,
@@ -285,6 +300,7 @@ def add_altair_bar_with_highlighted_signal(df, config: param_cls.SignalBarParam)
 
 
 def add_altair_line_with_stroke_dash(df, config: param_cls.LineParam):
+    df = _with_date_labels(df, config.axis_names['X'])
     if config.compared_cols is not None:
         new_df = df[[config.axis_names['X']] + config.compared_cols].melt(
             id_vars=config.axis_names['X'],
@@ -348,13 +364,16 @@ def _apply_pct_scaling_if_needed(selected_df, config: param_cls.BarLineWithSigna
     if not config.isConvertedToPct:
         return selected_df
 
-    scaled_df = selected_df.apply(divide_by_100)
+    # Date keys are integers, so only the float value columns are scaled.
+    value_cols = selected_df.columns[selected_df.dtypes == 'float64']
+    scaled_df = selected_df.assign(**{col: divide_by_100(selected_df[col]) for col in value_cols})
     config.bar_param.y_axis_format = CHART_NUM_FORMAT['pct']
     if config.line_param is not None:
         config.line_param.y_axis_format = CHART_NUM_FORMAT['pct']
     return scaled_df
 
 
+@span_timer
 def prepare_bar_line_with_signal_data(
     dt_indexed_df, config: param_cls.BarLineWithSignalParam, custom_dt: tuple | None = None
 ):
@@ -471,6 +490,7 @@ def build_bar_line_with_signal_param_for_style_chart(
     )
 
 
+@span_timer
 def draw_style_bar_line_chart_with_highlighted_signal(
     dt_indexed_df,
     style_chart_config: param_cls.StyleBarLineChartConfig,
@@ -498,18 +518,21 @@ def draw_style_bar_line_chart_with_highlighted_signal(
     draw_bar_line_chart_with_highlighted_signal(dt_indexed_df=dt_indexed_df, config=config)
 
 
+@span_timer
 def draw_bar_line_chart_with_highlighted_signal(dt_indexed_df, config: param_cls.BarLineWithSignalParam):
     selected_df = prepare_bar_line_with_signal_data(dt_indexed_df, config)
     _render_bar_line_chart_with_highlighted_signal(selected_df, config, draw_line=config.isLineDrawn)
 
 
+@span_timer
 def draw_bar_line_chart_with_highlighted_predefined_signal(dt_indexed_df, config: param_cls.BarLineWithSignalParam):
     trade_dt = dt_indexed_df.index
     if config.dt_slider_param is not None:
         custom_dt = get_custom_dt_with_slider(trade_dt=trade_dt, config=config.dt_slider_param)
         selected_df = dt_indexed_df.loc[custom_dt[0] : custom_dt[1]].reset_index()
     else:
-        selected_df = dt_indexed_df
+        # The charts read the dates from a column, as on the sliced path.
+        selected_df = dt_indexed_df.reset_index()
 
     selected_df = _apply_pct_scaling_if_needed(selected_df, config)
 
@@ -550,6 +573,7 @@ def build_bar_param_for_style_bar_chart(
     )
 
 
+@span_timer
 def draw_style_bar_chart_with_highlighted_signal(
     dt_indexed_df,
     style_chart_config: param_cls.StyleBarChartConfig,
@@ -0,0 +1,120 @@
+import os
+
+import streamlit as st
+
+from config import config
+from span_timing import SPAN_LOG_PATH_ENV, get_span_stats, reset_span_stats
+
+DEBUG_PANEL_ENV = 'ST_IDX_DEBUG'
+
+
+def is_debug_panel_enabled() -> bool:
+    return os.environ.get(DEBUG_PANEL_ENV, '') not in ('', '0') or st.query_params.get('debug') == '1'
+
+
+def render_span_timing_panel() -> None:
+    """Per-span timing (seconds) aggregated over the reruns served by this process."""
+    with st.expander('耗时统计', expanded=False):
+        span_stats_df = get_span_stats()
+        if span_stats_df.empty:
+            st.caption('暂无耗时记录')
+            return
+
+        log_path = os.environ.get(SPAN_LOG_PATH_ENV)
+        if log_path:
+            st.caption(f'明细写入：{log_path}')
+        st.dataframe(
+            span_stats_df,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                col: st.column_config.NumberColumn(col, format='%.3f') for col in ('p50', 'p95', 'last', 'total')
+            },
+        )
+        if st.button('清空耗时统计'):
+            reset_span_stats()
+            st.rerun()
+
+
+def render_memory_panel() -> None:
+    """Bytes held by the in-process result cache, per entry and per session, and by the CSV snapshots."""
+    # The data and cache modules pull in the page configs and pandas, which the app shell
+    # leaves until a page opens.
+    from data_preparation.data_fetcher import get_sorted_dataset_usage
+    from data_preparation.frame_cache import current_session_id, get_frame_cache
+
+    with st.expander('内存占用', expanded=False):
+        frame_cache = get_frame_cache()
+        stats = frame_cache.stats()
+        mib = 1024**2
+        cols = st.columns(4)
+        cols[0].metric('结果缓存 (MB)', f'{stats["bytes"] / mib:.1f}', help=f'上限 {stats["max_bytes"] / mib:.0f} MB')
+        cols[1].metric('单会话独占上限 (MB)', f'{stats["session_max_bytes"] / mib:.0f}')
+        cols[2].metric('命中 / 未命中', f'{stats["hits"]} / {stats["misses"]}')
+        cols[3].metric('淘汰次数', stats['evictions'])
+
+        mb_config = {col: st.column_config.NumberColumn(col, format='%.2f') for col in ('MB', '独占MB')}
+        entry_df = frame_cache.entry_usage()
+        if entry_df.empty:
+            st.caption('结果缓存为空')
+        else:
+            st.dataframe(
+                entry_df.assign(MB=entry_df['bytes'] / mib).drop(columns='bytes'),
+                hide_index=True,
+                use_container_width=True,
+                column_config={**mb_config, 'idle_seconds': st.column_config.NumberColumn('idle_seconds', format='%.0f')},
+            )
+
+        session_df = frame_cache.session_usage()
+        if not session_df.empty:
+            session_id = current_session_id()
+            session_df = session_df.assign(
+                session=session_df['session'].where(session_df['session'] != session_id, '当前会话'),
+                MB=session_df['bytes'] / mib,
+                独占MB=session_df['private_bytes'] / mib,
+            ).drop(columns=['bytes', 'private_bytes'])
+            st.dataframe(session_df, hide_index=True, use_container_width=True, column_config=mb_config)
+
+        dataset_df = get_sorted_dataset_usage()
+        if not dataset_df.empty:
+            st.caption(f'CSV 快照缓存：{dataset_df["bytes"].sum() / mib:.1f} MB（按表常驻，不计入上述上限）')
+            st.dataframe(
+                dataset_df.assign(MB=dataset_df['bytes'] / mib).drop(columns='bytes'),
+                hide_index=True,
+                use_container_width=True,
+                column_config=mb_config,
+            )
+        if st.button('清空结果缓存'):
+            frame_cache.clear()
+            st.rerun()
+
+
+def render_data_quality_panel() -> None:
+    """Unparsable (`invalid`) and empty (`missing`) numeric cells of the snapshots read by this process."""
+    # The data modules pull in the page configs and pandas, which the app shell leaves until a page opens.
+    import pandas as pd
+
+    from data_preparation.data_fetcher import get_validation_report
+
+    with st.expander('数据质量', expanded=False):
+        report_dfs = []
+        for table_name in config.CSV_FILE_MAPPING:
+            report_df = get_validation_report(table_name, load=False)
+            if report_df is not None:
+                report_dfs.append(report_df.assign(table=table_name))
+        if not report_dfs:
+            st.caption('尚未读取快照')
+            return
+
+        report_df = pd.concat(report_dfs, ignore_index=True)
+        dirty_df = report_df[(report_df['invalid'] > 0) | (report_df['missing'] > 0)]
+        st.caption(
+            f'已读取 {report_df["table"].nunique()} 张表，{len(dirty_df)} / {len(report_df)} 个数值列含空值或无法解析的值'
+            '（行号从 0 起，不含表头）'
+        )
+        if not dirty_df.empty:
+            st.dataframe(
+                dirty_df[['table', 'column', 'rows', 'invalid', 'missing', 'invalid_rows', 'missing_rows']],
+                hide_index=True,
+                use_container_width=True,
+            )
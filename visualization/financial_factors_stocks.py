@@ -1,13 +1,22 @@
+from bisect import bisect_left, bisect_right
+
 import numpy as np
 import pandas as pd
 import streamlit as st
 
 from config import config, financial_factors_config, param_cls
-from data_preparation.data_fetcher import fetch_data_from_local, fetch_financial_factors_stocks_from_local
-from utils import msg_printer
+from data_preparation.data_analyzer import calculate_rolling_performance
+from data_preparation.data_fetcher import (
+    fetch_data_from_local,
+    fetch_financial_factors_stocks_from_local,
+    get_snapshot_version,
+)
+from data_preparation.frame_cache import frame_cached
+from span_timing import span_timer
 from visualization.data_visualizer import (
     add_altair_bar_with_highlighted_signal,
     add_altair_line_with_stroke_dash,
+    draw_grouped_lines,
 )
 
 # format:  str, "plain", "localized", "percent", "dollar", "euro", "yen", "accounting", "compact", "scientific", "engineering", or None
@@ -102,16 +111,14 @@ def _build_column_config(cols: list[str]) -> dict[str, st.column_config.Column]:
     return column_config
 
 
-def _get_trade_dates_desc(df: pd.DataFrame) -> list[str]:
+def _get_trade_dates_desc(df: pd.DataFrame) -> list[int]:
     date_col = financial_factors_config.DATE_COL
-    raw_dates = df[date_col].astype(str).map(str.strip)
-    valid_dates = [dt for dt in raw_dates.unique().tolist() if dt and dt.isdigit()]
-    return sorted(valid_dates, reverse=True)
+    return sorted(df[date_col].unique().tolist(), reverse=True)
 
 
-def _filter_stock_pool(df: pd.DataFrame, trade_date: str, signal_col: str) -> pd.DataFrame:
+def _filter_stock_pool(df: pd.DataFrame, trade_date: int, signal_col: str) -> pd.DataFrame:
     date_col = financial_factors_config.DATE_COL
-    date_mask = df[date_col].astype(str) == str(trade_date)
+    date_mask = df[date_col] == trade_date
     signal_mask = pd.to_numeric(df[signal_col], errors='coerce') == 1
     return df.loc[date_mask & signal_mask].copy()
 
@@ -129,7 +136,6 @@ def _prepare_backtest_nav_chart_df(
     a date window so they re-base on every slider change.
     """
     df = raw_df[[BACKTEST_NAV_DATE_COL, strategy_nav_col, bench_nav_col]].copy()
-    df[BACKTEST_NAV_DATE_COL] = df[BACKTEST_NAV_DATE_COL].astype(str).str.strip()
     df[strategy_nav_col] = pd.to_numeric(df[strategy_nav_col], errors='coerce')
     df[bench_nav_col] = pd.to_numeric(df[bench_nav_col], errors='coerce')
 
@@ -143,9 +149,9 @@ def _prepare_backtest_nav_chart_df(
     return df
 
 
-def _get_backtest_nav_period_range(trade_dt: list[str], period: str) -> tuple[str, str]:
+def _get_backtest_nav_period_range(trade_dt: list[int], period: str) -> tuple[int | None, int | None]:
     if not trade_dt:
-        return '', ''
+        return None, None
 
     trade_dt = sorted(trade_dt)
     latest_dt = trade_dt[-1]
@@ -159,15 +165,12 @@ def _get_backtest_nav_period_range(trade_dt: list[str], period: str) -> tuple[st
         return trade_dt[start_idx], latest_dt
 
     if period == '2018年5月以来':
-        start_dt = '20180501'
-        eligible_dt = [dt for dt in trade_dt if dt >= start_dt]
-        return (eligible_dt[0], latest_dt) if eligible_dt else (trade_dt[0], latest_dt)
+        start_pos = bisect_left(trade_dt, 20180501)
+        return (trade_dt[start_pos], latest_dt) if start_pos < len(trade_dt) else (trade_dt[0], latest_dt)
 
     if period == '2025年':
-        year_start = '20250101'
-        year_end = '20251231'
-        eligible_dt = [dt for dt in trade_dt if year_start <= dt <= year_end]
-        return (eligible_dt[0], eligible_dt[-1]) if eligible_dt else (trade_dt[0], latest_dt)
+        start_pos, end_pos = bisect_left(trade_dt, 20250101), bisect_right(trade_dt, 20251231)
+        return (trade_dt[start_pos], trade_dt[end_pos - 1]) if start_pos < end_pos else (trade_dt[0], latest_dt)
 
     return trade_dt[0], latest_dt
 
@@ -234,6 +237,84 @@ def _calc_nav_norm_and_excess_nav(
     return strategy_norm, bench_norm, excess_nav
 
 
+@frame_cached(ttl=config.ST_CACHE_TTL)
+def _get_backtest_rolling_perf(
+    snapshot_version: str,
+    strategy_label: str,
+    bench_nav_col: str,
+    window_name: str,
+    rf_annual: float,
+    _dt_indexed_df: pd.DataFrame,
+) -> dict[str, pd.DataFrame]:
+    """Rolling metrics over the full backtest history, cached per NAV snapshot.
+
+    The frame argument is not hashed; `snapshot_version` and the column/window
+    arguments identify the result.
+    """
+    nav_wide_df = _dt_indexed_df[[strategy_label, bench_nav_col]].dropna()
+    rolling_perf = calculate_rolling_performance(
+        nav_wide_df,
+        window_size=config.TRADE_DT_COUNT[window_name],
+        trading_days=int(config.TRADE_DT_COUNT['一年']),
+        rf_annual=rf_annual,
+        bench_col=bench_nav_col,
+    )
+    rolling_perf['excess_return'] = rolling_perf['excess_return'].rename(
+        columns={strategy_label: BACKTEST_NAV_PERF_TABLE_EXCESS_LABEL}
+    )
+    return rolling_perf
+
+
+def _render_backtest_rolling_perf_chart(
+    *,
+    dt_indexed_df: pd.DataFrame,
+    strategy_label: str,
+    bench_nav_col: str,
+    custom_dt: tuple[int, int],
+    period_select_key: str,
+    rf_annual: float,
+    snapshot_version: str,
+) -> None:
+    """Render rolling Sharpe/volatility/drawdown/excess lines for the selected period."""
+    st.subheader('滚动绩效')
+
+    window_col, metric_col = st.columns(2)
+    window_name = window_col.selectbox(
+        '滚动窗口',
+        options=config.ROLLING_PERF_WINDOW_NAMES,
+        index=config.ROLLING_PERF_WINDOW_NAMES.index(config.ROLLING_PERF_DEFAULT_WINDOW),
+        key=f'{period_select_key}_ROLLING_WINDOW',
+    )
+    metric = metric_col.selectbox(
+        '滚动指标',
+        options=list(config.ROLLING_PERF_METRIC_NAMES),
+        format_func=config.ROLLING_PERF_METRIC_NAMES.get,
+        key=f'{period_select_key}_ROLLING_METRIC',
+    )
+
+    rolling_perf = _get_backtest_rolling_perf(
+        snapshot_version,
+        strategy_label,
+        bench_nav_col,
+        window_name,
+        rf_annual,
+        _dt_indexed_df=dt_indexed_df,
+    )
+    metric_df = rolling_perf[metric].loc[custom_dt[0] : custom_dt[1]].dropna(how='all')
+    if metric_df.empty:
+        st.info('当前区间无可用数据')
+        return
+
+    metric_name = config.ROLLING_PERF_METRIC_NAMES[metric]
+    line_param = param_cls.IdxLineParam(
+        axis_names={'X': BACKTEST_NAV_DATE_COL, 'LEGEND': '投资标的', 'Y': metric_name},
+        title=f'近{window_name}{metric_name}',
+        data_col_param=param_cls.WindIdxColParam(dt_col=BACKTEST_NAV_DATE_COL),
+        y_axis_format=config.CHART_NUM_FORMAT[config.ROLLING_PERF_METRIC_FORMATS[metric]],
+    )
+    draw_grouped_lines(wide_df=metric_df, config=line_param)
+
+
 def _render_backtest_nav_chart(
     *,
     raw_df: pd.DataFrame,
@@ -243,6 +324,7 @@ def _render_backtest_nav_chart(
     title: str,
     period_select_key: str,
     rf_annual: float,
+    snapshot_version: str = '',
 ) -> None:
     """Render a backtest NAV chart for one strategy vs one benchmark.
 
@@ -363,8 +445,18 @@ def _render_backtest_nav_chart(
         },
     )
 
+    _render_backtest_rolling_perf_chart(
+        dt_indexed_df=dt_indexed_df,
+        strategy_label=strategy_label,
+        bench_nav_col=bench_nav_col,
+        custom_dt=custom_dt,
+        period_select_key=period_select_key,
+        rf_annual=rf_annual,
+        snapshot_version=snapshot_version,
+    )
+
 
-def _render_strategy_stock_pool(df: pd.DataFrame, strategy_name: str, trade_dates: list[str] | None = None) -> None:
+def _render_strategy_stock_pool(df: pd.DataFrame, strategy_name: str, trade_dates: list[int] | None = None) -> None:
     st.subheader('季度股票池')
 
     strategy_cfg = financial_factors_config.STOCK_POOL_STRATEGIES[strategy_name]
@@ -377,7 +469,9 @@ def _render_strategy_stock_pool(df: pd.DataFrame, strategy_name: str, trade_date
     if not trade_dates:
         st.warning('CSV中无可用交易日期')
         return
-    selected_date = st.selectbox('交易日期', options=trade_dates, index=0, key=strategy_cfg['date_select_key'])
+    selected_date = st.selectbox(
+        '交易日期', options=trade_dates, index=0, format_func=str, key=strategy_cfg['date_select_key']
+    )
 
     pool_df = _filter_stock_pool(df=df, trade_date=selected_date, signal_col=signal_col)
 
@@ -412,7 +506,7 @@ def _render_strategy_stock_pool(df: pd.DataFrame, strategy_name: str, trade_date
     )
 
 
-@msg_printer
+@span_timer
 def generate_financial_factors_stocks_charts():
     st.header('财务选股')
     rf_pct = st.number_input(
@@ -433,6 +527,7 @@ def generate_financial_factors_stocks_charts():
     trade_dates = _get_trade_dates_desc(df)
 
     nav_df = fetch_data_from_local(latest_date='99991231', table_name=BACKTEST_NAV_TABLE_NAME)
+    nav_snapshot_version = get_snapshot_version(BACKTEST_NAV_TABLE_NAME)
 
     with tab1:
         st.subheader('中性股息')
@@ -440,7 +535,12 @@ def generate_financial_factors_stocks_charts():
         st.write('【调仓频率】在每个季报期（4.30、8.31、10.31）后选择股票并进行统一换仓。')
         st.write('【组合特点】具备高分红、低波动属性。')
         _render_strategy_stock_pool(df=df, strategy_name='中性股息', trade_dates=trade_dates)
-        _render_backtest_nav_chart(raw_df=nav_df, rf_annual=rf_annual, **BACKTEST_NAV_CHART_CONFIGS['中性股息'])
+        _render_backtest_nav_chart(
+            raw_df=nav_df,
+            rf_annual=rf_annual,
+            snapshot_version=nav_snapshot_version,
+            **BACKTEST_NAV_CHART_CONFIGS['中性股息'],
+        )
 
     with tab2:
         st.subheader('细分龙头')
@@ -448,7 +548,12 @@ def generate_financial_factors_stocks_charts():
         st.write('【调仓频率】在每个季报期（4.30、8.31、10.31）后选择股票并进行统一换仓。')
         st.write('【组合特点】弹性稍逊景气组合，但稳定性相对较强。')
         _render_strategy_stock_pool(df=df, strategy_name='细分龙头', trade_dates=trade_dates)
-        _render_backtest_nav_chart(raw_df=nav_df, rf_annual=rf_annual, **BACKTEST_NAV_CHART_CONFIGS['细分龙头'])
+        _render_backtest_nav_chart(
+            raw_df=nav_df,
+            rf_annual=rf_annual,
+            snapshot_version=nav_snapshot_version,
+            **BACKTEST_NAV_CHART_CONFIGS['细分龙头'],
+        )
 
     with tab3:
         st.subheader('景气成长')
@@ -456,4 +561,9 @@ def generate_financial_factors_stocks_charts():
         st.write('【调仓频率】在每个季报期（4.30、8.31、10.31）后选择股票并进行统一换仓。')
         st.write('【组合特点】短期弹性与趋势性强但波动也较大。')
         _render_strategy_stock_pool(df=df, strategy_name='景气成长', trade_dates=trade_dates)
-        _render_backtest_nav_chart(raw_df=nav_df, rf_annual=rf_annual, **BACKTEST_NAV_CHART_CONFIGS['景气成长'])
+        _render_backtest_nav_chart(
+            raw_df=nav_df,
+            rf_annual=rf_annual,
+            snapshot_version=nav_snapshot_version,
+            **BACKTEST_NAV_CHART_CONFIGS['景气成长'],
+        )
@@ -0,0 +1,303 @@
+import hashlib
+import json
+import re
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pyarrow as pa
+
+from config import config, param_cls
+from data_preparation.compute_service import submit_job
+from data_preparation.data_fetcher import get_snapshot_content_hash
+from data_preparation.data_processor import convert_price_ts_into_nav_ts
+from data_preparation.result_cache import code_fingerprint, config_fingerprint
+from data_preparation.snapshot_store import pinned_snapshot
+from span_timing import timed_span
+from utils import format_date_keys
+from visualization import stg_idx, style
+
+# NOTE 指标数据接口
+# Read-only HTTP access to the frames the pages draw, computed through the same `prepare_*`
+# functions and shared result cache keys, so a warm cache serves them without recomputation.
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+JSON_MEDIA_TYPE = 'application/json'
+DATE_PARAM_PATTERN = re.compile(r'\d{8}')
+
+STYLE_SNAPSHOTS = ('CN_BOND_YIELD', 'A_IDX_VAL', 'EDB', 'SHIBOR_PRICES', 'A_IDX_PRICE')
+RATE_SNAPSHOTS = ('CN_BOND_YIELD', 'A_IDX_VAL')
+STG_IDX_SNAPSHOTS = ('A_IDX_PRICE',)
+STG_IDX_CONFIG_BLOCKS = (config.STG_IDX_CODES, config.BENCH_IDX_CODES, config.TRADE_DT_COUNT, config.PERIOD_HEADERS)
+
+
+def _date_key(value: str | None) -> int | None:
+    """A validated `YYYYMMDD` parameter as the int key the frames are indexed by; None stays open-ended."""
+    return None if value is None else int(value)
+
+
+def _erp(framework: str):
+    def build(latest_date: str, start: str | None, end: str | None) -> pd.DataFrame:
+        inputs = style.load_style_inputs(latest_date)
+        return style.submit_rate_indicator_store_job(inputs).result()['erp_dfs'][framework]
+
+    return build
+
+
+def _term_spread(latest_date: str, start: str | None, end: str | None) -> pd.DataFrame:
+    inputs = style.load_style_inputs(latest_date)
+    return style.submit_rate_indicator_store_job(inputs).result()['term_spread_df']
+
+
+def _momentum(job_name: str):
+    def build(latest_date: str, start: str | None, end: str | None) -> pd.DataFrame:
+        _, _, signal_df = style.submit_style_jobs(style.load_style_inputs(latest_date))[job_name].result()
+        return signal_df
+
+    return build
+
+
+def _style_focus(latest_date: str, start: str | None, end: str | None) -> pd.DataFrame:
+    inputs = style.load_style_inputs(latest_date)
+    _, _, big_small_signal_df = style.submit_style_jobs(inputs)['prepare_big_small_momentum_data'].result()
+    return style.submit_style_focus_job(inputs, big_small_signal_df).result()
+
+
+def _stg_idx_nav(latest_date: str, start: str | None, end: str | None) -> pd.DataFrame:
+    raw_long_df, trade_dt, _, raw_name_df = stg_idx.load_stg_idx_inputs(latest_date)
+    nav_wide_df = submit_job(
+        'prepare_stg_idx_nav_wide_df',
+        (get_snapshot_content_hash('A_IDX_PRICE'), latest_date, config_fingerprint(*STG_IDX_CONFIG_BLOCKS)),
+        stg_idx.prepare_stg_idx_nav_wide_df,
+        raw_long_df=raw_long_df,
+        raw_name_df=raw_name_df,
+        custom_dt=(trade_dt[0], trade_dt[-1]),
+        data_col_config=param_cls.WindIdxColParam(),
+    ).result()
+    # Rebased at the first date of the requested range, as the page's NAV chart does.
+    nav_wide_df = nav_wide_df.loc[_date_key(start) : _date_key(end)]
+    return convert_price_ts_into_nav_ts(nav_wide_df) if len(nav_wide_df) else nav_wide_df
+
+
+def _stg_idx_grouped_return(latest_date: str, start: str | None, end: str | None) -> pd.DataFrame:
+    raw_long_df, trade_dt, _, _ = stg_idx.load_stg_idx_inputs(latest_date)
+    # The custom period runs between trading dates and needs the close of the day before it.
+    start_key = _date_key(start or config.STG_IDX_SLIDER_START_DT['RET_BAR'])
+    end_key = _date_key(end)
+    in_range = [dt for dt in trade_dt[1:] if start_key <= dt <= (end_key or dt)]
+    if not in_range:
+        raise ValueError('no trading dates in the requested range')
+    custom_dt = (in_range[0], in_range[-1])
+    return submit_job(
+        'prepare_stg_idx_grouped_return_df',
+        (
+            get_snapshot_content_hash('A_IDX_PRICE'),
+            latest_date,
+            custom_dt,
+            config_fingerprint(*STG_IDX_CONFIG_BLOCKS),
+        ),
+        stg_idx.prepare_stg_idx_grouped_return_df,
+        raw_long_df=raw_long_df,
+        latest_dt=latest_date,
+        trade_dt=trade_dt,
+        custom_dt=custom_dt,
+        data_col_config=param_cls.WindIdxColParam(),
+    ).result()
+
+
+# Dataset name -> (description, input snapshots, config blocks, builder, whether rows are dates).
+# Builders take (latest date, start, end); date-indexed frames are sliced to [start, end] afterwards.
+INDICATOR_DATASETS = {
+    'erp_value_growth': (
+        '股债性价比（价值成长信号）',
+        RATE_SNAPSHOTS,
+        style.STYLE_RESULT_CONFIG_BLOCKS['prepare_rate_indicator_store'],
+        _erp('价值成长'),
+        True,
+    ),
+    'erp_big_small': (
+        '股债性价比（大小盘信号）',
+        RATE_SNAPSHOTS,
+        style.STYLE_RESULT_CONFIG_BLOCKS['prepare_rate_indicator_store'],
+        _erp('大小盘'),
+        True,
+    ),
+    'term_spread': (
+        '期限利差',
+        RATE_SNAPSHOTS,
+        style.STYLE_RESULT_CONFIG_BLOCKS['prepare_rate_indicator_store'],
+        _term_spread,
+        True,
+    ),
+    'value_growth_momentum': (
+        '相对动量（价值/成长）',
+        STYLE_SNAPSHOTS,
+        style.STYLE_RESULT_CONFIG_BLOCKS['prepare_value_growth_data'],
+        _momentum('prepare_value_growth_data'),
+        True,
+    ),
+    'big_small_momentum': (
+        '相对动量（大盘/小盘）',
+        STYLE_SNAPSHOTS,
+        style.STYLE_RESULT_CONFIG_BLOCKS['prepare_big_small_momentum_data'],
+        _momentum('prepare_big_small_momentum_data'),
+        True,
+    ),
+    'style_focus': (
+        '风格关注度',
+        STYLE_SNAPSHOTS,
+        (
+            *style.STYLE_RESULT_CONFIG_BLOCKS['prepare_style_focus_data'],
+            *style.STYLE_RESULT_CONFIG_BLOCKS['prepare_big_small_momentum_data'],
+        ),
+        _style_focus,
+        True,
+    ),
+    'stg_idx_nav': ('策略指数与基准净值', STG_IDX_SNAPSHOTS, STG_IDX_CONFIG_BLOCKS, _stg_idx_nav, True),
+    'stg_idx_grouped_return': (
+        '策略指数区间收益（自选区间为 start-end）',
+        STG_IDX_SNAPSHOTS,
+        STG_IDX_CONFIG_BLOCKS,
+        _stg_idx_grouped_return,
+        False,
+    ),
+}
+
+
+def parse_query(query: dict[str, list[str]]) -> tuple[str | None, str | None, list[str] | None, str | None]:
+    """Validate `start`, `end` (`YYYYMMDD`), `columns` (comma separated) and `format` (json/arrow)."""
+    params = {key: values[-1] for key, values in query.items()}
+    start, end = params.get('start') or None, params.get('end') or None
+    for name, value in (('start', start), ('end', end)):
+        if value is not None and not DATE_PARAM_PATTERN.fullmatch(value):
+            raise ValueError(f'{name} must be YYYYMMDD, got {value!r}')
+    if start and end and start > end:
+        raise ValueError('start is after end')
+    columns = [col for col in params['columns'].split(',') if col] if params.get('columns') else None
+    output_format = params.get('format') or None
+    if output_format not in (None, 'json', 'arrow'):
+        raise ValueError(f'format must be json or arrow, got {output_format!r}')
+    return start, end, columns, output_format
+
+
+def dataset_etag(name: str, latest_date: str, query: tuple) -> str:
+    """Strong ETag from the dataset's input snapshot hashes, config, code version and request; needs no computation."""
+    _, snapshots, config_blocks, _, _ = INDICATOR_DATASETS[name]
+    payload = json.dumps(
+        [
+            code_fingerprint(),
+            name,
+            [get_snapshot_content_hash(table_name) for table_name in snapshots],
+            latest_date,
+            config_fingerprint(*config_blocks),
+            list(query),
+        ],
+        ensure_ascii=False,
+    )
+    return '"' + hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def select_columns(df: pd.DataFrame, columns: list[str] | None) -> pd.DataFrame:
+    """Keep `columns` in request order; a name also matches period labels such as `周度 [250106 - 250110]`."""
+    if columns is None:
+        return df
+    labels = [str(col) for col in df.columns]
+    selected = []
+    for name in columns:
+        matches = [col for col, label in zip(df.columns, labels) if label == name or label.startswith(f'{name} [')]
+        if not matches:
+            raise ValueError(f'unknown column {name!r}; available: {labels}')
+        selected.extend(matches)
+    return df[selected]
+
+
+def build_dataset(name: str, latest_date: str, start: str | None, end: str | None, columns: list[str] | None):
+    _, _, _, build, is_date_indexed = INDICATOR_DATASETS[name]
+    with timed_span(f'api:{name}'):
+        df = build(latest_date, start, end)
+        if is_date_indexed:
+            # Served with `YYYYMMDD` string dates, the format the query parameters use.
+            df = df.loc[_date_key(start) : _date_key(end)]
+            df = df.set_axis(format_date_keys(df.index))
+        return select_columns(df, columns)
+
+
+def encode_frame(df: pd.DataFrame, output_format: str) -> bytes:
+    if output_format == 'arrow':
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    payload = json.loads(df.to_json(orient='split', force_ascii=False, double_precision=15))
+    payload['index_name'] = df.index.name
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+class IndicatorRequestHandler(BaseHTTPRequestHandler):
+    """`GET /datasets` lists datasets; `GET /datasets/<name>?start=&end=&columns=&format=` returns one.
+
+    `format` defaults to Arrow IPC stream when the `Accept` header asks for it, JSON otherwise.
+    A matching `If-None-Match` is answered with 304 before anything is read or computed.
+    """
+
+    server_version = 'st-idx-indicator-api'
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if parts == ['datasets']:
+            listing = {
+                name: {'description': description, 'snapshots': list(snapshots), 'date_indexed': is_date_indexed}
+                for name, (description, snapshots, _, _, is_date_indexed) in INDICATOR_DATASETS.items()
+            }
+            self._send(HTTPStatus.OK, json.dumps(listing, ensure_ascii=False).encode('utf-8'), JSON_MEDIA_TYPE)
+            return
+        if len(parts) != 2 or parts[0] != 'datasets' or parts[1] not in INDICATOR_DATASETS:
+            self._send_error(HTTPStatus.NOT_FOUND, f'unknown path {url.path}')
+            return
+        name = parts[1]
+        try:
+            start, end, columns, output_format = parse_query(parse_qs(url.query))
+        except ValueError as exc:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(exc))
+            return
+        if output_format is None:
+            output_format = 'arrow' if ARROW_MEDIA_TYPE in self.headers.get('Accept', '') else 'json'
+
+        latest_date = date.today().strftime(config.WIND_DT_FORMAT)
+        # The ETag and the frame are derived from one resolution of the snapshot pointer.
+        with pinned_snapshot():
+            etag = dataset_etag(name, latest_date, (start, end, columns, output_format))
+            if etag in [tag.strip().removeprefix('W/') for tag in self.headers.get('If-None-Match', '').split(',')]:
+                self._send(HTTPStatus.NOT_MODIFIED, b'', None, etag)
+                return
+            try:
+                df = build_dataset(name, latest_date, start, end, columns)
+            except ValueError as exc:
+                self._send_error(HTTPStatus.BAD_REQUEST, str(exc))
+                return
+        media_type = ARROW_MEDIA_TYPE if output_format == 'arrow' else JSON_MEDIA_TYPE
+        self._send(HTTPStatus.OK, encode_frame(df, output_format), media_type, etag)
+
+    def _send(self, status: HTTPStatus, body: bytes, media_type: str | None, etag: str | None = None) -> None:
+        self.send_response(status)
+        if media_type is not None:
+            self.send_header('Content-Type', f'{media_type}; charset=utf-8' if media_type == JSON_MEDIA_TYPE else media_type)
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'), JSON_MEDIA_TYPE)
+
+
+def create_server(host: str, port: int) -> ThreadingHTTPServer:
+    """Threaded server; concurrent requests for one dataset share a computation via the result cache."""
+    return ThreadingHTTPServer((host, port), IndicatorRequestHandler)
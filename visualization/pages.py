@@ -0,0 +1,39 @@
+import importlib
+import sys
+from collections.abc import Callable
+
+import streamlit as st
+
+from span_timing import timed_span
+
+# Page label -> (module, render function). Page modules (and the altair/config objects they
+# pull in) are imported the first time a session opens the page, not at app start.
+PAGES = {
+    '财务选股': ('visualization.financial_factors_stocks', 'generate_financial_factors_stocks_charts'),
+    '策略指数': ('visualization.stg_idx', 'generate_stg_idx_charts'),
+    '风格研判': ('visualization.style', 'generate_style_charts'),
+}
+PAGE_QUERY_PARAM = 'page'
+
+
+def load_page(page: str) -> Callable[[], None]:
+    """Import the page module on first use and return its render function."""
+    module_name, func_name = PAGES[page]
+    # Always go through the import system: it waits for another session's import in progress,
+    # where `sys.modules` may already hold the partially initialised module.
+    if module_name in sys.modules:
+        module = importlib.import_module(module_name)
+    else:
+        with timed_span(f'import:{module_name}'):
+            module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+def select_page() -> str:
+    """Horizontal page switcher; `?page=<label>` opens a page directly."""
+    requested = st.query_params.get(PAGE_QUERY_PARAM)
+    if PAGE_QUERY_PARAM not in st.session_state and requested in PAGES:
+        st.session_state[PAGE_QUERY_PARAM] = requested
+    page = st.radio('页面', list(PAGES), horizontal=True, key=PAGE_QUERY_PARAM, label_visibility='collapsed')
+    st.query_params[PAGE_QUERY_PARAM] = page
+    return page
@@ -0,0 +1,223 @@
+import html
+import json
+import multiprocessing
+import re
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import altair as alt
+import pandas as pd
+import pyarrow.feather as feather
+import streamlit as st
+from streamlit.logger import set_log_level
+
+from config import config
+from data_preparation.data_fetcher import get_snapshot_content_hash
+from visualization.pages import PAGES, load_page
+from visualization.static_view import STATIC_MANIFEST, load_static_manifest
+
+# NOTE 静态看板导出
+# Outside `streamlit run`, widgets return their default values, so running a page's render function
+# with `st.altair_chart` / `st.dataframe` swapped for collectors captures exactly the default view.
+_EMBED_SCRIPTS = ''.join(
+    f'<script src="https://cdn.jsdelivr.net/npm/{package}@{version}"></script>\n'
+    for package, version in (
+        ('vega', alt.VEGA_VERSION),
+        ('vega-lite', alt.VEGALITE_VERSION),
+        ('vega-embed', alt.VEGAEMBED_VERSION),
+    )
+)
+_TEXT_CSS = (
+    '.caption { color: #808495; font-size: 0.9em; } '
+    '.info, .warning, .error { padding: 0.75em 1em; border-radius: 0.5em; } '
+    '.info { background: #e8f0fe; } .warning { background: #fff8e1; } .error { background: #fdecea; }'
+)
+# `render_page` output directories: `<page module>-<8 hex run id>`.
+_PAGE_DIR_PATTERN = re.compile(
+    '^(?:' + '|'.join(re.escape(module.rsplit('.', 1)[-1]) for module, _ in PAGES.values()) + ')-[0-9a-f]{8}$'
+)
+
+
+# Text outputs kept in the static view, by the `st` function that emitted them.
+TEXT_STYLES = ('write', 'markdown', 'caption', 'info', 'warning', 'error')
+
+
+def _capture_text(outputs: list, style: str):
+    return lambda body, *args, **kwargs: outputs.append(('text', (style, str(body))))
+
+
+def _capture_write(outputs: list):
+    def write(*args, **kwargs):
+        for arg in args:
+            if isinstance(arg, (pd.DataFrame, pd.Series)):
+                outputs.append(('table', arg))
+            else:
+                outputs.append(('text', ('write', str(arg))))
+
+    return write
+
+
+@contextmanager
+def capture_page_outputs():
+    """Collect headers, texts, altair charts and dataframes emitted while the block runs, in page order.
+
+    Texts (`st.write`, `st.caption`, `st.info`, `st.warning`, ...) are collected as
+    `('text', (style, body))`, so notes and data warnings survive in the static view.
+    """
+    outputs = []
+    patched = {
+        'header': lambda body, *args, **kwargs: outputs.append(('header', body)),
+        'subheader': lambda body, *args, **kwargs: outputs.append(('subheader', body)),
+        'altair_chart': lambda chart, *args, **kwargs: outputs.append(('chart', chart)),
+        'dataframe': lambda data=None, *args, **kwargs: outputs.append(('table', data)),
+        **{style: _capture_text(outputs, style) for style in TEXT_STYLES if style != 'write'},
+        'write': _capture_write(outputs),
+    }
+    originals = {name: getattr(st, name) for name in patched}
+    for name, func in patched.items():
+        setattr(st, name, func)
+    try:
+        yield outputs
+    finally:
+        for name, func in originals.items():
+            setattr(st, name, func)
+
+
+def _chart_title(spec: dict) -> str:
+    title = spec.get('title') or next((layer['title'] for layer in spec.get('layer', []) if 'title' in layer), '')
+    return title.get('text', '') if isinstance(title, dict) else str(title)
+
+
+def _render_page_html(page: str, items: list[dict], page_dir: Path) -> str:
+    body = []
+    scripts = []
+    for item in items:
+        if item['kind'] in ('header', 'subheader'):
+            tag = 'h2' if item['kind'] == 'header' else 'h3'
+            body.append(f'<{tag}>{html.escape(item["text"])}</{tag}>')
+        elif item['kind'] == 'text':
+            body.append(f'<p class="{item["style"]}">{html.escape(item["text"])}</p>')
+        elif item['kind'] == 'chart':
+            div_id = 'chart-' + item['file'].split('.', 1)[0]
+            spec_json = (page_dir / item['file']).read_text(encoding='utf-8').replace('</', '<\\/')
+            body.append(f'<div id="{div_id}" style="width: 100%"></div>')
+            scripts.append(f'vegaEmbed("#{div_id}", {spec_json});')
+        else:
+            body.append(feather.read_feather(page_dir / item['file']).to_html(border=0))
+    return (
+        f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(page)}</title>\n{_EMBED_SCRIPTS}'
+        f'<style>{_TEXT_CSS}</style>\n</head><body>\n'
+        + '\n'.join(body)
+        + '\n<script>\n'
+        + '\n'.join(scripts)
+        + '\n</script>\n</body></html>\n'
+    )
+
+
+def render_page(page: str, out_dir: str) -> dict:
+    """Run one page at its default widget values and write its charts and tables under `out_dir`.
+
+    Each run writes a fresh `<page module>-<run id>/` directory holding `NN.vl.json` per chart,
+    `NN.arrow` per table and an `index.html` embedding them and the page texts in order, so a reader of the
+    previous manifest never sees files being rewritten.
+
+    Returns:
+        manifest entry: directory, render time, input snapshot hashes and the page items in order.
+    """
+    # Bare-mode warnings (no runtime / ScriptRunContext) are expected here.
+    set_log_level('error')
+    alt.data_transformers.disable_max_rows()
+    page_dir = Path(out_dir) / f'{PAGES[page][0].rsplit(".", 1)[-1]}-{uuid.uuid4().hex[:8]}'
+    page_dir.mkdir(parents=True)
+
+    snapshots = {table_name: get_snapshot_content_hash(table_name) for table_name in config.CSV_FILE_MAPPING}
+    with capture_page_outputs() as outputs:
+        load_page(page)()
+
+    items = []
+    section = ''
+    for i, (kind, value) in enumerate(outputs, start=1):
+        if kind in ('header', 'subheader'):
+            section = str(value)
+            items.append({'kind': kind, 'text': section})
+        elif kind == 'text':
+            style, text = value
+            items.append({'kind': kind, 'style': style, 'text': text})
+        elif kind == 'chart':
+            spec = value.to_dict()
+            file = f'{i:02d}.vl.json'
+            (page_dir / file).write_text(json.dumps(spec, ensure_ascii=False), encoding='utf-8')
+            items.append({'kind': kind, 'title': _chart_title(spec) or section, 'file': file})
+        else:
+            file = f'{i:02d}.arrow'
+            feather.write_feather(pd.DataFrame(value), page_dir / file, compression='uncompressed')
+            items.append({'kind': kind, 'title': section, 'file': file})
+
+    (page_dir / 'index.html').write_text(_render_page_html(page, items, page_dir), encoding='utf-8')
+    return {
+        'dir': page_dir.name,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'snapshots': snapshots,
+        'items': items,
+    }
+
+
+def _is_render_output(path: Path, previous_dirs: set[str]) -> bool:
+    if path.is_dir():
+        return path.name in previous_dirs or bool(_PAGE_DIR_PATTERN.match(path.name))
+    return path.name in ('index.html', STATIC_MANIFEST, f'{STATIC_MANIFEST}.tmp')
+
+
+def render_dashboard(out_dir: str, pages: list[str] | None = None, max_workers: int | None = None) -> dict:
+    """Render pages (one per process) into `out_dir`, then publish them in the manifest and index.
+
+    Pages not re-rendered keep their previous entry; page directories no longer referenced by
+    the manifest are removed once it has been replaced. Nothing else in `out_dir` is touched.
+
+    Args:
+        pages: page labels of `PAGES`; defaults to all of them.
+        max_workers: process pool size; 1 renders in-process.
+
+    Raises:
+        ValueError: `out_dir` holds files or directories this renderer did not write.
+    """
+    pages = list(PAGES) if pages is None else pages
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    previous_dirs = {entry['dir'] for entry in (load_static_manifest(out_dir) or {'pages': {}})['pages'].values()}
+    foreign = sorted(path.name for path in out_path.iterdir() if not _is_render_output(path, previous_dirs))
+    if foreign:
+        raise ValueError(f'{out_dir} holds files not written by the static renderer: {foreign[:5]}; use an empty directory')
+    if max_workers == 1:
+        entries = [render_page(page, out_dir) for page in pages]
+    else:
+        # Spawned workers avoid inheriting the caller's threads (e.g. a Streamlit server) via fork.
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            entries = list(executor.map(render_page, pages, [out_dir] * len(pages)))
+
+    manifest = load_static_manifest(out_dir) or {'pages': {}}
+    manifest['pages'].update(zip(pages, entries, strict=True))
+    manifest['pages'] = {page: manifest['pages'][page] for page in PAGES if page in manifest['pages']}
+    tmp_manifest = out_path / f'{STATIC_MANIFEST}.tmp'
+    tmp_manifest.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    tmp_manifest.replace(out_path / STATIC_MANIFEST)
+
+    links = ''.join(
+        f'<li><a href="{entry["dir"]}/index.html">{html.escape(page)}</a>（{entry["generated_at"]}）</li>'
+        for page, entry in manifest['pages'].items()
+    )
+    (out_path / 'index.html').write_text(
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>股票交易咨询权益研究</title></head><body>\n'
+        f'<h1>股票交易咨询权益研究</h1>\n<ul>{links}</ul>\n</body></html>\n',
+        encoding='utf-8',
+    )
+
+    published = {entry['dir'] for entry in manifest['pages'].values()}
+    for path in out_path.iterdir():
+        if path.is_dir() and path.name not in published and _is_render_output(path, previous_dirs):
+            shutil.rmtree(path, ignore_errors=True)
+    return manifest
@@ -0,0 +1,72 @@
+import json
+import os
+from pathlib import Path
+
+import streamlit as st
+
+from span_timing import timed_span
+
+# NOTE 静态默认视图
+# With `ST_IDX_STATIC_DIR` pointing at `scripts/render_static.py` output, a page opens on its
+# pre-rendered default view (no computation) while the snapshots it was rendered from are
+# still current; the `交互模式` toggle switches to the live page with its widgets.
+STATIC_DIR_ENV = 'ST_IDX_STATIC_DIR'
+STATIC_MANIFEST = 'manifest.json'
+
+
+def load_static_manifest(out_dir) -> dict | None:
+    try:
+        return json.loads((Path(out_dir) / STATIC_MANIFEST).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+
+
+def _is_current(entry: dict) -> bool:
+    # Imported here: the data layer (and style config) stays out of the app shell until needed.
+    from data_preparation.data_fetcher import get_snapshot_content_hash
+
+    return all(get_snapshot_content_hash(table_name) == digest for table_name, digest in entry['snapshots'].items())
+
+
+def render_static_page(page: str) -> bool:
+    """Draw `page` from its pre-rendered artifacts; return False when the live page should render."""
+    out_dir = os.environ.get(STATIC_DIR_ENV)
+    if not out_dir:
+        return False
+    manifest = load_static_manifest(out_dir)
+    entry = (manifest or {}).get('pages', {}).get(page)
+    if entry is None or not _is_current(entry):
+        return False
+    if st.toggle('交互模式', key=f'STATIC_VIEW_INTERACTIVE:{page}', help='调整参数需实时计算'):
+        return False
+
+    import pyarrow.feather as feather
+
+    page_dir = Path(out_dir) / entry['dir']
+    with timed_span('static_view'):
+        contents = []
+        try:
+            for item in entry['items']:
+                if item['kind'] == 'chart':
+                    contents.append((item, json.loads((page_dir / item['file']).read_text(encoding='utf-8'))))
+                elif item['kind'] == 'table':
+                    contents.append((item, feather.read_feather(page_dir / item['file'])))
+                else:
+                    contents.append((item, None))
+        except FileNotFoundError:
+            # Replaced by a newer render between reading the manifest and its files.
+            return False
+
+        st.caption(f'默认视图，生成于 {entry["generated_at"]}')
+        for item, content in contents:
+            if item['kind'] == 'header':
+                st.header(item['text'])
+            elif item['kind'] == 'subheader':
+                st.subheader(item['text'])
+            elif item['kind'] == 'text':
+                getattr(st, item['style'])(item['text'])
+            elif item['kind'] == 'chart':
+                st.vega_lite_chart(content, theme='streamlit', use_container_width=True)
+            else:
+                st.dataframe(content, use_container_width=True)
+    return True
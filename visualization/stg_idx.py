@@ -1,16 +1,20 @@
 from datetime import date
 
+import pandas as pd
 import streamlit as st
 
 import utils
 from config import config, param_cls
-from data_preparation.data_analyzer import calculate_grouped_return
-from data_preparation.data_fetcher import fetch_index_data_from_local
+from data_preparation.compute_service import submit_job
+from data_preparation.data_analyzer import calculate_grouped_return, calculate_rolling_performance
+from data_preparation.data_fetcher import fetch_index_data_from_local, get_snapshot_content_hash
 from data_preparation.data_processor import (
     convert_price_ts_into_nav_ts,
     reshape_long_df_into_wide_form,
 )
-from utils import msg_printer
+from data_preparation.frame_cache import frame_cached
+from data_preparation.result_cache import config_fingerprint
+from span_timing import span_timer
 from visualization.data_visualizer import (
     draw_grouped_bars,
     draw_grouped_lines,
@@ -20,27 +24,29 @@ from visualization.data_visualizer import (
 )
 
 
+@span_timer
 def prepare_stg_idx_grouped_return_df(
     raw_long_df,
     latest_dt: str,
-    trade_dt: list[str],
-    custom_dt: tuple[str, str],
+    trade_dt: list[int],
+    custom_dt: tuple[int, int],
     data_col_config: param_cls.WindIdxColParam,
 ):
     """Prepare grouped return frame for strategy indices."""
     return calculate_grouped_return(
         raw_long_df,
-        latest_dt,
+        int(latest_dt),
         custom_dt,
         trade_dt,
         data_col_config,
     )
 
 
+@span_timer
 def prepare_stg_idx_nav_wide_df(
     raw_long_df,
     raw_name_df,
-    custom_dt: tuple[str, str],
+    custom_dt: tuple[int, int],
     data_col_config: param_cls.WindIdxColParam,
 ):
     """Prepare NAV wide frame for strategy and benchmark indices."""
@@ -55,11 +61,12 @@ def prepare_stg_idx_nav_wide_df(
     return stg_idx_bench_nav_wide_df
 
 
+@span_timer
 def prepare_stg_idx_excess_corr_wide_df(
     raw_long_df,
     stg_idx_name_df,
-    trade_dt: list[str],
-    custom_dt: str,
+    trade_dt: list[int],
+    custom_dt: int,
     data_col_config: param_cls.WindIdxColParam,
     benchmark_name: str = '中证800',
 ):
@@ -79,10 +86,64 @@ def prepare_stg_idx_excess_corr_wide_df(
     return corr_wide_df
 
 
-@msg_printer
-def generate_stg_idx_charts():
-    formatted_latest_day = date.today().strftime(config.WIND_DT_FORMAT)
+@span_timer
+def prepare_stg_idx_rolling_perf_wide_dfs(
+    raw_long_df,
+    raw_name_df,
+    window_size: int,
+    data_col_config: param_cls.WindIdxColParam,
+    benchmark_name: str = '中证800',
+) -> dict[str, pd.DataFrame]:
+    """Prepare rolling performance wide frames for strategy and benchmark indices."""
+    raw_wide_df = reshape_long_df_into_wide_form(
+        raw_long_df,
+        data_col_config.dt_col,
+        data_col_config.name_col,
+        data_col_config.price_col,
+    )[raw_name_df[data_col_config.name_col].tolist()]
+    return calculate_rolling_performance(
+        raw_wide_df,
+        window_size=window_size,
+        trading_days=int(config.TRADE_DT_COUNT['一年']),
+        bench_col=benchmark_name,
+    )
+
+
+@frame_cached(ttl=config.ST_CACHE_TTL)
+def _get_stg_idx_rolling_perf(
+    snapshot_version: str,
+    latest_dt: str,
+    window_name: str,
+    _raw_long_df,
+    _raw_name_df,
+) -> dict[str, pd.DataFrame]:
+    """Cached wrapper keyed by the index-price snapshot, latest date and window."""
+    return submit_job(
+        'prepare_stg_idx_rolling_perf_wide_dfs',
+        (
+            snapshot_version,
+            latest_dt,
+            window_name,
+            config_fingerprint(config.STG_IDX_CODES, config.BENCH_IDX_CODES, config.TRADE_DT_COUNT),
+        ),
+        prepare_stg_idx_rolling_perf_wide_dfs,
+        raw_long_df=_raw_long_df,
+        raw_name_df=_raw_name_df,
+        window_size=config.TRADE_DT_COUNT[window_name],
+        data_col_config=param_cls.WindIdxColParam(),
+    ).result()
 
+
+@span_timer
+def load_stg_idx_inputs(latest_date: str) -> tuple[pd.DataFrame, list[int], pd.DataFrame, pd.DataFrame]:
+    """Read strategy and benchmark index closes up to `latest_date`.
+
+    Returns:
+        raw_long_df: long index closes.
+        trade_dt: sorted trading date keys.
+        stg_idx_name_df: strategy index code -> name, in `STG_IDX_CODES` order.
+        raw_name_df: strategy and benchmark index code -> name.
+    """
     wind_config = param_cls.WindListedSecParam(
         wind_codes=config.STG_IDX_CODES + config.BENCH_IDX_CODES,
         start_date=config.START_DT,
@@ -92,6 +153,32 @@ def generate_stg_idx_charts():
     )
     data_col_config = param_cls.WindIdxColParam()
 
+    # raw_long_df = fetch_index_data_with_wind_portal(latest_date=latest_date, _config=wind_config)
+    raw_long_df = fetch_index_data_from_local(latest_date=latest_date, _config=wind_config)
+
+    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique().tolist())
+    stg_idx_df = raw_long_df[raw_long_df[data_col_config.code_col].isin(config.STG_IDX_CODES)].reset_index(drop=True)
+    stg_idx_name_df = (
+        stg_idx_df[[data_col_config.code_col, data_col_config.name_col]]
+        .drop_duplicates()
+        .set_index(data_col_config.code_col, drop=True)
+        .reindex(config.STG_IDX_CODES)
+    )
+    raw_name_df = (
+        raw_long_df[[data_col_config.code_col, data_col_config.name_col]]
+        .drop_duplicates()
+        .set_index(data_col_config.code_col, drop=True)
+        .reindex(wind_config.wind_codes)
+    )
+    return raw_long_df, trade_dt, stg_idx_name_df, raw_name_df
+
+
+@span_timer
+def generate_stg_idx_charts():
+    formatted_latest_day = date.today().strftime(config.WIND_DT_FORMAT)
+
+    data_col_config = param_cls.WindIdxColParam()
+
     stg_idx_grouped_ret_slider_config = param_cls.DtSliderParam(
         name=config.CUSTOM_PERIOD_SLIDER_NAME,
         start_dt=config.STG_IDX_SLIDER_START_DT['RET_BAR'],
@@ -124,62 +211,50 @@ def generate_stg_idx_charts():
         legend_format=config.CHART_NUM_FORMAT['float'],
     )
 
-    # raw_long_df = fetch_index_data_with_wind_portal(latest_date=formatted_latest_day, _config=wind_config)
-    # st.write(raw_long_df)
-    raw_long_df = fetch_index_data_from_local(latest_date=formatted_latest_day, _config=wind_config)
-    # st.write(raw_long_df)
-
-    trade_dt = sorted(raw_long_df[data_col_config.dt_col].unique())
-    stg_idx_df = raw_long_df[raw_long_df[data_col_config.code_col].isin(config.STG_IDX_CODES)].reset_index(drop=True)
-    stg_idx_name_df = (
-        stg_idx_df[[data_col_config.code_col, data_col_config.name_col]]
-        .drop_duplicates()
-        .set_index(data_col_config.code_col, drop=True)
-        .reindex(config.STG_IDX_CODES)
-    )
-    raw_name_df = (
-        raw_long_df[[data_col_config.code_col, data_col_config.name_col]]
-        .drop_duplicates()
-        .set_index(data_col_config.code_col, drop=True)
-        .reindex(wind_config.wind_codes)
-    )
+    raw_long_df, trade_dt, stg_idx_name_df, raw_name_df = load_stg_idx_inputs(formatted_latest_day)
 
     st.header('策略指数')
 
+    # Each section's slider is read first and its chart slot reserved, so the three jobs
+    # (slider-dependent, hence not shared-cached) run together before any chart is drawn.
+
     # 1. 策略指数收益对比条形图
 
     stg_idx_grouped_ret_custom_dt = get_custom_dt_with_slider(trade_dt, stg_idx_grouped_ret_slider_config)
-
-    raw_grouped_ret_df = prepare_stg_idx_grouped_return_df(
+    grouped_ret_slot = st.container()
+    grouped_ret_job = submit_job(
+        'prepare_stg_idx_grouped_return_df',
+        None,
+        prepare_stg_idx_grouped_return_df,
         raw_long_df=raw_long_df,
         latest_dt=formatted_latest_day,
         trade_dt=trade_dt,
         custom_dt=stg_idx_grouped_ret_custom_dt,
         data_col_config=data_col_config,
     )
-    # st.write(raw_long_df)
-    # st.write(raw_grouped_ret_df)
-
-    draw_grouped_bars(raw_grouped_ret_df, raw_name_df, grouped_ret_bar_config)
 
     # 2. 策略指数走势图
 
     stg_idx_bench_nav_custom_dt = get_custom_dt_with_slider(trade_dt, stg_idx_bench_nav_slider_config)
-
-    stg_idx_bench_nav_wide_df = prepare_stg_idx_nav_wide_df(
+    nav_slot = st.container()
+    nav_job = submit_job(
+        'prepare_stg_idx_nav_wide_df',
+        None,
+        prepare_stg_idx_nav_wide_df,
         raw_long_df=raw_long_df,
         raw_name_df=raw_name_df,
         custom_dt=stg_idx_bench_nav_custom_dt,
         data_col_config=data_col_config,
     )
 
-    draw_grouped_lines(wide_df=stg_idx_bench_nav_wide_df, config=line_config)
-
     # 3. 策略超额相关性热力图
 
     corr_custom_dt = get_custom_dt_with_select_slider(trade_dt, corr_slider_config)
-
-    corr_wide_df = prepare_stg_idx_excess_corr_wide_df(
+    corr_slot = st.container()
+    corr_job = submit_job(
+        'prepare_stg_idx_excess_corr_wide_df',
+        None,
+        prepare_stg_idx_excess_corr_wide_df,
         raw_long_df=raw_long_df,
         stg_idx_name_df=stg_idx_name_df,
         trade_dt=trade_dt,
@@ -188,5 +263,50 @@ def generate_stg_idx_charts():
         benchmark_name='中证800',
     )
 
-    draw_heatmap(corr_wide_df, heatmap_config)
-    # st.write(corr_wide_df.rename_axis('策略指数'))
+    with grouped_ret_slot:
+        draw_grouped_bars(grouped_ret_job.result(), raw_name_df, grouped_ret_bar_config)
+    with nav_slot:
+        draw_grouped_lines(wide_df=nav_job.result(), config=line_config)
+    with corr_slot:
+        draw_heatmap(corr_job.result(), heatmap_config)
+
+    # 4. 策略指数滚动绩效
+
+    rolling_window_name = st.select_slider(
+        '滚动窗口',
+        options=config.ROLLING_PERF_WINDOW_NAMES,
+        value=config.ROLLING_PERF_DEFAULT_WINDOW,
+        key='STG_IDX_ROLLING_WINDOW',
+    )
+    rolling_metric = st.selectbox(
+        '滚动指标',
+        options=list(config.ROLLING_PERF_METRIC_NAMES),
+        format_func=config.ROLLING_PERF_METRIC_NAMES.get,
+        key='STG_IDX_ROLLING_METRIC',
+    )
+    rolling_perf = _get_stg_idx_rolling_perf(
+        get_snapshot_content_hash('A_IDX_PRICE'),
+        formatted_latest_day,
+        rolling_window_name,
+        _raw_long_df=raw_long_df,
+        _raw_name_df=raw_name_df,
+    )
+    rolling_metric_name = config.ROLLING_PERF_METRIC_NAMES[rolling_metric]
+    rolling_line_config = param_cls.IdxLineParam(
+        axis_names={
+            'X': config.STG_IDX_CHART_AXIS_NAMES['NAV_LINE']['X'],
+            'LEGEND': config.STG_IDX_CHART_AXIS_NAMES['NAV_LINE']['LEGEND'],
+            'Y': rolling_metric_name,
+        },
+        title=f'策略指数近{rolling_window_name}{rolling_metric_name}',
+        y_axis_format=config.CHART_NUM_FORMAT[config.ROLLING_PERF_METRIC_FORMATS[rolling_metric]],
+        dt_slider_param=param_cls.DtSliderParam(
+            start_dt=config.START_DT,
+            default_start_offset=utils.get_avg_dt_count_via_dt_type(
+                dt_type=utils.TradeDtType.STOCK_MKT, period='一年'
+            ),
+            key='STG_IDX_ROLLING_PERF_SLIDER',
+        ),
+    )
+
+    draw_grouped_lines(wide_df=rolling_perf[rolling_metric].dropna(how='all'), config=rolling_line_config)
@@ -1,32 +1,73 @@
 from datetime import date
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from config import config, param_cls, style_config
+from data_preparation.compute_service import ComputeJob, submit_job
 from data_preparation.data_fetcher import (
     fetch_data_from_local,
     fetch_index_data_from_local,
+    get_snapshot_content_hash,
 )
 from data_preparation.data_processor import (
-    append_difference_column,
-    append_ratio_column,
+    ColumnPipeline,
     append_rolling_mean_column,
-    append_rolling_quantile_column,
-    append_rolling_sum_column,
-    append_sum_column,
     append_year_on_year_growth_column,
     apply_signal_from_conditions,
     reshape_long_df_into_wide_form,
 )
-from utils import TradeDtType, get_avg_dt_count_via_dt_type, msg_printer
+from data_preparation.frame_cache import frame_cached
+from data_preparation.result_cache import cached_result, config_fingerprint
+from data_preparation.signal_evaluator import evaluate_signals
+from span_timing import span_timer
+from utils import TradeDtType, get_avg_dt_count_via_dt_type
 from visualization.data_visualizer import (
     draw_grouped_lines,
     draw_style_bar_chart_with_highlighted_signal,
     draw_style_bar_line_chart_with_highlighted_signal,
 )
 
+# Config blocks each shared-cached result reads; editing one invalidates the result's cache entries.
+STYLE_RESULT_CONFIG_BLOCKS = {
+    'wide_raw_edb_df': (style_config.DATA_COL_PARAM,),
+    'raw_wide_idx_df': (style_config.STYLE_IDX_CODES, style_config.START_DT),
+    'prepare_value_growth_data': (style_config.STYLE_IDX_CODES, config.TRADE_DT_COUNT),
+    'prepare_index_turnover_data': (style_config.DATA_COL_PARAM, style_config.INDEX_TURNOVER_CONFIG),
+    'prepare_big_small_momentum_data': (style_config.STYLE_IDX_CODES, config.TRADE_DT_COUNT),
+    'prepare_style_focus_data': (
+        style_config.DATA_COL_PARAM,
+        style_config.STYLE_FOCUS_CONFIG,
+        style_config.STYLE_FOCUS_CHART_PARAM,
+    ),
+    'prepare_shibor_prices_data': (style_config.SHIBOR_PRICES_COL_PARAM, style_config.SHIBOR_PRICES_CONFIG),
+    'prepare_housing_invest_data': (style_config.HOUSING_INVEST_CONFIG,),
+    'prepare_rate_indicator_store': (
+        style_config.TERM_SPREAD_CONFIG,
+        style_config.YIELD_CURVE_COL_PARAM,
+        style_config.INDEX_ERP_COL_PARAM,
+        style_config.INDEX_ERP_CONFIG,
+        config.TRADE_DT_COUNT,
+        style_config.INDEX_ERP_CHART_PARAM,
+        style_config.INDEX_ERP_2_CHART_PARAM,
+        style_config.TERM_SPREAD_CHART_PARAM,
+        style_config.TERM_SPREAD_2_CHART_PARAM,
+    ),
+}
+# The evaluation reads every page signal, so it depends on all of the blocks above.
+STYLE_RESULT_CONFIG_BLOCKS['evaluate_style_signals'] = (
+    style_config.STYLE_SIGNAL_EVAL_CONFIG,
+    *STYLE_RESULT_CONFIG_BLOCKS.values(),
+)
+
+
+def _style_result_key(name: str, snapshot_key: tuple[str, str]) -> tuple[str, str, str]:
+    """Shared result cache key: (snapshot content hashes, latest date, fingerprint of `name`'s config)."""
+    return (*snapshot_key, config_fingerprint(*STYLE_RESULT_CONFIG_BLOCKS[name]))
+
 
+@span_timer
 def prepare_value_growth_data(raw_wide_idx_df: pd.DataFrame, idx_name_df: pd.DataFrame):
     """Prepare data for value vs growth style block.
 
@@ -42,69 +83,28 @@ def prepare_value_growth_data(raw_wide_idx_df: pd.DataFrame, idx_name_df: pd.Dat
         )
     )
 
-    value_growth_df = raw_wide_idx_df[[value_name_col, growth_name_col]].copy()
-    value_growth_df = append_ratio_column(value_growth_df, value_name_col, growth_name_col)
-    value_growth_df = append_rolling_mean_column(
-        df=value_growth_df,
-        window_name='一年',
-        window_size=config.TRADE_DT_COUNT['一年'],
-        rolling_mean_col='近一年均值',
-    )
-
-    ratio_mean_df = value_growth_df.iloc[:, -2:].copy()
-
-    for col, new_col in zip(
-        [value_name_col, growth_name_col],
-        ['国证价值近一月收益率', '国证成长近一月收益率'],
-    ):
-        value_growth_df[new_col] = value_growth_df[col].pct_change(
-            get_avg_dt_count_via_dt_type(
-                dt_type=TradeDtType.STOCK_MKT,
-                period='一月',
-            )
-        )
-    for col, new_col in zip(
-        [value_name_col, growth_name_col],
-        ['国证价值近两周收益率', '国证成长近两周收益率'],
-    ):
-        value_growth_df[new_col] = value_growth_df[col].pct_change(
-            get_avg_dt_count_via_dt_type(
-                dt_type=TradeDtType.STOCK_MKT,
-                period='两周',
-            )
-        )
-    value_growth_df.dropna(inplace=True)
-
-    pct_change_df = value_growth_df[
-        [
-            '国证价值近一月收益率',
-            '国证成长近一月收益率',
-            '国证价值近两周收益率',
-            '国证成长近两周收益率',
-        ]
-    ].dropna(inplace=False)
-
-    value_growth_df = append_difference_column(
-        df=value_growth_df,
-        minuend_col='国证价值近一月收益率',
-        subtrahend_col='国证成长近一月收益率',
-        difference_col='价值对成长近一月超额',
-    )
-    value_growth_df = append_difference_column(
-        df=value_growth_df,
-        minuend_col='国证价值近两周收益率',
-        subtrahend_col='国证成长近两周收益率',
-        difference_col='价值对成长近两周超额',
-    )
-    value_growth_df = append_sum_column(
-        df=value_growth_df,
-        sum_1_col='价值对成长近一月超额',
-        sum_2_col='价值对成长近两周超额',
-        sum_col='相对动量',
-        multiplier_1=1,
-        multiplier_2=2,
-        multiplier_sum=0.5,
+    ratio_col = f'{value_name_col}/{growth_name_col}'
+    month_size = get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period='一月')
+    two_week_size = get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period='两周')
+    pct_change_cols = ['国证价值近一月收益率', '国证成长近一月收益率', '国证价值近两周收益率', '国证成长近两周收益率']
+
+    value_growth_pipeline = (
+        ColumnPipeline(raw_wide_idx_df[[value_name_col, growth_name_col]])
+        .ratio(value_name_col, growth_name_col, ratio_col)
+        .rolling_mean(ratio_col, config.TRADE_DT_COUNT['一年'], '近一年均值', trim=True)
+        .mark('ratio_mean', [ratio_col, '近一年均值'])
+        .pct_change(value_name_col, month_size, '国证价值近一月收益率')
+        .pct_change(growth_name_col, month_size, '国证成长近一月收益率')
+        .pct_change(value_name_col, two_week_size, '国证价值近两周收益率')
+        .pct_change(growth_name_col, two_week_size, '国证成长近两周收益率')
+        .trim()
+        .difference('国证价值近一月收益率', '国证成长近一月收益率', '价值对成长近一月超额')
+        .difference('国证价值近两周收益率', '国证成长近两周收益率', '价值对成长近两周超额')
+        .sum('价值对成长近一月超额', '价值对成长近两周超额', '相对动量', multiplier_2=2, multiplier_sum=0.5)
     )
+    value_growth_df = value_growth_pipeline.run()
+    ratio_mean_df = value_growth_pipeline.frame_at('ratio_mean')
+    pct_change_df = value_growth_df[pct_change_cols]
 
     value_growth_conditions = [
         (value_growth_df['价值对成长近一月超额'] < 0) & (value_growth_df['价值对成长近两周超额'] < 0),
@@ -127,6 +127,7 @@ def prepare_value_growth_data(raw_wide_idx_df: pd.DataFrame, idx_name_df: pd.Dat
     return ratio_mean_df, pct_change_df, signal_df
 
 
+@span_timer
 def prepare_index_turnover_data(long_wind_all_a_idx_val_df: pd.DataFrame) -> pd.DataFrame:
     """Prepare data for market sentiment (index turnover) style block."""
     wide_wind_all_a_turnover_df = reshape_long_df_into_wide_form(
@@ -137,25 +138,22 @@ def prepare_index_turnover_data(long_wind_all_a_idx_val_df: pd.DataFrame) -> pd.
         add_suffix=True,
     )
 
-    wide_wind_all_a_turnover_df = append_rolling_mean_column(
-        df=wide_wind_all_a_turnover_df,
-        window_name=style_config.INDEX_TURNOVER_CONFIG['MEAN_ROLLING_WINDOW'],
-        window_size=style_config.INDEX_TURNOVER_CONFIG['MEAN_ROLLING_WINDOW_SIZE'],
-        rolling_mean_col=style_config.INDEX_TURNOVER_CONFIG['MEAN_COL'],
-    )
-    wide_wind_all_a_turnover_df = append_rolling_mean_column(
-        df=wide_wind_all_a_turnover_df,
-        window_name=style_config.INDEX_TURNOVER_CONFIG['MEAN_1M_ROLLING_WINDOW'],
-        window_size=style_config.INDEX_TURNOVER_CONFIG['MEAN_1M_ROLLING_WINDOW_SIZE'],
-        target_col=style_config.INDEX_TURNOVER_CONFIG['MEAN_COL'],
-        rolling_mean_col=style_config.INDEX_TURNOVER_CONFIG['MEAN_1M_COL'],
-    )
-    wide_wind_all_a_turnover_df = append_rolling_mean_column(
-        df=wide_wind_all_a_turnover_df,
-        window_name=style_config.INDEX_TURNOVER_CONFIG['MEAN_2Y_ROLLING_WINDOW'],
-        window_size=style_config.INDEX_TURNOVER_CONFIG['MEAN_2Y_ROLLING_WINDOW_SIZE'],
-        target_col=style_config.INDEX_TURNOVER_CONFIG['MEAN_COL'],
-        rolling_mean_col=style_config.INDEX_TURNOVER_CONFIG['MEAN_2Y_COL'],
+    turnover_cfg = style_config.INDEX_TURNOVER_CONFIG
+    wide_wind_all_a_turnover_df = (
+        ColumnPipeline(wide_wind_all_a_turnover_df)
+        .rolling_mean(
+            wide_wind_all_a_turnover_df.columns[-1],
+            turnover_cfg['MEAN_ROLLING_WINDOW_SIZE'],
+            turnover_cfg['MEAN_COL'],
+            trim=True,
+        )
+        .rolling_mean(
+            turnover_cfg['MEAN_COL'], turnover_cfg['MEAN_1M_ROLLING_WINDOW_SIZE'], turnover_cfg['MEAN_1M_COL'], trim=True
+        )
+        .rolling_mean(
+            turnover_cfg['MEAN_COL'], turnover_cfg['MEAN_2Y_ROLLING_WINDOW_SIZE'], turnover_cfg['MEAN_2Y_COL'], trim=True
+        )
+        .run()
     )
 
     turnover_conditions = [
@@ -182,6 +180,7 @@ def prepare_index_turnover_data(long_wind_all_a_idx_val_df: pd.DataFrame) -> pd.
     return wide_wind_all_a_turnover_df
 
 
+@span_timer
 def prepare_term_spread_data(long_raw_cn_bond_yield_df: pd.DataFrame):
     """Prepare data for term spread block (bar+line+signal and yield curves)."""
     wide_raw_cn_bond_yield_df = reshape_long_df_into_wide_form(
@@ -192,17 +191,17 @@ def prepare_term_spread_data(long_raw_cn_bond_yield_df: pd.DataFrame):
     )
 
     short_term_col, long_term_col = sorted(style_config.TERM_SPREAD_CONFIG['YIELD_CURVE_TERMS'])
-    term_spread_df = append_difference_column(
-        df=wide_raw_cn_bond_yield_df,
-        minuend_col=long_term_col,
-        subtrahend_col=short_term_col,
-        difference_col=style_config.TERM_SPREAD_CONFIG['TERM_SPREAD_COL'],
-    )
-    term_spread_df = append_rolling_mean_column(
-        df=term_spread_df,
-        window_name=style_config.TERM_SPREAD_CONFIG['ROLLING_WINDOW'],
-        window_size=style_config.TERM_SPREAD_CONFIG['ROLLING_WINDOW_SIZE'],
-        rolling_mean_col=style_config.TERM_SPREAD_CONFIG['MEAN_COL'],
+    term_spread_col = style_config.TERM_SPREAD_CONFIG['TERM_SPREAD_COL']
+    term_spread_df = (
+        ColumnPipeline(wide_raw_cn_bond_yield_df)
+        .difference(long_term_col, short_term_col, term_spread_col)
+        .rolling_mean(
+            term_spread_col,
+            style_config.TERM_SPREAD_CONFIG['ROLLING_WINDOW_SIZE'],
+            style_config.TERM_SPREAD_CONFIG['MEAN_COL'],
+            trim=True,
+        )
+        .run()
     )
 
     yield_curve_df = term_spread_df[
@@ -215,16 +214,12 @@ def prepare_term_spread_data(long_raw_cn_bond_yield_df: pd.DataFrame):
     return term_spread_df, yield_curve_df, wide_raw_cn_bond_yield_df
 
 
-def prepare_index_erp_data(
+@span_timer
+def prepare_index_erp_base_data(
     long_wind_all_a_idx_val_df: pd.DataFrame,
     wide_raw_cn_bond_yield_df: pd.DataFrame,
-) -> tuple[pd.DataFrame, list]:
-    """Prepare data for ERP (equity risk premium) style block (value vs growth).
-
-    Returns:
-        wide_erp_df: DataFrame with ERP value, rolling mean, and quantile bands.
-        erp_conditions: list of boolean Series used for signal assignment.
-    """
+) -> pd.DataFrame:
+    """Prepare the ERP series and its one-month rolling mean, before any quantile bands."""
     wide_raw_idx_pe_ttm_df = reshape_long_df_into_wide_form(
         long_df=long_wind_all_a_idx_val_df,
         index_col=style_config.INDEX_ERP_COL_PARAM.dt_col,
@@ -244,58 +239,72 @@ def prepare_index_erp_data(
         merge_pe_yc_df['市盈率倒数'] - merge_pe_yc_df['十年期国债到期收益率']
     )
 
-    erp_quantile_info = [
-        {
-            'quantile': style_config.INDEX_ERP_CONFIG['QUANTILE_CEILING'],
-            'col': style_config.INDEX_ERP_CONFIG['QUANTILE_CEILING_COL'],
-            'dropna': False,
-        },
-        {
-            'quantile': style_config.INDEX_ERP_CONFIG['QUANTILE_FLOOR'],
-            'col': style_config.INDEX_ERP_CONFIG['QUANTILE_FLOOR_COL'],
-            'dropna': True,
-        },
-    ]
+    erp_col = style_config.INDEX_ERP_CONFIG['ERP_COL']
+    return (
+        ColumnPipeline(merge_pe_yc_df[[erp_col]])
+        .rolling_mean(erp_col, config.TRADE_DT_COUNT['一月'], style_config.INDEX_ERP_CONFIG['MEAN_1M_COL'])
+        .run()
+    )
+
+
+def get_index_erp_gates(wide_erp_df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """Return the (upper, lower) momentum gates of the ERP signal: ERP below / above its one-month mean."""
+    erp_cfg = style_config.INDEX_ERP_CONFIG
+    erp = wide_erp_df[erp_cfg['ERP_COL']]
+    mean_1m = wide_erp_df[erp_cfg['MEAN_1M_COL']]
+    return erp < mean_1m, erp > mean_1m
+
+
+@span_timer
+def prepare_index_erp_data(
+    long_wind_all_a_idx_val_df: pd.DataFrame,
+    wide_raw_cn_bond_yield_df: pd.DataFrame,
+) -> tuple[pd.DataFrame, list]:
+    """Prepare data for ERP (equity risk premium) style block (value vs growth).
 
-    wide_erp_df = pd.DataFrame(merge_pe_yc_df[style_config.INDEX_ERP_CONFIG['ERP_COL']])
-    wide_erp_df = append_rolling_mean_column(
-        df=wide_erp_df,
-        window_name='一月',
-        window_size=config.TRADE_DT_COUNT['一月'],
-        dropna=False,
+    Returns:
+        wide_erp_df: DataFrame with ERP value, rolling mean, and quantile bands.
+        erp_conditions: list of boolean Series used for signal assignment.
+    """
+    wide_erp_df = prepare_index_erp_base_data(
+        long_wind_all_a_idx_val_df=long_wind_all_a_idx_val_df,
+        wide_raw_cn_bond_yield_df=wide_raw_cn_bond_yield_df,
     )
 
-    for info in erp_quantile_info:
-        wide_erp_df = append_rolling_quantile_column(
-            df=wide_erp_df,
-            window_name=style_config.INDEX_ERP_CONFIG['QUANTILE_ROLLING_WINDOW'],
-            window_size=style_config.INDEX_ERP_CONFIG['QUANTILE_ROLLING_WINDOW_SIZE'],
-            target_col=style_config.INDEX_ERP_CONFIG['ERP_COL'],
-            rolling_quantile_col=info['col'],
-            quantile=info['quantile'],
-            dropna=info['dropna'],
+    erp_cfg = style_config.INDEX_ERP_CONFIG
+    wide_erp_df = (
+        ColumnPipeline(wide_erp_df)
+        .rolling_quantile(
+            erp_cfg['ERP_COL'],
+            erp_cfg['QUANTILE_ROLLING_WINDOW_SIZE'],
+            erp_cfg['QUANTILE_CEILING_COL'],
+            quantile=erp_cfg['QUANTILE_CEILING'],
         )
+        .rolling_quantile(
+            erp_cfg['ERP_COL'],
+            erp_cfg['QUANTILE_ROLLING_WINDOW_SIZE'],
+            erp_cfg['QUANTILE_FLOOR_COL'],
+            quantile=erp_cfg['QUANTILE_FLOOR'],
+            trim=True,
+        )
+        .run()
+    )
 
+    erp_col = erp_cfg['ERP_COL']
+    upper_gate, lower_gate = get_index_erp_gates(wide_erp_df)
     erp_conditions = [
-        (
-            wide_erp_df[style_config.INDEX_ERP_CONFIG['ERP_COL']]
-            >= wide_erp_df[style_config.INDEX_ERP_CONFIG['QUANTILE_CEILING_COL']]
-        )
-        & (wide_erp_df[style_config.INDEX_ERP_CONFIG['ERP_COL']] < wide_erp_df['近一月均值']),
-        (
-            wide_erp_df[style_config.INDEX_ERP_CONFIG['ERP_COL']]
-            <= wide_erp_df[style_config.INDEX_ERP_CONFIG['QUANTILE_FLOOR_COL']]
-        )
-        & (wide_erp_df[style_config.INDEX_ERP_CONFIG['ERP_COL']] > wide_erp_df['近一月均值']),
+        (wide_erp_df[erp_col] >= wide_erp_df[erp_cfg['QUANTILE_CEILING_COL']]) & upper_gate,
+        (wide_erp_df[erp_col] <= wide_erp_df[erp_cfg['QUANTILE_FLOOR_COL']]) & lower_gate,
     ]
     return wide_erp_df, erp_conditions
 
 
-def prepare_style_focus_data(
+@span_timer
+def prepare_style_focus_base_data(
     long_big_small_idx_val_df: pd.DataFrame,
     big_small_df: pd.DataFrame,
 ) -> pd.DataFrame:
-    """Prepare data for style focus block (small vs big cap attention)."""
+    """Prepare the style focus series joined with big/small two-week returns, before any quantile bands."""
     wide_big_small_turnover_df = reshape_long_df_into_wide_form(
         long_df=long_big_small_idx_val_df,
         index_col=style_config.DATA_COL_PARAM[param_cls.WindPortal.A_IDX_VAL].dt_col,
@@ -304,62 +313,69 @@ def prepare_style_focus_data(
         add_suffix=True,
     )
 
-    wide_big_small_turnover_df = append_ratio_column(
-        df=wide_big_small_turnover_df,
-        numerator_col='中证1000_日换手率',
-        denominator_col='沪深300_日换手率',
-        ratio_col='中证1000/沪深300_日换手率',
-    )
-
-    style_focus_df = append_rolling_sum_column(
-        df=wide_big_small_turnover_df,
-        window_size=get_avg_dt_count_via_dt_type(
-            dt_type=TradeDtType.STOCK_MKT,
-            period='三月',
-        ),
-        rolling_sum_col='风格关注度',
+    style_focus_df = (
+        ColumnPipeline(wide_big_small_turnover_df)
+        .ratio('中证1000_日换手率', '沪深300_日换手率', '中证1000/沪深300_日换手率')
+        .rolling_sum(
+            '中证1000/沪深300_日换手率',
+            get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period='三月'),
+            '风格关注度',
+            trim=True,
+        )
+        .run()
     )
 
+    focus_cfg = style_config.STYLE_FOCUS_CONFIG
     merged_style_focus_df = style_focus_df.join(
-        big_small_df[['沪深300近两周收益率', '中证2000近两周收益率']], how='inner'
+        big_small_df[[focus_cfg['BIG_RETURN_COL'], focus_cfg['SMALL_RETURN_COL']]], how='inner'
     )
     merged_style_focus_df.index.name = style_focus_df.index.name
+    return merged_style_focus_df
 
-    style_focus_quantile_info = [
-        {
-            'quantile': style_config.STYLE_FOCUS_CONFIG['QUANTILE_CEILING'],
-            'col': style_config.STYLE_FOCUS_CONFIG['QUANTILE_CEILING_COL'],
-            'dropna': False,
-        },
-        {
-            'quantile': style_config.STYLE_FOCUS_CONFIG['QUANTILE_FLOOR'],
-            'col': style_config.STYLE_FOCUS_CONFIG['QUANTILE_FLOOR_COL'],
-            'dropna': True,
-        },
-    ]
 
-    for info in style_focus_quantile_info:
-        merged_style_focus_df = append_rolling_quantile_column(
-            df=merged_style_focus_df,
-            window_name=style_config.STYLE_FOCUS_CONFIG['QUANTILE_ROLLING_WINDOW'],
-            window_size=style_config.STYLE_FOCUS_CONFIG['QUANTILE_ROLLING_WINDOW_SIZE'],
-            target_col=style_config.STYLE_FOCUS_CONFIG['STYLE_FOCUS_COL'],
-            rolling_quantile_col=info['col'],
-            quantile=info['quantile'],
-            dropna=info['dropna'],
-        )
+def get_style_focus_gates(style_focus_df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """Return the (upper, lower) momentum gates of the style focus signal: big caps leading / lagging over two weeks."""
+    focus_cfg = style_config.STYLE_FOCUS_CONFIG
+    big_return = style_focus_df[focus_cfg['BIG_RETURN_COL']]
+    small_return = style_focus_df[focus_cfg['SMALL_RETURN_COL']]
+    return big_return >= small_return, big_return <= small_return
 
-    style_focus_conditions = [
-        (
-            merged_style_focus_df[style_config.STYLE_FOCUS_CONFIG['STYLE_FOCUS_COL']]
-            >= merged_style_focus_df[style_config.STYLE_FOCUS_CONFIG['QUANTILE_CEILING_COL']]
+
+@span_timer
+def prepare_style_focus_data(
+    long_big_small_idx_val_df: pd.DataFrame,
+    big_small_df: pd.DataFrame,
+) -> pd.DataFrame:
+    """Prepare data for style focus block (small vs big cap attention)."""
+    merged_style_focus_df = prepare_style_focus_base_data(
+        long_big_small_idx_val_df=long_big_small_idx_val_df,
+        big_small_df=big_small_df,
+    )
+
+    focus_cfg = style_config.STYLE_FOCUS_CONFIG
+    merged_style_focus_df = (
+        ColumnPipeline(merged_style_focus_df)
+        .rolling_quantile(
+            focus_cfg['STYLE_FOCUS_COL'],
+            focus_cfg['QUANTILE_ROLLING_WINDOW_SIZE'],
+            focus_cfg['QUANTILE_CEILING_COL'],
+            quantile=focus_cfg['QUANTILE_CEILING'],
         )
-        & (merged_style_focus_df['沪深300近两周收益率'] >= merged_style_focus_df['中证2000近两周收益率']),
-        (
-            merged_style_focus_df[style_config.STYLE_FOCUS_CONFIG['STYLE_FOCUS_COL']]
-            <= merged_style_focus_df[style_config.STYLE_FOCUS_CONFIG['QUANTILE_FLOOR_COL']]
+        .rolling_quantile(
+            focus_cfg['STYLE_FOCUS_COL'],
+            focus_cfg['QUANTILE_ROLLING_WINDOW_SIZE'],
+            focus_cfg['QUANTILE_FLOOR_COL'],
+            quantile=focus_cfg['QUANTILE_FLOOR'],
+            trim=True,
         )
-        & (merged_style_focus_df['沪深300近两周收益率'] <= merged_style_focus_df['中证2000近两周收益率']),
+        .run()
+    )
+
+    focus_col = focus_cfg['STYLE_FOCUS_COL']
+    upper_gate, lower_gate = get_style_focus_gates(merged_style_focus_df)
+    style_focus_conditions = [
+        (merged_style_focus_df[focus_col] >= merged_style_focus_df[focus_cfg['QUANTILE_CEILING_COL']]) & upper_gate,
+        (merged_style_focus_df[focus_col] <= merged_style_focus_df[focus_cfg['QUANTILE_FLOOR_COL']]) & lower_gate,
     ]
     style_focus_choices = [
         style_config.STYLE_FOCUS_CHART_PARAM.bar_param.false_signal,
@@ -376,6 +392,7 @@ def prepare_style_focus_data(
     return merged_style_focus_df
 
 
+@span_timer
 def prepare_shibor_prices_data(long_raw_shibor_df: pd.DataFrame) -> pd.DataFrame:
     """Prepare data for Shibor 3M (monetary cycle) block."""
     wide_raw_shibor_prices_df = reshape_long_df_into_wide_form(
@@ -385,16 +402,21 @@ def prepare_shibor_prices_data(long_raw_shibor_df: pd.DataFrame) -> pd.DataFrame
         value_col=style_config.SHIBOR_PRICES_COL_PARAM.ytm_col,
     )
 
-    shibor_prices_df = append_rolling_mean_column(
-        df=wide_raw_shibor_prices_df,
-        window_name=style_config.SHIBOR_PRICES_CONFIG['ROLLING_WINDOW'],
-        window_size=style_config.SHIBOR_PRICES_CONFIG['ROLLING_WINDOW_SIZE'],
-        rolling_mean_col=style_config.SHIBOR_PRICES_CONFIG['MEAN_COL'],
+    shibor_prices_df = (
+        ColumnPipeline(wide_raw_shibor_prices_df)
+        .rolling_mean(
+            wide_raw_shibor_prices_df.columns[-1],
+            style_config.SHIBOR_PRICES_CONFIG['ROLLING_WINDOW_SIZE'],
+            style_config.SHIBOR_PRICES_CONFIG['MEAN_COL'],
+            trim=True,
+        )
+        .run()
     )
 
     return shibor_prices_df
 
 
+@span_timer
 def prepare_housing_invest_data(wide_raw_edb_df: pd.DataFrame) -> pd.DataFrame:
     """Prepare data for housing investment YoY growth block."""
     wide_raw_housing_invest_df = wide_raw_edb_df[[style_config.HOUSING_INVEST_CONFIG['HOUSING_INVEST_COL']]]
@@ -412,6 +434,7 @@ def prepare_housing_invest_data(wide_raw_edb_df: pd.DataFrame) -> pd.DataFrame:
     return wide_raw_housing_invest_df
 
 
+@span_timer
 def prepare_big_small_momentum_data(
     raw_wide_idx_df: pd.DataFrame,
     idx_name_df: pd.DataFrame,
@@ -423,74 +446,28 @@ def prepare_big_small_momentum_data(
             ['大盘', '小盘'],
         )
     )
-    big_small_df = raw_wide_idx_df[[big_name_col, small_name_col]].copy()
-    big_small_df = append_ratio_column(
-        df=big_small_df,
-        numerator_col=big_name_col,
-        denominator_col=small_name_col,
-        ratio_col='沪深300/中证2000',
-    )
-    big_small_df = append_rolling_mean_column(
-        df=big_small_df,
-        window_name='一月',
-        window_size=config.TRADE_DT_COUNT['一月'],
-        dropna=False,
-    )
-
-    ratio_mean_df = big_small_df[['沪深300/中证2000', '近一月均值']].dropna(inplace=False)
-
-    for col, new_col in zip(
-        [big_name_col, small_name_col],
-        ['沪深300近一月收益率', '中证2000近一月收益率'],
-    ):
-        big_small_df[new_col] = big_small_df[col].pct_change(
-            get_avg_dt_count_via_dt_type(
-                dt_type=TradeDtType.STOCK_MKT,
-                period='一月',
-            )
-        )
-    for col, new_col in zip(
-        [big_name_col, small_name_col],
-        ['沪深300近两周收益率', '中证2000近两周收益率'],
-    ):
-        big_small_df[new_col] = big_small_df[col].pct_change(
-            get_avg_dt_count_via_dt_type(
-                dt_type=TradeDtType.STOCK_MKT,
-                period='两周',
-            )
-        )
-    big_small_df.dropna(inplace=True)
-
-    pct_change_df = big_small_df[
-        [
-            '沪深300近一月收益率',
-            '中证2000近一月收益率',
-            '沪深300近两周收益率',
-            '中证2000近两周收益率',
-        ]
-    ].dropna(inplace=False)
-
-    big_small_df = append_difference_column(
-        df=big_small_df,
-        minuend_col='沪深300近一月收益率',
-        subtrahend_col='中证2000近一月收益率',
-        difference_col='大盘对小盘近一月超额',
-    )
-    big_small_df = append_difference_column(
-        df=big_small_df,
-        minuend_col='沪深300近两周收益率',
-        subtrahend_col='中证2000近两周收益率',
-        difference_col='大盘对小盘近两周超额',
-    )
-    big_small_df = append_sum_column(
-        df=big_small_df,
-        sum_1_col='大盘对小盘近一月超额',
-        sum_2_col='大盘对小盘近两周超额',
-        sum_col='相对动量',
-        multiplier_1=1,
-        multiplier_2=2,
-        multiplier_sum=0.5,
+    ratio_col = '沪深300/中证2000'
+    month_size = get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period='一月')
+    two_week_size = get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period='两周')
+    pct_change_cols = ['沪深300近一月收益率', '中证2000近一月收益率', '沪深300近两周收益率', '中证2000近两周收益率']
+
+    big_small_pipeline = (
+        ColumnPipeline(raw_wide_idx_df[[big_name_col, small_name_col]])
+        .ratio(big_name_col, small_name_col, ratio_col)
+        .rolling_mean(ratio_col, config.TRADE_DT_COUNT['一月'], '近一月均值')
+        .mark('ratio_mean', [ratio_col, '近一月均值'])
+        .pct_change(big_name_col, month_size, '沪深300近一月收益率')
+        .pct_change(small_name_col, month_size, '中证2000近一月收益率')
+        .pct_change(big_name_col, two_week_size, '沪深300近两周收益率')
+        .pct_change(small_name_col, two_week_size, '中证2000近两周收益率')
+        .trim()
+        .difference('沪深300近一月收益率', '中证2000近一月收益率', '大盘对小盘近一月超额')
+        .difference('沪深300近两周收益率', '中证2000近两周收益率', '大盘对小盘近两周超额')
+        .sum('大盘对小盘近一月超额', '大盘对小盘近两周超额', '相对动量', multiplier_2=2, multiplier_sum=0.5)
     )
+    big_small_df = big_small_pipeline.run()
+    ratio_mean_df = big_small_pipeline.frame_at('ratio_mean').dropna()
+    pct_change_df = big_small_df[pct_change_cols]
 
     big_small_conditions = [
         (big_small_df['大盘对小盘近一月超额'] < 0) & (big_small_df['大盘对小盘近两周超额'] < 0),
@@ -513,10 +490,209 @@ def prepare_big_small_momentum_data(
     return ratio_mean_df, pct_change_df, signal_df
 
 
-@msg_printer
-def generate_style_charts():
-    formatted_latest_day = date.today().strftime(config.WIND_DT_FORMAT)
+@span_timer
+def prepare_term_spread_signal(term_spread_df: pd.DataFrame, true_signal: str, false_signal: str) -> pd.Series:
+    """Term spread at or above its rolling mean maps to `true_signal`, matching the chart's signal rule."""
+    return pd.Series(
+        np.where(
+            term_spread_df[style_config.TERM_SPREAD_CONFIG['TERM_SPREAD_COL']]
+            >= term_spread_df[style_config.TERM_SPREAD_CONFIG['MEAN_COL']],
+            true_signal,
+            false_signal,
+        ),
+        index=term_spread_df.index,
+    )
+
+
+@span_timer
+def prepare_rate_indicator_store(
+    long_raw_cn_bond_yield_df: pd.DataFrame,
+    long_wind_all_a_idx_val_df: pd.DataFrame,
+) -> dict:
+    """Compute the term spread and ERP blocks once, with the signal variant each framework tab draws.
+
+    Both the value/growth and big/small tabs read from this store instead of
+    re-deriving signals from the same indicator frames.
+
+    Returns:
+        dict with
+            term_spread_df: term spread, its rolling mean and the raw yields.
+            yield_curve_df: short/long yields in decimal, NaN rows dropped.
+            erp_dfs: framework -> ERP frame with quantile bands and `交易信号`.
+            term_spread_signals: framework -> term spread `交易信号` series.
+    """
+    term_spread_df, yield_curve_df, wide_raw_cn_bond_yield_df = prepare_term_spread_data(
+        long_raw_cn_bond_yield_df=long_raw_cn_bond_yield_df,
+    )
+    wide_erp_df, erp_conditions = prepare_index_erp_data(
+        long_wind_all_a_idx_val_df=long_wind_all_a_idx_val_df,
+        wide_raw_cn_bond_yield_df=wide_raw_cn_bond_yield_df,
+    )
+
+    erp_chart_params = {
+        '价值成长': style_config.INDEX_ERP_CHART_PARAM,
+        '大小盘': style_config.INDEX_ERP_2_CHART_PARAM,
+    }
+    term_spread_chart_params = {
+        '价值成长': style_config.TERM_SPREAD_CHART_PARAM,
+        '大小盘': style_config.TERM_SPREAD_2_CHART_PARAM,
+    }
+    erp_dfs = {
+        framework: wide_erp_df.assign(
+            **{
+                style_config.INDEX_ERP_CONFIG['SIGNAL_COL']: np.select(
+                    condlist=erp_conditions,
+                    choicelist=[chart_param.bar_param.true_signal, chart_param.bar_param.false_signal],
+                    default=chart_param.bar_param.no_signal,
+                )
+            }
+        )
+        for framework, chart_param in erp_chart_params.items()
+    }
+    term_spread_signals = {
+        framework: prepare_term_spread_signal(
+            term_spread_df,
+            true_signal=chart_param.bar_param.true_signal,
+            false_signal=chart_param.bar_param.false_signal,
+        )
+        for framework, chart_param in term_spread_chart_params.items()
+    }
+
+    return {
+        'term_spread_df': term_spread_df,
+        'yield_curve_df': yield_curve_df.div(100).dropna(),
+        'erp_dfs': erp_dfs,
+        'term_spread_signals': term_spread_signals,
+    }
+
 
+@frame_cached(ttl=config.ST_CACHE_TTL)
+def _get_rate_indicator_store(snapshot_version: str, latest_date: str, _inputs: dict) -> dict:
+    """Build the rate indicator store once per CSV snapshot; frames are excluded from the cache key."""
+    return submit_rate_indicator_store_job(_inputs).result()
+
+
+@span_timer
+def prepare_style_signal_eval_data(
+    raw_wide_idx_df: pd.DataFrame,
+    idx_name_df: pd.DataFrame,
+    style_signals: dict[str, tuple[str, pd.Series]],
+) -> tuple[pd.DataFrame, dict[str, tuple[str, str]], pd.DataFrame]:
+    """Collect page signals and their style index legs for `evaluate_signals`.
+
+    Args:
+        style_signals: signal name -> (framework key of `STYLE_SIGNAL_EVAL_CONFIG['PAIRS']`, 交易信号 series).
+
+    Returns:
+        signal_wide_df: dates x signal names of signal labels.
+        signal_pairs: signal name -> (long leg, short leg).
+        leg_price_df: trading dates x style legs (成长/价值/小盘/大盘) of index closes.
+    """
+    pairs = style_config.STYLE_SIGNAL_EVAL_CONFIG['PAIRS']
+    signal_wide_df = pd.DataFrame({name: signal for name, (_, signal) in style_signals.items()})
+    signal_pairs = {name: pairs[framework] for name, (framework, _) in style_signals.items()}
+
+    legs = sorted({leg for pair in signal_pairs.values() for leg in pair})
+    leg_price_df = raw_wide_idx_df[
+        [idx_name_df.loc[style_config.STYLE_IDX_CODES[leg]].values[0] for leg in legs]
+    ].set_axis(legs, axis=1)
+    return signal_wide_df, signal_pairs, leg_price_df
+
+
+@frame_cached(ttl=config.ST_CACHE_TTL)
+def _get_style_signal_evaluation(
+    snapshot_version: str,
+    latest_date: str,
+    _signal_wide_df: pd.DataFrame,
+    _signal_pairs: dict[str, tuple[str, str]],
+    _leg_price_df: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Evaluate all page signals once per CSV snapshot; frames are excluded from the cache key."""
+    return submit_job(
+        'evaluate_style_signals',
+        _style_result_key('evaluate_style_signals', (snapshot_version, latest_date)),
+        _evaluate_style_signals,
+        signal_wide_df=_signal_wide_df,
+        signal_pairs=_signal_pairs,
+        leg_price_df=_leg_price_df,
+    ).result()
+
+
+def _evaluate_style_signals(
+    signal_wide_df: pd.DataFrame,
+    signal_pairs: dict[str, tuple[str, str]],
+    leg_price_df: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    horizon_sizes = {
+        horizon: get_avg_dt_count_via_dt_type(dt_type=TradeDtType.STOCK_MKT, period=horizon)
+        for horizon in style_config.STYLE_SIGNAL_EVAL_CONFIG['HORIZONS']
+    }
+    stats_df, summary_df, cum_pnl_df = evaluate_signals(
+        signal_wide_df=signal_wide_df,
+        signal_pairs=signal_pairs,
+        leg_price_df=leg_price_df,
+        horizon_sizes=horizon_sizes,
+        trading_days=config.TRADE_DT_COUNT['一年'],
+    )
+    cum_pnl_df.index.name = style_config.STYLE_SIGNAL_EVAL_CONFIG['DT_COL']
+    return stats_df, summary_df, cum_pnl_df
+
+
+def _render_style_signal_evaluation(
+    stats_df: pd.DataFrame,
+    summary_df: pd.DataFrame,
+    cum_pnl_df: pd.DataFrame,
+) -> None:
+    """Render per-signal hit rates, forward returns, turnover and cumulative long/short P&L."""
+    st.subheader('信号胜率与收益')
+    st.caption('信号在当日收盘后生效，按对应风格指数做多/做空持有；胜率与平均超额按各持有期的前瞻收益统计。')
+
+    hit_rate_df = stats_df.pivot(index='signal', columns='horizon', values='hit_rate')
+    mean_return_df = stats_df.pivot(index='signal', columns='horizon', values='mean_return')
+    horizons = list(style_config.STYLE_SIGNAL_EVAL_CONFIG['HORIZONS'])
+
+    table_df = pd.concat(
+        [
+            hit_rate_df[horizons].add_prefix('胜率_'),
+            mean_return_df[horizons].add_prefix('平均超额_'),
+            summary_df.rename(columns={'active_ratio': '持仓占比', 'turnover': '年化换手', 'cum_pnl': '累计收益'}),
+        ],
+        axis=1,
+    ).reindex(summary_df.index)
+    pct_cols = [col for col in table_df.columns if col != '年化换手']
+    table_df[pct_cols] = table_df[pct_cols].mul(100)
+    table_df.index.name = style_config.STYLE_SIGNAL_EVAL_CONFIG['SIGNAL_NAME_COL']
+
+    column_config = {col: st.column_config.NumberColumn(col, format='%.2f%%') for col in pct_cols}
+    column_config['年化换手'] = st.column_config.NumberColumn('年化换手', format='%.1f')
+    st.dataframe(table_df, use_container_width=True, column_config=column_config)
+
+    cum_pnl_line_param = param_cls.IdxLineParam(
+        axis_names={
+            'X': style_config.STYLE_SIGNAL_EVAL_CONFIG['DT_COL'],
+            'LEGEND': style_config.STYLE_SIGNAL_EVAL_CONFIG['SIGNAL_NAME_COL'],
+            'Y': style_config.STYLE_SIGNAL_EVAL_CONFIG['CUM_PNL_COL'],
+        },
+        title='信号多空累计收益',
+        data_col_param=param_cls.WindIdxColParam(dt_col=style_config.STYLE_SIGNAL_EVAL_CONFIG['DT_COL']),
+        y_axis_format=config.CHART_NUM_FORMAT['pct'],
+    )
+    draw_grouped_lines(cum_pnl_df.dropna(how='all'), cum_pnl_line_param)
+
+
+@span_timer
+def load_style_inputs(latest_date: str) -> dict:
+    """Read the page snapshots up to `latest_date` and build the frames every style block starts from.
+
+    Returns:
+        dict with
+            snapshot_key: (content hashes of the page snapshots, `latest_date`), for shared cache keys.
+            long_raw_df_collection: table name -> long frame of `CN_BOND_YIELD`, `A_IDX_VAL`, `EDB`, `SHIBOR_PRICES`.
+            wide_raw_edb_df: EDB indicators, one column each.
+            long_wind_all_a_idx_val_df / long_big_small_idx_val_df: index valuation rows of 万得全A / 沪深300 and 中证1000.
+            idx_name_df: style index code -> name.
+            raw_wide_idx_df: style index closes, one column per index name.
+    """
     wind_local_keys = [
         'CN_BOND_YIELD',
         'A_IDX_VAL',
@@ -524,15 +700,24 @@ def generate_style_charts():
         'SHIBOR_PRICES',
     ]
 
+    # every frame below derives from these snapshots, read up to `latest_date`
+    snapshot_key = (
+        '|'.join(get_snapshot_content_hash(table_name) for table_name in (*wind_local_keys, 'A_IDX_PRICE')),
+        latest_date,
+    )
+
     long_raw_df_collection = {
         key: fetch_data_from_local(
-            latest_date=formatted_latest_day,
+            latest_date=latest_date,
             table_name=key,
         )
         for key in wind_local_keys
     }
 
-    wide_raw_edb_df = reshape_long_df_into_wide_form(
+    wide_raw_edb_df = cached_result(
+        'wide_raw_edb_df',
+        _style_result_key('wide_raw_edb_df', snapshot_key),
+        reshape_long_df_into_wide_form,
         long_df=long_raw_df_collection['EDB'],
         index_col=style_config.DATA_COL_PARAM[param_cls.WindPortal.EDB].dt_col,
         name_col=style_config.DATA_COL_PARAM[param_cls.WindPortal.EDB].name_col,
@@ -544,19 +729,18 @@ def generate_style_charts():
     long_big_small_idx_val_df = long_raw_df_collection['A_IDX_VAL'].query(
         f'{style_config.DATA_COL_PARAM[param_cls.WindPortal.A_IDX_VAL].name_col} in ("沪深300", "中证1000")'
     )
-
     wind_idx_param = param_cls.WindListedSecParam(
         wind_codes=tuple(style_config.STYLE_IDX_CODES.values()),
         start_date=style_config.START_DT,
         sql_param=param_cls.SqlParam(
             sql_name=config.IDX_PRICE_SQL_NAME,
         ),
-        end_date=formatted_latest_day,
+        end_date=latest_date,
     )
 
     idx_col_param = param_cls.WindIdxColParam()
 
-    raw_long_idx_df = fetch_index_data_from_local(latest_date=formatted_latest_day, _config=wind_idx_param)
+    raw_long_idx_df = fetch_index_data_from_local(latest_date=latest_date, _config=wind_idx_param)
 
     idx_name_df = (
         raw_long_idx_df[[idx_col_param.code_col, idx_col_param.name_col]]
@@ -565,25 +749,112 @@ def generate_style_charts():
         .reindex(wind_idx_param.wind_codes)
     )
 
-    raw_wide_idx_df = reshape_long_df_into_wide_form(
+    raw_wide_idx_df = cached_result(
+        'raw_wide_idx_df',
+        _style_result_key('raw_wide_idx_df', snapshot_key),
+        reshape_long_df_into_wide_form,
         long_df=raw_long_idx_df,
         index_col=idx_col_param.dt_col,
         name_col=idx_col_param.name_col,
         value_col=idx_col_param.price_col,
     )
 
+    return {
+        'snapshot_key': snapshot_key,
+        'long_raw_df_collection': long_raw_df_collection,
+        'wide_raw_edb_df': wide_raw_edb_df,
+        'long_wind_all_a_idx_val_df': long_wind_all_a_idx_val_df,
+        'long_big_small_idx_val_df': long_big_small_idx_val_df,
+        'idx_name_df': idx_name_df,
+        'raw_wide_idx_df': raw_wide_idx_df,
+    }
+
+
+def submit_style_jobs(inputs: dict) -> dict[str, ComputeJob]:
+    """Start the independent indicator jobs over `load_style_inputs` frames, keyed by `prepare_*` name."""
+    snapshot_key = inputs['snapshot_key']
+    jobs_args = {
+        'prepare_value_growth_data': (
+            prepare_value_growth_data,
+            {'raw_wide_idx_df': inputs['raw_wide_idx_df'], 'idx_name_df': inputs['idx_name_df']},
+        ),
+        'prepare_index_turnover_data': (
+            prepare_index_turnover_data,
+            {'long_wind_all_a_idx_val_df': inputs['long_wind_all_a_idx_val_df']},
+        ),
+        'prepare_big_small_momentum_data': (
+            prepare_big_small_momentum_data,
+            {'raw_wide_idx_df': inputs['raw_wide_idx_df'], 'idx_name_df': inputs['idx_name_df']},
+        ),
+        'prepare_shibor_prices_data': (
+            prepare_shibor_prices_data,
+            {'long_raw_shibor_df': inputs['long_raw_df_collection']['SHIBOR_PRICES']},
+        ),
+        'prepare_housing_invest_data': (
+            prepare_housing_invest_data,
+            {'wide_raw_edb_df': inputs['wide_raw_edb_df']},
+        ),
+    }
+    return {
+        name: submit_job(name, _style_result_key(name, snapshot_key), func, **kwargs)
+        for name, (func, kwargs) in jobs_args.items()
+    }
+
+
+def submit_style_focus_job(inputs: dict, big_small_signal_df: pd.DataFrame) -> ComputeJob:
+    """Start the style focus job; it joins the big/small momentum frame, so runs after that job."""
+    return submit_job(
+        'prepare_style_focus_data',
+        _style_result_key('prepare_style_focus_data', inputs['snapshot_key']),
+        prepare_style_focus_data,
+        long_big_small_idx_val_df=inputs['long_big_small_idx_val_df'],
+        big_small_df=big_small_signal_df,
+    )
+
+
+def submit_rate_indicator_store_job(inputs: dict) -> ComputeJob:
+    """Start the rate indicator store job, keyed by the bond yield and index valuation snapshots only."""
+    snapshot_version = '|'.join(get_snapshot_content_hash(table_name) for table_name in ('CN_BOND_YIELD', 'A_IDX_VAL'))
+    return submit_job(
+        'prepare_rate_indicator_store',
+        _style_result_key('prepare_rate_indicator_store', (snapshot_version, inputs['snapshot_key'][1])),
+        prepare_rate_indicator_store,
+        long_raw_cn_bond_yield_df=inputs['long_raw_df_collection']['CN_BOND_YIELD'],
+        long_wind_all_a_idx_val_df=inputs['long_wind_all_a_idx_val_df'],
+    )
+
+
+@span_timer
+def generate_style_charts():
+    formatted_latest_day = date.today().strftime(config.WIND_DT_FORMAT)
+
+    inputs = load_style_inputs(formatted_latest_day)
+    page_snapshot_key = inputs['snapshot_key']
+    wide_raw_edb_df = inputs['wide_raw_edb_df']
+    idx_name_df = inputs['idx_name_df']
+    raw_wide_idx_df = inputs['raw_wide_idx_df']
+
+    # Independent indicator jobs start together (on the compute pool when one is configured);
+    # each section below waits only for its own frames.
+    style_jobs = submit_style_jobs(inputs)
+    rate_indicator_store = _get_rate_indicator_store(
+        '|'.join(get_snapshot_content_hash(table_name) for table_name in ('CN_BOND_YIELD', 'A_IDX_VAL')),
+        formatted_latest_day,
+        _inputs=inputs,
+    )
+
     st.header('风格研判')
-    tab1, tab2 = st.tabs(['价值成长研判框架', '大小盘研判框架'])
+    tab1, tab2, tab3 = st.tabs(['价值成长研判框架', '大小盘研判框架', '信号评估'])
+
+    # signal name -> (framework, 交易信号 series), evaluated together in tab3
+    style_signals = {}
 
     # 1. 价值成长研判框架
 
     with tab1:
         # NOTE 国证价值/国证成长
 
-        ratio_mean_df, value_growth_pct_change_df, value_growth_signal_df = prepare_value_growth_data(
-            raw_wide_idx_df=raw_wide_idx_df,
-            idx_name_df=idx_name_df,
-        )
+        ratio_mean_df, value_growth_pct_change_df, value_growth_signal_df = style_jobs['prepare_value_growth_data'].result()
 
         value_name_col, growth_name_col = tuple(
             map(
@@ -633,10 +904,11 @@ def generate_style_charts():
             signal_order=None,
             is_converted_to_pct=style_config.RELATIVE_MOMENTUM_VALUE_GROWTH_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['价值成长-相对动量'] = ('价值成长', value_growth_signal_df['交易信号'])
 
         # NOTE 市场情绪
 
-        wide_wind_all_a_turnover_df = prepare_index_turnover_data(long_wind_all_a_idx_val_df)
+        wide_wind_all_a_turnover_df = style_jobs['prepare_index_turnover_data'].result()
 
         draw_style_bar_line_chart_with_highlighted_signal(
             dt_indexed_df=wide_wind_all_a_turnover_df,
@@ -649,13 +921,15 @@ def generate_style_charts():
             compared_cols=style_config.INDEX_TURNOVER_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.INDEX_TURNOVER_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['价值成长-市场情绪'] = (
+            '价值成长',
+            wide_wind_all_a_turnover_df[style_config.INDEX_TURNOVER_CONFIG['SIGNAL_COL']],
+        )
 
         # NOTE 期限利差
         # 需求：基准线从近一年均值改为近一月均值
 
-        term_spread_df, yield_curve_df, wide_raw_cn_bond_yield_df = prepare_term_spread_data(
-            long_raw_cn_bond_yield_df=long_raw_df_collection['CN_BOND_YIELD'],
-        )
+        term_spread_df = rate_indicator_store['term_spread_df']
 
         draw_style_bar_line_chart_with_highlighted_signal(
             dt_indexed_df=term_spread_df,
@@ -669,6 +943,7 @@ def generate_style_charts():
             is_converted_to_pct=style_config.TERM_SPREAD_CHART_PARAM.isConvertedToPct,
             is_signal_assigned=False,
         )
+        style_signals['价值成长-期限利差'] = ('价值成长', rate_indicator_store['term_spread_signals']['价值成长'])
 
         term_spread_line_config = param_cls.IdxLineParam(
             axis_names=style_config.STYLE_CHART_AXIS_NAMES['LONG_SHORT_TERM_RATE'],
@@ -685,30 +960,12 @@ def generate_style_charts():
             ),
         )
 
-        draw_grouped_lines(
-            yield_curve_df.div(100).dropna(inplace=False),
-            term_spread_line_config,
-        )
+        draw_grouped_lines(rate_indicator_store['yield_curve_df'], term_spread_line_config)
 
         # NOTE ERP股债性价比（价值成长）
         # ERP位置和趋势：高位下行时，做多成长；低位上行时，做多价值;以站上过去1个月均线作为趋势的判断
 
-        wide_erp_df, erp_conditions = prepare_index_erp_data(
-            long_wind_all_a_idx_val_df=long_wind_all_a_idx_val_df,
-            wide_raw_cn_bond_yield_df=wide_raw_cn_bond_yield_df,
-        )
-
-        erp_choices = [
-            style_config.INDEX_ERP_CHART_PARAM.bar_param.true_signal,
-            style_config.INDEX_ERP_CHART_PARAM.bar_param.false_signal,
-        ]
-        wide_erp_df = apply_signal_from_conditions(
-            df=wide_erp_df,
-            signal_col=style_config.INDEX_ERP_CONFIG['SIGNAL_COL'],
-            conditions=erp_conditions,
-            choices=erp_choices,
-            default=style_config.INDEX_ERP_CHART_PARAM.bar_param.no_signal,
-        )
+        wide_erp_df = rate_indicator_store['erp_dfs']['价值成长']
 
         draw_style_bar_line_chart_with_highlighted_signal(
             dt_indexed_df=wide_erp_df,
@@ -721,6 +978,7 @@ def generate_style_charts():
             compared_cols=style_config.INDEX_ERP_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.INDEX_ERP_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['价值成长-ERP股债性价比'] = ('价值成长', wide_erp_df[style_config.INDEX_ERP_CONFIG['SIGNAL_COL']])
 
         # NOTE 信用扩张：金融机构各项贷款余额同比
 
@@ -769,15 +1027,16 @@ def generate_style_charts():
             compared_cols=style_config.CREDIT_EXPANSION_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.CREDIT_EXPANSION_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['价值成长-信用扩张'] = (
+            '价值成长',
+            credit_expansion_df[style_config.CREDIT_EXPANSION_CONFIG['SIGNAL_COL']],
+        )
 
     # 2. 大小盘研判框架
     with tab2:
         # NOTE 大小盘比价 —— 沪深300/中证2000
 
-        big_small_ratio_df, big_small_pct_change_df, big_small_signal_df = prepare_big_small_momentum_data(
-            raw_wide_idx_df=raw_wide_idx_df,
-            idx_name_df=idx_name_df,
-        )
+        big_small_ratio_df, big_small_pct_change_df, big_small_signal_df = style_jobs['prepare_big_small_momentum_data'].result()
 
         big_name_col, small_name_col = tuple(
             map(
@@ -823,13 +1082,11 @@ def generate_style_charts():
             signal_order=style_config.RELATIVE_MOMENTUM_BIG_SMALL_CHART_PARAM.bar_param.signal_order,
             is_converted_to_pct=style_config.RELATIVE_MOMENTUM_BIG_SMALL_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['大小盘-相对动量'] = ('大小盘', big_small_signal_df['交易信号'])
 
         # NOTE 风格关注度
 
-        merged_style_focus_df = prepare_style_focus_data(
-            long_big_small_idx_val_df=long_big_small_idx_val_df,
-            big_small_df=big_small_signal_df,
-        )
+        merged_style_focus_df = submit_style_focus_job(inputs, big_small_signal_df).result()
         draw_style_bar_line_chart_with_highlighted_signal(
             dt_indexed_df=merged_style_focus_df,
             style_chart_config=style_config.STYLE_FOCUS_STYLE_CHART_CONFIG,
@@ -841,12 +1098,14 @@ def generate_style_charts():
             compared_cols=style_config.STYLE_FOCUS_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.STYLE_FOCUS_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['大小盘-风格关注度'] = (
+            '大小盘',
+            merged_style_focus_df[style_config.STYLE_FOCUS_CONFIG['SIGNAL_COL']],
+        )
 
         # NOTE 货币周期：Shibor3M
 
-        shibor_prices_df = prepare_shibor_prices_data(
-            long_raw_shibor_df=long_raw_df_collection['SHIBOR_PRICES'],
-        )
+        shibor_prices_df = style_jobs['prepare_shibor_prices_data'].result()
 
         shibor_conditions = [
             shibor_prices_df[style_config.SHIBOR_PRICES_CONFIG['SHIBOR_PRICE_COL']]
@@ -874,6 +1133,7 @@ def generate_style_charts():
             compared_cols=style_config.SHIBOR_PRICES_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.SHIBOR_PRICES_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['大小盘-货币周期'] = ('大小盘', shibor_prices_df[style_config.SHIBOR_PRICES_CONFIG['SIGNAL_COL']])
 
         # NOTE 期现利差
 
@@ -889,6 +1149,7 @@ def generate_style_charts():
             is_converted_to_pct=style_config.TERM_SPREAD_2_CHART_PARAM.isConvertedToPct,
             is_signal_assigned=False,
         )
+        style_signals['大小盘-期现利差'] = ('大小盘', rate_indicator_store['term_spread_signals']['大小盘'])
 
         term_spread_2_line_config = param_cls.IdxLineParam(
             axis_names=style_config.STYLE_CHART_AXIS_NAMES['LONG_SHORT_TERM_RATE'],
@@ -905,35 +1166,11 @@ def generate_style_charts():
             ),
         )
 
-        draw_grouped_lines(
-            term_spread_df[
-                [
-                    '1.0',
-                    '10.0',
-                ]
-            ]
-            .div(100)
-            .dropna(inplace=False),
-            term_spread_2_line_config,
-        )
+        draw_grouped_lines(rate_indicator_store['yield_curve_df'], term_spread_2_line_config)
 
         # NOTE ERP股债性价比（大小盘）
 
-        merged_erp_df = wide_erp_df.join(big_small_signal_df, how='inner', lsuffix='_erp', rsuffix='_big_small')
-        merged_erp_df.index.name = wide_erp_df.index.name
-
-        erp_2_choices = [
-            style_config.INDEX_ERP_2_CHART_PARAM.bar_param.true_signal,
-            style_config.INDEX_ERP_2_CHART_PARAM.bar_param.false_signal,
-        ]
-        wide_erp_2_df = wide_erp_df.copy()
-        wide_erp_2_df = apply_signal_from_conditions(
-            df=wide_erp_2_df,
-            signal_col=style_config.INDEX_ERP_CONFIG['SIGNAL_COL'],
-            conditions=erp_conditions,
-            choices=erp_2_choices,
-            default=style_config.INDEX_ERP_2_CHART_PARAM.bar_param.no_signal,
-        )
+        wide_erp_2_df = rate_indicator_store['erp_dfs']['大小盘']
 
         draw_style_bar_line_chart_with_highlighted_signal(
             dt_indexed_df=wide_erp_2_df,
@@ -946,10 +1183,11 @@ def generate_style_charts():
             compared_cols=style_config.INDEX_ERP_2_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.INDEX_ERP_2_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['大小盘-ERP股债性价比'] = ('大小盘', wide_erp_2_df[style_config.INDEX_ERP_CONFIG['SIGNAL_COL']])
 
         # NOTE 经济增长: 房地产完成额累计同比
 
-        wide_raw_housing_invest_df = prepare_housing_invest_data(wide_raw_edb_df)
+        wide_raw_housing_invest_df = style_jobs['prepare_housing_invest_data'].result()
 
         housing_invest_conditions = [
             wide_raw_housing_invest_df[style_config.HOUSING_INVEST_CONFIG['YOY_COL']]
@@ -977,5 +1215,24 @@ def generate_style_charts():
             compared_cols=style_config.HOUSING_INVEST_CHART_PARAM.line_param.compared_cols,
             is_converted_to_pct=style_config.HOUSING_INVEST_CHART_PARAM.isConvertedToPct,
         )
+        style_signals['大小盘-经济增长'] = (
+            '大小盘',
+            wide_raw_housing_invest_df[style_config.HOUSING_INVEST_CONFIG['SIGNAL_COL']],
+        )
 
         # TODO 对于通过个人api获取的数据和图，需要添加一个按钮，用于切换是否显示
+
+    # 3. 信号评估
+    with tab3:
+        signal_wide_df, signal_pairs, leg_price_df = prepare_style_signal_eval_data(
+            raw_wide_idx_df=raw_wide_idx_df,
+            idx_name_df=idx_name_df,
+            style_signals=style_signals,
+        )
+        stats_df, summary_df, cum_pnl_df = _get_style_signal_evaluation(
+            *page_snapshot_key,
+            _signal_wide_df=signal_wide_df,
+            _signal_pairs=signal_pairs,
+            _leg_price_df=leg_price_df,
+        )
+        _render_style_signal_evaluation(stats_df, summary_df, cum_pnl_df)